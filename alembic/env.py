@@ -18,6 +18,7 @@ from src.database import Base
 # Import all models directly (avoid circular imports from routers)
 from src.session.models import Session, SessionStatus
 from src.workflow.models import Workflow
+from src.llm.models import LLMUsage
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
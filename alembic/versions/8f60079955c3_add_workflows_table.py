@@ -19,12 +19,31 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    # ### commands auto generated by Alembic - please adjust! ###
-    pass
-    # ### end Alembic commands ###
+    # Databases that already have the table (created by the app) keep it;
+    # databases built from migrations alone get it here
+    if 'workflows' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table('workflows',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('session_id', sa.String(), nullable=False),
+    sa.Column('agent_type', sa.String(), nullable=False),
+    sa.Column('goals', sa.Text(), nullable=False),
+    sa.Column('tone', sa.String(), nullable=False),
+    sa.Column('use_tools', sa.Boolean(), nullable=False),
+    sa.Column('workflow_json', sa.Text(), nullable=False),
+    sa.Column('mermaid_diagram', sa.Text(), nullable=True),
+    sa.Column('is_approved', sa.Boolean(), nullable=False),
+    sa.Column('version', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['sessions.id']),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('session_id')
+    )
+    op.create_index('ix_workflows_id', 'workflows', ['id'], unique=False)
 
 
 def downgrade() -> None:
-    # ### commands auto generated by Alembic - please adjust! ###
-    pass
-    # ### end Alembic commands ###
+    op.drop_index('ix_workflows_id', table_name='workflows')
+    op.drop_table('workflows')
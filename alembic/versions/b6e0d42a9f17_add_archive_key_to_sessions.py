@@ -0,0 +1,26 @@
+"""add_archive_key_to_sessions
+
+Revision ID: b6e0d42a9f17
+Revises: f29a7d3e8c14
+Create Date: 2026-10-19 14:05:31.207446
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b6e0d42a9f17"
+down_revision: Union[str, None] = "f29a7d3e8c14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("sessions", sa.Column("archive_key", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("sessions", "archive_key")
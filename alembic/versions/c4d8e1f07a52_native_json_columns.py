@@ -0,0 +1,116 @@
+"""native_json_columns
+
+Revision ID: c4d8e1f07a52
+Revises: b6e0d42a9f17
+Create Date: 2026-10-19 14:32:47.918305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "c4d8e1f07a52"
+down_revision: Union[str, None] = "b6e0d42a9f17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SESSION_JSON_COLUMNS = [
+    "example_interactions",
+    "constraints",
+    "edge_cases",
+    "tools_config",
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        for column in SESSION_JSON_COLUMNS:
+            op.alter_column(
+                "sessions",
+                column,
+                type_=postgresql.JSONB(),
+                postgresql_using=f"NULLIF({column}, '')::jsonb",
+            )
+        op.alter_column(
+            "sessions",
+            "use_tools",
+            type_=sa.Boolean(),
+            postgresql_using="lower(use_tools) = 'true'",
+        )
+        op.alter_column(
+            "workflows",
+            "workflow_json",
+            type_=postgresql.JSONB(),
+            postgresql_using="workflow_json::jsonb",
+        )
+
+        op.create_index(
+            "ix_sessions_tools_config",
+            "sessions",
+            ["tools_config"],
+            postgresql_using="gin",
+            postgresql_ops={"tools_config": "jsonb_path_ops"},
+            postgresql_where=sa.text("use_tools"),
+        )
+        op.execute(
+            "CREATE INDEX ix_workflows_nodes ON workflows "
+            "USING gin ((workflow_json -> 'nodes') jsonb_path_ops) WHERE use_tools"
+        )
+        return
+
+    # SQLite stores JSON as text already; only the boolean needs converting
+    op.execute(
+        "UPDATE sessions SET use_tools = CASE lower(use_tools) "
+        "WHEN 'true' THEN 1 WHEN 'false' THEN 0 END"
+    )
+    with op.batch_alter_table("sessions") as batch_op:
+        for column in SESSION_JSON_COLUMNS:
+            batch_op.alter_column(column, type_=sa.JSON())
+        batch_op.alter_column("use_tools", type_=sa.Boolean())
+    with op.batch_alter_table("workflows") as batch_op:
+        batch_op.alter_column("workflow_json", type_=sa.JSON())
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_workflows_nodes", table_name="workflows")
+        op.drop_index("ix_sessions_tools_config", table_name="sessions")
+
+        op.alter_column(
+            "workflows",
+            "workflow_json",
+            type_=sa.Text(),
+            postgresql_using="workflow_json::text",
+        )
+        op.alter_column(
+            "sessions",
+            "use_tools",
+            type_=sa.String(),
+            postgresql_using=(
+                "CASE WHEN use_tools THEN 'True' WHEN NOT use_tools THEN 'False' END"
+            ),
+        )
+        for column in SESSION_JSON_COLUMNS:
+            op.alter_column(
+                "sessions",
+                column,
+                type_=sa.Text(),
+                postgresql_using=f"{column}::text",
+            )
+        return
+
+    with op.batch_alter_table("workflows") as batch_op:
+        batch_op.alter_column("workflow_json", type_=sa.Text())
+    with op.batch_alter_table("sessions") as batch_op:
+        for column in SESSION_JSON_COLUMNS:
+            batch_op.alter_column(column, type_=sa.Text())
+        batch_op.alter_column("use_tools", type_=sa.String())
+    op.execute(
+        "UPDATE sessions SET use_tools = CASE use_tools "
+        "WHEN 1 THEN 'True' WHEN 0 THEN 'False' END"
+    )
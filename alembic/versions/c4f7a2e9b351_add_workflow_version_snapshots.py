@@ -0,0 +1,61 @@
+"""add_workflow_version_snapshots
+
+Revision ID: c4f7a2e9b351
+Revises: a8c3e5f2d714
+Create Date: 2026-10-19 17:24:09.651873
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "c4f7a2e9b351"
+down_revision: Union[str, None] = "a8c3e5f2d714"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "workflow_versions",
+        sa.Column(
+            "snapshot",
+            sa.JSON().with_variant(postgresql.JSONB(), "postgresql"),
+            nullable=True,
+        ),
+    )
+    op.add_column(
+        "workflows", sa.Column("approved_version", sa.Integer(), nullable=True)
+    )
+
+    # Pin existing approvals to the version they were given on
+    workflows = sa.table(
+        "workflows",
+        sa.column("id", sa.String()),
+        sa.column("version", sa.String()),
+        sa.column("is_approved", sa.Boolean()),
+        sa.column("approved_version", sa.Integer()),
+    )
+    bind = op.get_bind()
+    approved = bind.execute(
+        sa.select(workflows.c.id, workflows.c.version).where(workflows.c.is_approved)
+    ).all()
+    for workflow_id, version in approved:
+        try:
+            number = int(str(version).split(".")[0])
+        except ValueError:
+            number = 1
+        bind.execute(
+            workflows.update()
+            .where(workflows.c.id == workflow_id)
+            .values(approved_version=number)
+        )
+
+
+def downgrade() -> None:
+    op.drop_column("workflows", "approved_version")
+    op.drop_column("workflow_versions", "snapshot")
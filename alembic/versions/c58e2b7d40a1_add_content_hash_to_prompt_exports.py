@@ -0,0 +1,35 @@
+"""add_content_hash_to_prompt_exports
+
+Revision ID: c58e2b7d40a1
+Revises: a3c91f0d7b24
+Create Date: 2026-10-19 10:02:17.604931
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c58e2b7d40a1"
+down_revision: Union[str, None] = "a3c91f0d7b24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "prompt_exports", sa.Column("content_hash", sa.String(), nullable=True)
+    )
+    op.create_index(
+        op.f("ix_prompt_exports_content_hash"),
+        "prompt_exports",
+        ["content_hash"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_prompt_exports_content_hash"), table_name="prompt_exports")
+    op.drop_column("prompt_exports", "content_hash")
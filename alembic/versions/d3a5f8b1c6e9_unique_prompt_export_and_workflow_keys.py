@@ -0,0 +1,92 @@
+"""unique_prompt_export_and_workflow_keys
+
+Revision ID: d3a5f8b1c6e9
+Revises: c4d8e1f07a52
+Create Date: 2026-10-19 15:10:26.730519
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d3a5f8b1c6e9"
+down_revision: Union[str, None] = "c4d8e1f07a52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    # Keep only the newest of any duplicate (session, format, hash) exports
+    op.execute(
+        """
+        DELETE FROM prompt_exports
+        WHERE content_hash IS NOT NULL
+          AND EXISTS (
+              SELECT 1 FROM prompt_exports AS newer
+              WHERE newer.session_id = prompt_exports.session_id
+                AND newer.export_format = prompt_exports.export_format
+                AND newer.content_hash = prompt_exports.content_hash
+                AND (newer.created_at > prompt_exports.created_at
+                     OR (newer.created_at = prompt_exports.created_at
+                         AND newer.id > prompt_exports.id))
+          )
+        """,
+    )
+
+    # The composite index covers session_id lookups on its own
+    op.create_index(
+        "uq_prompt_exports_session_format_hash",
+        "prompt_exports",
+        ["session_id", "export_format", "content_hash"],
+        unique=True,
+    )
+    existing_indexes = {
+        index["name"] for index in inspector.get_indexes("prompt_exports")
+    }
+    if "ix_prompt_exports_session_id" in existing_indexes:
+        op.drop_index("ix_prompt_exports_session_id", table_name="prompt_exports")
+
+    # Name the one-workflow-per-session constraint explicitly
+    session_constraints = [
+        constraint["name"]
+        for constraint in inspector.get_unique_constraints("workflows")
+        if constraint["column_names"] == ["session_id"]
+    ]
+    if bind.dialect.name == "postgresql":
+        if session_constraints:
+            op.execute(
+                f"ALTER TABLE workflows RENAME CONSTRAINT {session_constraints[0]} "
+                "TO uq_workflows_session_id"
+            )
+        else:
+            op.create_unique_constraint(
+                "uq_workflows_session_id", "workflows", ["session_id"]
+            )
+    elif not session_constraints:
+        # SQLite can't rename constraints; an unnamed one works the same
+        with op.batch_alter_table("workflows") as batch_op:
+            batch_op.create_unique_constraint("uq_workflows_session_id", ["session_id"])
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "ALTER TABLE workflows RENAME CONSTRAINT uq_workflows_session_id "
+            "TO workflows_session_id_key"
+        )
+    else:
+        constraints = sa.inspect(op.get_bind()).get_unique_constraints("workflows")
+        if any(c["name"] == "uq_workflows_session_id" for c in constraints):
+            with op.batch_alter_table("workflows") as batch_op:
+                batch_op.drop_constraint("uq_workflows_session_id", type_="unique")
+
+    op.create_index(
+        "ix_prompt_exports_session_id", "prompt_exports", ["session_id"], unique=False
+    )
+    op.drop_index("uq_prompt_exports_session_format_hash", table_name="prompt_exports")
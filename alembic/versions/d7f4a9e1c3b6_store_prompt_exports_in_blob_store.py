@@ -0,0 +1,32 @@
+"""store_prompt_exports_in_blob_store
+
+Revision ID: d7f4a9e1c3b6
+Revises: c58e2b7d40a1
+Create Date: 2026-10-19 11:27:53.190442
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d7f4a9e1c3b6"
+down_revision: Union[str, None] = "c58e2b7d40a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("prompt_exports", sa.Column("blob_key", sa.String(), nullable=True))
+    # New exports live in the blob store; content is kept for legacy rows
+    # Batch mode rebuilds the table on SQLite, which cannot ALTER COLUMN
+    with op.batch_alter_table("prompt_exports") as batch_op:
+        batch_op.alter_column("content", existing_type=sa.Text(), nullable=True)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("prompt_exports") as batch_op:
+        batch_op.alter_column("content", existing_type=sa.Text(), nullable=False)
+        batch_op.drop_column("blob_key")
@@ -0,0 +1,38 @@
+"""add_session_stage_and_listing_indexes
+
+Revision ID: e81b6c2f9d05
+Revises: d7f4a9e1c3b6
+Create Date: 2026-10-19 12:40:08.552317
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e81b6c2f9d05"
+down_revision: Union[str, None] = "d7f4a9e1c3b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("sessions", sa.Column("stage", sa.String(), nullable=True))
+    # Completed sessions are known to be at the last stage. Other rows keep
+    # NULL (their stage lived only in Redis) until their next message.
+    op.execute("UPDATE sessions SET stage = 'completed' WHERE status = 'COMPLETED'")
+    op.create_index(
+        "ix_sessions_status_updated_at",
+        "sessions",
+        ["status", "updated_at"],
+        unique=False,
+    )
+    op.create_index("ix_sessions_agent_type", "sessions", ["agent_type"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sessions_agent_type", table_name="sessions")
+    op.drop_index("ix_sessions_status_updated_at", table_name="sessions")
+    op.drop_column("sessions", "stage")
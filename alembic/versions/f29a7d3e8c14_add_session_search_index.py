@@ -0,0 +1,57 @@
+"""add_session_search_index
+
+Revision ID: f29a7d3e8c14
+Revises: e81b6c2f9d05
+Create Date: 2026-10-19 13:55:31.207764
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f29a7d3e8c14"
+down_revision: Union[str, None] = "e81b6c2f9d05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # FTS5 virtual tables and tsvector/GIN are dialect-specific DDL
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            """
+            CREATE TABLE IF NOT EXISTS session_search (
+                session_id VARCHAR PRIMARY KEY REFERENCES sessions(id),
+                agent_type TEXT,
+                goals TEXT,
+                spec TEXT,
+                transcript TEXT,
+                document TSVECTOR NOT NULL
+            )
+            """,
+        )
+        op.execute(
+            """
+            CREATE INDEX IF NOT EXISTS ix_session_search_document
+            ON session_search USING GIN (document)
+            """,
+        )
+    else:
+        op.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS session_search USING fts5(
+                session_id UNINDEXED,
+                agent_type,
+                goals,
+                spec,
+                transcript,
+                tokenize = 'porter unicode61'
+            )
+            """,
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS session_search")
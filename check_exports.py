@@ -26,7 +26,10 @@ for export in exports:
     print(f"Format: {export.export_format.value}")
     print(f"File Size: {export.file_size}")
     print(f"Created: {export.created_at}")
-    print(f"Content Preview: {export.content[:100]}...")
+    if export.content is not None:
+        print(f"Content Preview: {export.content[:100]}...")
+    else:
+        print(f"Blob Key: {export.blob_key}")
     print("-" * 70)
 
 db.close()
@@ -0,0 +1,68 @@
+"""
+Bulk-import agent definitions exported from other platforms.
+
+Each file is JSON or YAML (by extension) holding PromptExport-shaped
+definitions: a list, {"agents": [...]} or a single definition.
+
+Usage:
+    python import_agents.py agents.yaml more/*.json [--workers 8] [--report report.json]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from src.prompt.importer import AgentImporter, load_agent_specs
+from src.database import SessionLocal
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk-import agent definitions")
+    parser.add_argument("files", nargs="+", help="JSON or YAML definition files")
+    parser.add_argument("--workers", type=int, help="Worker processes")
+    parser.add_argument("--batch-size", type=int, help="Agents per transaction")
+    parser.add_argument("--report", help="Write the JSON import report to this file")
+    args = parser.parse_args()
+
+    # Definitions from all files, remembering which file each came from
+    specs = []
+    sources = []
+    for name in args.files:
+        path = Path(name)
+        try:
+            file_specs = load_agent_specs(
+                path.read_bytes(), yaml_format=path.suffix.lower() in (".yaml", ".yml")
+            )
+        except (OSError, ValueError) as e:
+            print(f"❌ {path}: {e}")
+            return 1
+        specs.extend(file_specs)
+        sources.extend(f"{path}#{i}" for i in range(len(file_specs)))
+
+    print(f"📥 Importing {len(specs)} agents from {len(args.files)} file(s)...")
+
+    importer = AgentImporter(max_workers=args.workers, batch_size=args.batch_size)
+    db = SessionLocal()
+    try:
+        report = importer.import_agents(db, specs)
+    finally:
+        db.close()
+
+    for item in report.items:
+        if item.error:
+            print(f"   ❌ {sources[item.index]}: {item.error}")
+
+    print(
+        f"\n✅ Imported {report.imported} of {report.total} agents"
+        f" in {report.duration_seconds:.1f}s ({report.failed} failed)"
+    )
+
+    if args.report:
+        Path(args.report).write_text(report.model_dump_json(indent=2))
+        print(f"📝 Report written to {args.report}")
+
+    return 0 if report.failed == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
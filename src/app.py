@@ -1,16 +1,24 @@
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+import asyncio
 import time
 
 from src.router import api_router
 from src.database import engine, Base
 from src.config import get_settings
+from src.llm.usage import get_usage_recorder
+from src.search.index import ensure_search_schema
+from src.session.archive import get_session_archiver
+from src.session.reaper import get_session_reaper
+from src.workflow.runtime import close_http_client
 
 settings = get_settings()
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+ensure_search_schema(engine)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -53,6 +61,66 @@ async def global_exception_handler(request: Request, exc: Exception):
 app.include_router(api_router)
 
 
+# Persist buffered LLM usage rows before the process exits
+@app.on_event("shutdown")
+async def flush_llm_usage():
+    await run_in_threadpool(get_usage_recorder().flush)
+
+
+async def _flush_session_archive_periodically():
+    """Archive queued sessions at least every SESSION_ARCHIVE_FLUSH_SECONDS"""
+    archiver = get_session_archiver()
+    while True:
+        await asyncio.sleep(settings.session_archive_flush_seconds)
+        try:
+            await run_in_threadpool(archiver.flush)
+        except Exception as e:
+            print(f"⚠️  Session archive flush failed: {e}")
+
+
+@app.on_event("startup")
+async def start_session_archiver():
+    app.state.archive_task = asyncio.create_task(_flush_session_archive_periodically())
+
+
+@app.on_event("shutdown")
+async def flush_session_archive():
+    app.state.archive_task.cancel()
+    await run_in_threadpool(get_session_archiver().flush)
+
+
+async def _reap_expired_sessions_periodically():
+    """Reap notified expirations every interval and sweep for missed ones"""
+    reaper = get_session_reaper()
+    last_sweep = 0.0
+    while True:
+        try:
+            await run_in_threadpool(reaper.flush_notifications)
+            if time.monotonic() - last_sweep >= settings.session_reaper_sweep_seconds:
+                last_sweep = time.monotonic()
+                await run_in_threadpool(reaper.sweep)
+        except Exception as e:
+            print(f"⚠️  Session reaper failed: {e}")
+        await asyncio.sleep(settings.session_reaper_interval_seconds)
+
+
+@app.on_event("startup")
+async def start_session_reaper():
+    await run_in_threadpool(get_session_reaper().start_listener)
+    app.state.reaper_task = asyncio.create_task(_reap_expired_sessions_periodically())
+
+
+@app.on_event("shutdown")
+async def stop_session_reaper():
+    app.state.reaper_task.cancel()
+    get_session_reaper().stop_listener()
+
+
+@app.on_event("shutdown")
+async def close_workflow_http_client():
+    await close_http_client()
+
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
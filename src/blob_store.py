@@ -0,0 +1,104 @@
+"""
+Blob storage for large generated artifacts (export files, bundles).
+Keeps file contents out of the database; any object store can be
+plugged in by implementing BlobStore and calling set_blob_store().
+"""
+
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+import os
+import tempfile
+
+from src.config import get_settings
+
+settings = get_settings()
+
+CHUNK_SIZE = 64 * 1024
+
+
+class BlobStore:
+    """Interface for artifact storage backends"""
+
+    def write(self, key: str, chunks: Iterable[bytes]) -> int:
+        """Store chunks under key, returning the number of bytes written"""
+        raise NotImplementedError
+
+    def read(self, key: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Stream a stored blob in chunks"""
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        """Check if a blob exists"""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> bool:
+        """Delete a blob"""
+        raise NotImplementedError
+
+
+class LocalBlobStore(BlobStore):
+    """Stores blobs as files under a local directory"""
+
+    def __init__(self, directory: str = None):
+        self.directory = Path(directory or settings.export_blob_dir).resolve()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        path = (self.directory / key).resolve()
+        if self.directory not in path.parents:
+            raise ValueError(f"Invalid blob key: {key}")
+        return path
+
+    def write(self, key: str, chunks: Iterable[bytes]) -> int:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temp file and rename so readers never see partial blobs
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    size += len(chunk)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        return size
+
+    def read(self, key: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        with open(self._path(key), "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def delete(self, key: str) -> bool:
+        try:
+            self._path(key).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+
+# Global store instance
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Get or create the global blob store instance"""
+    global _blob_store
+    if _blob_store is None:
+        _blob_store = LocalBlobStore()
+    return _blob_store
+
+
+def set_blob_store(store: BlobStore) -> None:
+    """Replace the global blob store (e.g. with an object-store backend)"""
+    global _blob_store
+    _blob_store = store
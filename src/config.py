@@ -5,6 +5,8 @@ from functools import lru_cache
 class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite:///./agent_builder.db"
+    database_replica_urls: str = ""  # Comma-separated read replica URLs
+    read_your_writes_seconds: float = 5.0
 
     # Redis
     redis_host: str = "localhost"
@@ -20,6 +22,61 @@ class Settings(BaseSettings):
     # Application
     session_expiry_seconds: int = 3600
 
+    # LLM usage accounting
+    llm_usage_batch_size: int = 20
+    llm_usage_max_pending: int = 10000  # Oldest rows dropped beyond this
+    llm_usage_retry_seconds: int = 30  # Pause after a failed insert
+
+    # Prompt export cache
+    export_cache_max_bytes: int = 32 * 1024 * 1024
+
+    # Export artifact storage (local blob directory)
+    export_blob_dir: str = "./exports"
+
+    # Prompt generation
+    prompt_generation_workers: int = 4
+    bundle_export_workers: int = 8
+
+    # Bulk agent import (worker processes; rows inserted per transaction)
+    agent_import_workers: int = 4
+    agent_import_batch_size: int = 500
+    agent_import_max_items: int = 10000
+
+    # Archive of finished sessions (local directory)
+    session_archive_dir: str = "./archive"
+    session_archive_batch_size: int = 50
+    session_archive_flush_seconds: int = 30
+
+    # Reaping of sessions whose Redis state expired
+    session_reaper_interval_seconds: int = 30
+    session_reaper_sweep_seconds: int = 600
+    session_reaper_batch_size: int = 500
+
+    # Similar-agent suggestions
+    similar_agents_top_k: int = 3
+    similar_agents_min_score: float = 0.25
+
+    # Workflow runtime (tool calls share one pooled HTTP client)
+    workflow_run_max_steps: int = 200
+    workflow_tool_timeout_seconds: float = 10.0
+    workflow_http_max_connections: int = 200
+    workflow_http_max_keepalive: int = 50
+    # Comma-separated hosts real tool calls may reach (empty: simulated only)
+    workflow_tool_allowed_hosts: str = ""
+
+    # Intent taxonomy JSON file (empty: the bundled src/workflow/intents.json)
+    workflow_intents_path: str = ""
+
+    # Rendered workflow diagrams (local directory, keyed by content hash)
+    workflow_render_dir: str = "./renders"
+
+    # Workflow history: full snapshot every N versions, deltas in between
+    workflow_snapshot_interval: int = 10
+
+    # Agent simulation
+    simulation_concurrency: int = 50
+    simulation_max_conversations: int = 1000
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -1,25 +1,134 @@
-from sqlalchemy import create_engine
+from typing import Dict, Optional
+import itertools
+import threading
+import time
+
+from fastapi import Request
+from sqlalchemy import JSON, create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from src.config import get_settings
 
 settings = get_settings()
 
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False}
-    if "sqlite" in settings.database_url
-    else {},
-)
+
+def _create_engine(url: str):
+    return create_engine(
+        url,
+        connect_args={"check_same_thread": False} if "sqlite" in url else {},
+    )
+
+
+# Primary: all writes, and reads that must see them
+engine = _create_engine(settings.database_url)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read replicas (round-robin); reads use the primary when none are configured
+replica_engines = [
+    _create_engine(url.strip())
+    for url in settings.database_replica_urls.split(",")
+    if url.strip()
+]
+_replica_sessions = itertools.cycle(
+    [
+        sessionmaker(autocommit=False, autoflush=False, bind=replica)
+        for replica in replica_engines
+    ]
+    or [SessionLocal]
+)
+
+# Agent session id -> time of its last committed write (read-your-writes)
+_recent_writes: Dict[str, float] = {}
+_recent_writes_lock = threading.Lock()
+
+
+def mark_written(session_id: str) -> None:
+    """Pin reads for a session to the primary for the read-your-writes window"""
+    now = time.monotonic()
+    with _recent_writes_lock:
+        _recent_writes[session_id] = now
+        if len(_recent_writes) > 10_000:
+            cutoff = now - settings.read_your_writes_seconds
+            for key in [k for k, t in _recent_writes.items() if t < cutoff]:
+                del _recent_writes[key]
+
+
+def recently_written(session_id: Optional[str]) -> bool:
+    """Whether the session wrote to the primary within the window"""
+    if not session_id:
+        return False
+    with _recent_writes_lock:
+        written_at = _recent_writes.get(session_id)
+    return (
+        written_at is not None
+        and time.monotonic() - written_at < settings.read_your_writes_seconds
+    )
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _flag_commit(db) -> None:
+    db.info["committed"] = True
+
+
 Base = declarative_base()
 
+# Native JSON column type: JSONB on PostgreSQL, JSON1 text elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+def upsert(
+    db, model, values: dict, conflict_columns: list, update_columns: list = None
+) -> bool:
+    """
+    INSERT ... ON CONFLICT, so concurrent writers never create duplicates.
+
+    Args:
+        db: Database session (not committed)
+        model: Mapped model class
+        values: Column values for the new row
+        conflict_columns: Columns of the unique constraint to resolve on
+        update_columns: Columns to overwrite on conflict (default: keep existing row)
+
+    Returns:
+        True if a row was inserted or updated
+    """
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(model).values(**values)
+    if update_columns:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_={column: stmt.excluded[column] for column in update_columns},
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+    return db.execute(stmt).rowcount > 0
+
 
-def get_db():
-    """Dependency for FastAPI routes to get DB session"""
+def get_db(request: Request):
+    """Dependency for FastAPI routes to get DB session (primary)"""
     db = SessionLocal()
+    try:
+        yield db
+    finally:
+        # Later reads for this agent session stick to the primary for a while
+        session_id = request.path_params.get("session_id")
+        if session_id and db.info.get("committed"):
+            mark_written(session_id)
+        db.close()
+
+
+def get_read_db(request: Request):
+    """
+    Dependency for read-only routes: a replica session, or the primary
+    if the route's agent session wrote recently (read-your-writes).
+    """
+    if recently_written(request.path_params.get("session_id")):
+        db = SessionLocal()
+    else:
+        db = next(_replica_sessions)()
     try:
         yield db
     finally:
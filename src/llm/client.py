@@ -4,6 +4,7 @@ Includes intelligent routing based on task type.
 """
 
 import json
+import time
 import asyncio
 from typing import Optional, List, Dict, Any
 from enum import Enum
@@ -12,7 +13,8 @@ from openai import AsyncOpenAI
 from anthropic import AsyncAnthropic
 
 from src.config import get_settings
-from src.llm.schemas import LLMResponse, ExtractedData, ConfidenceScores
+from src.llm.schemas import LLMResponse, ExtractedData, ConfidenceScores, LLMUsage
+from src.llm.usage import get_usage_recorder
 from src.session.schemas import ConversationStage
 
 settings = get_settings()
@@ -96,6 +98,7 @@ class LLMClient:
         stage: ConversationStage,
         provider: Optional[LLMProvider] = None,
         temperature: float = 0.7,
+        session_id: Optional[str] = None,
     ) -> LLMResponse:
         """
         Send a message to LLM and get structured response.
@@ -107,6 +110,7 @@ class LLMClient:
             stage: Current conversation stage
             provider: Force specific provider (optional)
             temperature: LLM temperature (0.0-1.0)
+            session_id: Session to attribute token usage to (optional)
 
         Returns:
             Structured LLM response
@@ -119,16 +123,87 @@ class LLMClient:
 
         # Call appropriate provider
         if provider == LLMProvider.OPENAI:
-            return await self._call_openai(
+            response = await self._call_openai(
                 system_prompt, user_message, conversation_history, temperature
             )
         elif provider == LLMProvider.CLAUDE:
-            return await self._call_claude(
+            response = await self._call_claude(
                 system_prompt, user_message, conversation_history, temperature
             )
         else:
             raise ValueError(f"Unknown provider: {provider}")
 
+        # Record token usage for accounting
+        if response.usage:
+            response.usage.stage = stage.value
+            get_usage_recorder().record(session_id, response.usage)
+
+        return response
+
+    async def complete(
+        self,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        provider: Optional[LLMProvider] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        session_id: Optional[str] = None,
+        usage_stage: str = "simulation",
+    ) -> str:
+        """
+        Plain-text completion, without the builder's structured output.
+
+        Args:
+            system_prompt: System prompt
+            messages: Conversation so far (role/content dicts, ends with user)
+            provider: Force specific provider (default: whichever is configured)
+            temperature: LLM temperature (0.0-1.0)
+            max_tokens: Maximum tokens to generate
+            session_id: Session to attribute token usage to (optional)
+            usage_stage: Label recorded with the token usage
+
+        Returns:
+            Response text
+        """
+        if provider is None:
+            if self.openai_client:
+                provider = LLMProvider.OPENAI
+            elif self.anthropic_client:
+                provider = LLMProvider.CLAUDE
+            else:
+                raise ValueError("No LLM provider configured. Add API keys to .env")
+
+        start_time = time.perf_counter()
+        if provider == LLMProvider.OPENAI:
+            if not self.openai_client:
+                raise ValueError("OpenAI client not configured")
+            call_params = {
+                "model": self.openai_model,
+                "messages": [{"role": "system", "content": system_prompt}] + messages,
+                "max_completion_tokens": max_tokens,
+            }
+            if self.openai_model not in ["gpt-4o", "gpt-5"]:
+                call_params["temperature"] = temperature
+            response = await self.openai_client.chat.completions.create(**call_params)
+            usage = self._openai_usage(response, start_time)
+            content = response.choices[0].message.content or ""
+        else:
+            if not self.anthropic_client:
+                raise ValueError("Anthropic client not configured")
+            response = await self.anthropic_client.messages.create(
+                model=self.claude_model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=system_prompt,
+                messages=messages,
+            )
+            usage = self._claude_usage(response, start_time)
+            content = response.content[0].text
+
+        usage.stage = usage_stage
+        get_usage_recorder().record(session_id, usage)
+        return content.strip()
+
     async def _call_openai(
         self,
         system_prompt: str,
@@ -151,6 +226,7 @@ class LLMClient:
         # Add current message
         messages.append({"role": "user", "content": user_message})
 
+        usage = None
         try:
             # Call OpenAI with JSON mode
             # Note: Some models (gpt-4o, gpt-5) only support temperature=1 (default)
@@ -164,21 +240,27 @@ class LLMClient:
             if self.openai_model not in ["gpt-4o", "gpt-5"]:
                 call_params["temperature"] = temperature
 
+            start_time = time.perf_counter()
             response = await self.openai_client.chat.completions.create(**call_params)
+            usage = self._openai_usage(response, start_time)
 
             # Parse response
             content = response.choices[0].message.content
             parsed = json.loads(content)
 
             # Convert to LLMResponse
-            return self._parse_llm_response(parsed)
+            llm_response = self._parse_llm_response(parsed)
+            llm_response.usage = usage
+            return llm_response
 
         except Exception as e:
             print(f"❌ OpenAI error: {e}")
-            # Return fallback response
-            return self._fallback_response(
+            # Return fallback response (tokens were still spent if the call succeeded)
+            fallback = self._fallback_response(
                 "I apologize, but I encountered an error. Could you please rephrase that?"
             )
+            fallback.usage = usage
+            return fallback
 
     async def _call_claude(
         self,
@@ -224,8 +306,10 @@ Rules:
         # Add current message
         messages.append({"role": "user", "content": user_message})
 
+        usage = None
         try:
             # Call Claude
+            start_time = time.perf_counter()
             response = await self.anthropic_client.messages.create(
                 model=self.claude_model,
                 max_tokens=2000,
@@ -233,6 +317,7 @@ Rules:
                 system=enhanced_system_prompt,
                 messages=messages,
             )
+            usage = self._claude_usage(response, start_time)
 
             # Extract content
             content = response.content[0].text
@@ -258,25 +343,59 @@ Rules:
                     # Fallback: create structured response from text
                     print(f"⚠️  Claude returned non-JSON: {content[:200]}")
                     return LLMResponse(
-                        next_question=content
-                        if len(content) < 500
-                        else "Could you tell me more about that?",
+                        next_question=(
+                            content
+                            if len(content) < 500
+                            else "Could you tell me more about that?"
+                        ),
                         extracted_data=ExtractedData(),
                         confidence=ConfidenceScores(),
                         needs_clarification=False,
                         stage_complete=False,
                         reasoning="Direct text response from Claude",
+                        usage=usage,
                     )
 
             # Sanitize the parsed response before creating LLMResponse
             parsed = self._sanitize_claude_response(parsed)
-            return self._parse_llm_response(parsed)
+            llm_response = self._parse_llm_response(parsed)
+            llm_response.usage = usage
+            return llm_response
 
         except Exception as e:
             print(f"❌ Claude error: {e}")
-            return self._fallback_response(
+            fallback = self._fallback_response(
                 "I apologize, but I encountered an error. Could you please rephrase that?"
             )
+            fallback.usage = usage
+            return fallback
+
+    def _openai_usage(self, response: Any, start_time: float) -> LLMUsage:
+        """Extract token usage from an OpenAI chat completion"""
+        usage = getattr(response, "usage", None)
+        details = getattr(usage, "prompt_tokens_details", None)
+        return LLMUsage(
+            provider=LLMProvider.OPENAI.value,
+            model=self.openai_model,
+            input_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            output_tokens=getattr(usage, "completion_tokens", 0) or 0,
+            cached_tokens=getattr(details, "cached_tokens", 0) or 0,
+            latency_ms=int((time.perf_counter() - start_time) * 1000),
+        )
+
+    def _claude_usage(self, response: Any, start_time: float) -> LLMUsage:
+        """Extract token usage from an Anthropic message"""
+        usage = getattr(response, "usage", None)
+        # Anthropic reports cache reads separately from input_tokens
+        cached_tokens = getattr(usage, "cache_read_input_tokens", 0) or 0
+        return LLMUsage(
+            provider=LLMProvider.CLAUDE.value,
+            model=self.claude_model,
+            input_tokens=(getattr(usage, "input_tokens", 0) or 0) + cached_tokens,
+            output_tokens=getattr(usage, "output_tokens", 0) or 0,
+            cached_tokens=cached_tokens,
+            latency_ms=int((time.perf_counter() - start_time) * 1000),
+        )
 
     def _sanitize_claude_response(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -0,0 +1,41 @@
+"""
+Database models for LLM usage accounting.
+"""
+
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy.sql import func
+
+from src.database import Base
+
+
+class LLMUsage(Base):
+    """
+    One row per LLM call.
+    Written in batches by the usage recorder; aggregated by the usage endpoints.
+    """
+
+    __tablename__ = "llm_usage"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(String, ForeignKey("sessions.id"), nullable=True, index=True)
+
+    # Call metadata
+    stage = Column(String, nullable=True)
+    provider = Column(String, nullable=False)
+    model = Column(String, nullable=False)
+
+    # Token counts
+    input_tokens = Column(Integer, default=0, nullable=False)
+    output_tokens = Column(Integer, default=0, nullable=False)
+    cached_tokens = Column(Integer, default=0, nullable=False)
+
+    # Wall-clock latency of the provider call
+    latency_ms = Column(Integer, default=0, nullable=False)
+
+    # Timestamps
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self):
+        return f"<LLMUsage(id={self.id}, session_id={self.session_id}, model={self.model})>"
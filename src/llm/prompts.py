@@ -4,8 +4,9 @@ These guide the LLM's behavior at each stage of the agent building process.
 """
 
 from src.session.schemas import ConversationStage
-from typing import Dict, Any
-
+from typing import Dict, Any, Callable, FrozenSet, Tuple
+from functools import lru_cache
+from string import Formatter
 
 BASE_SYSTEM_PROMPT = """You are an expert AI assistant helping users design voice agents. Your role is to:
 1. Ask intelligent, contextual questions to understand what the user wants
@@ -212,41 +213,76 @@ This is the final step before generating the prompt.
 }
 
 
-def get_system_prompt(stage: ConversationStage, context: Dict[str, Any]) -> str:
-    """
-    Build the complete system prompt for the current stage.
+# Session state values each stage's context is built from.
+# Only these feed the render cache key, so unrelated state changes never re-render.
+STATE_EXTRACTORS: Dict[str, Callable[[Any], Any]] = {
+    "agent_type": lambda state: state.agent_type,
+    "goals": lambda state: state.goals,
+    "tone": lambda state: state.tone,
+    "tool_count": lambda state: len(state.tools or []),
+    "workflow_summary": lambda state: (state.workflow or {}).get("summary"),
+}
 
-    Args:
-        stage: Current conversation stage
-        context: Context data (state, collected info, etc.)
+STAGE_STATE_FIELDS: Dict[ConversationStage, Tuple[str, ...]] = {
+    ConversationStage.COLLECTING_BASICS: ("agent_type", "goals", "tone"),
+    ConversationStage.EXPLORING_TOOLS: ("agent_type", "goals", "tone"),
+    ConversationStage.CONFIGURING_TOOLS: ("agent_type", "goals", "tool_count"),
+    ConversationStage.REVIEWING_WORKFLOW: (
+        "agent_type",
+        "goals",
+        "tone",
+        "tool_count",
+        "workflow_summary",
+    ),
+}
 
-    Returns:
-        Complete system prompt string
+
+class CompiledPrompt:
+    """
+    A stage prompt parsed once at import.
+    Knows exactly which placeholders it references.
     """
-    stage_prompt = STAGE_PROMPTS.get(stage, "")
 
-    # Format stage prompt with context
-    try:
-        formatted_stage = stage_prompt.format(**context)
-    except KeyError:
-        # If formatting fails, use unformatted
-        formatted_stage = stage_prompt
+    def __init__(self, stage: ConversationStage, template: str):
+        self.stage = stage
+        self.template = template
+        self.fields = self._parse_fields(template)
 
-    # Combine base + stage-specific
-    full_prompt = f"{BASE_SYSTEM_PROMPT}\n\n{formatted_stage}"
+        # Stages without placeholders always render to the same prompt
+        self.static_prompt = (
+            f"{BASE_SYSTEM_PROMPT}\n\n{template}" if not self.fields else None
+        )
 
-    return full_prompt
+    def _parse_fields(self, template: str) -> FrozenSet[str]:
+        """Collect placeholder names, rejecting anything but plain {name} fields"""
+        fields = set()
+        for _, field_name, format_spec, conversion in Formatter().parse(template):
+            if field_name is None:
+                continue
+            if not field_name.isidentifier() or format_spec or conversion:
+                raise ValueError(
+                    f"Invalid placeholder {{{field_name}}} in {self.stage.value} prompt"
+                )
+            fields.add(field_name)
+        return frozenset(fields)
+
+    def render(self, context: Dict[str, Any]) -> str:
+        """Render the full system prompt (base + stage) from context"""
+        if self.static_prompt is not None:
+            return self.static_prompt
+        formatted_stage = self.template.format_map(
+            {field: context[field] for field in self.fields}
+        )
+        return f"{BASE_SYSTEM_PROMPT}\n\n{formatted_stage}"
 
 
-def get_context_for_stage(
-    stage: ConversationStage, session_state: Any
-) -> Dict[str, Any]:
+def _build_context(stage: ConversationStage, values: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Build context dictionary for prompt formatting based on stage.
+    Build context dictionary for prompt formatting from extracted state values.
 
     Args:
         stage: Current conversation stage
-        session_state: Current session state
+        values: State values listed in STAGE_STATE_FIELDS for this stage
 
     Returns:
         Context dictionary for prompt formatting
@@ -257,20 +293,11 @@ def get_context_for_stage(
         collected = []
         missing = []
 
-        if session_state.agent_type:
-            collected.append(f"agent_type: {session_state.agent_type}")
-        else:
-            missing.append("agent_type")
-
-        if session_state.goals:
-            collected.append(f"goals: {session_state.goals}")
-        else:
-            missing.append("goals")
-
-        if session_state.tone:
-            collected.append(f"tone: {session_state.tone}")
-        else:
-            missing.append("tone")
+        for field in ("agent_type", "goals", "tone"):
+            if values[field]:
+                collected.append(f"{field}: {values[field]}")
+            else:
+                missing.append(field)
 
         context["state"] = f"Stage: {stage.value}"
         context["collected"] = ", ".join(collected) if collected else "Nothing yet"
@@ -278,27 +305,122 @@ def get_context_for_stage(
 
     elif stage == ConversationStage.EXPLORING_TOOLS:
         context["agent_info"] = (
-            f"Type: {session_state.agent_type}, "
-            f"Goals: {session_state.goals}, "
-            f"Tone: {session_state.tone}"
+            f"Type: {values['agent_type']}, "
+            f"Goals: {values['goals']}, "
+            f"Tone: {values['tone']}"
         )
 
     elif stage == ConversationStage.CONFIGURING_TOOLS:
         context["agent_info"] = (
-            f"Type: {session_state.agent_type}, Goals: {session_state.goals}"
+            f"Type: {values['agent_type']}, " f"Goals: {values['goals']}"
         )
         context["tools"] = (
-            f"{len(session_state.tools)} tool(s) configured"
-            if session_state.tools
+            f"{values['tool_count']} tool(s) configured"
+            if values["tool_count"]
             else "No tools yet"
         )
 
     elif stage == ConversationStage.REVIEWING_WORKFLOW:
         context["full_state"] = {
-            "agent_type": session_state.agent_type,
-            "goals": session_state.goals,
-            "tone": session_state.tone,
-            "tools": len(session_state.tools),
+            "agent_type": values["agent_type"],
+            "goals": values["goals"],
+            "tone": values["tone"],
+            "tools": values["tool_count"],
         }
+        context["workflow_summary"] = values["workflow_summary"] or "Not generated yet"
 
     return context
+
+
+def _compile_stage_prompts() -> Dict[ConversationStage, CompiledPrompt]:
+    """
+    Compile every stage prompt and check that its placeholders are all
+    provided by the stage's context builder. Fails at import, not mid-conversation.
+    """
+    compiled = {}
+    for stage, template in STAGE_PROMPTS.items():
+        prompt = CompiledPrompt(stage, template)
+        sample_values = {field: None for field in STAGE_STATE_FIELDS.get(stage, ())}
+        provided = _build_context(stage, sample_values).keys()
+        undefined = prompt.fields - provided
+        if undefined:
+            raise ValueError(
+                f"{stage.value} prompt references undefined placeholders: "
+                f"{', '.join(sorted(undefined))}"
+            )
+        compiled[stage] = prompt
+    return compiled
+
+
+COMPILED_PROMPTS = _compile_stage_prompts()
+
+# Stages without a stage prompt (e.g. COMPLETED) just use the base prompt
+_EMPTY_PROMPT = f"{BASE_SYSTEM_PROMPT}\n\n"
+
+
+def get_system_prompt(stage: ConversationStage, context: Dict[str, Any]) -> str:
+    """
+    Build the complete system prompt for the current stage.
+
+    Args:
+        stage: Current conversation stage
+        context: Context data (state, collected info, etc.)
+
+    Returns:
+        Complete system prompt string
+    """
+    compiled = COMPILED_PROMPTS.get(stage)
+    if compiled is None:
+        return _EMPTY_PROMPT
+    return compiled.render(context)
+
+
+def get_context_for_stage(
+    stage: ConversationStage, session_state: Any
+) -> Dict[str, Any]:
+    """
+    Build context dictionary for prompt formatting based on stage.
+
+    Args:
+        stage: Current conversation stage
+        session_state: Current session state
+
+    Returns:
+        Context dictionary for prompt formatting
+    """
+    values = dict(
+        zip(STAGE_STATE_FIELDS.get(stage, ()), _state_fingerprint(stage, session_state))
+    )
+    return _build_context(stage, values)
+
+
+def _state_fingerprint(stage: ConversationStage, session_state: Any) -> Tuple:
+    """Values of only the state fields this stage's prompt depends on"""
+    return tuple(
+        STATE_EXTRACTORS[field](session_state)
+        for field in STAGE_STATE_FIELDS.get(stage, ())
+    )
+
+
+@lru_cache(maxsize=512)
+def _render_cached(stage: ConversationStage, fingerprint: Tuple) -> str:
+    """Render a stage prompt for a given state fingerprint (memoized)"""
+    values = dict(zip(STAGE_STATE_FIELDS.get(stage, ()), fingerprint))
+    return get_system_prompt(stage, _build_context(stage, values))
+
+
+def render_system_prompt(stage: ConversationStage, session_state: Any) -> str:
+    """
+    Build the complete system prompt for a session's current stage.
+
+    Memoized on the stage plus the state fields the stage references,
+    so turns that don't change those fields reuse the rendered prompt.
+
+    Args:
+        stage: Current conversation stage
+        session_state: Current session state
+
+    Returns:
+        Complete system prompt string
+    """
+    return _render_cached(stage, _state_fingerprint(stage, session_state))
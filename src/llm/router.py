@@ -0,0 +1,52 @@
+"""
+API endpoints for LLM token and cost accounting.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session as DBSession
+
+from src.database import get_db
+from src.redis_client import redis_client
+from src.session.models import Session
+from src.llm.schemas import UsageReport
+from src.llm.usage import build_usage_report, get_usage_recorder
+
+router = APIRouter(prefix="/usage", tags=["usage"])
+
+
+@router.get("", response_model=UsageReport)
+async def get_usage(db: DBSession = Depends(get_db)):
+    """
+    Get LLM usage totals across all sessions by stage, provider and model.
+    """
+
+    # Persist anything still buffered so totals are current
+    await run_in_threadpool(get_usage_recorder().flush)
+
+    return build_usage_report(db)
+
+
+@router.get("/{session_id}", response_model=UsageReport)
+async def get_session_usage(session_id: str, db: DBSession = Depends(get_db)):
+    """
+    Get LLM usage totals for a session by stage, provider and model.
+    Includes the live Redis counters while the session is active.
+    """
+
+    db_session = db.query(Session).filter(Session.id == session_id).first()
+    if not db_session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Session {session_id} not found",
+        )
+
+    await run_in_threadpool(get_usage_recorder().flush)
+
+    report = build_usage_report(db, session_id)
+    report.live_counters = redis_client.get_llm_usage(session_id) or None
+
+    return report
+
+
+__all__ = ["router"]
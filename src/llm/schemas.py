@@ -35,6 +35,18 @@ class ConfidenceScores(BaseModel):
     tool_details: float = 0.0
 
 
+class LLMUsage(BaseModel):
+    """Token usage and latency for a single LLM call"""
+
+    provider: str
+    model: str
+    stage: Optional[str] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    latency_ms: int = 0
+
+
 class LLMResponse(BaseModel):
     """Structured response from LLM"""
 
@@ -56,6 +68,9 @@ class LLMResponse(BaseModel):
         default=False, description="Whether current stage is complete"
     )
     reasoning: str = Field(default="", description="Internal reasoning (for debugging)")
+    usage: Optional[LLMUsage] = Field(
+        default=None, description="Token usage reported by the provider"
+    )
 
 
 class LLMRequest(BaseModel):
@@ -65,3 +80,36 @@ class LLMRequest(BaseModel):
     user_message: str
     conversation_history: list
     context: Dict[str, Any]
+
+
+class UsageTotals(BaseModel):
+    """Aggregated token usage"""
+
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    latency_ms: int = 0
+    estimated_cost_usd: float = 0.0
+
+
+class UsageBreakdown(UsageTotals):
+    """Aggregated token usage for one (stage, provider, model) combination"""
+
+    stage: Optional[str] = None
+    provider: str
+    model: str
+
+
+class UsageReport(BaseModel):
+    """Token usage report by stage, provider and model"""
+
+    session_id: Optional[str] = None
+    totals: UsageTotals = Field(default_factory=UsageTotals)
+    by_stage: Dict[str, UsageTotals] = Field(default_factory=dict)
+    by_provider: Dict[str, UsageTotals] = Field(default_factory=dict)
+    by_model: Dict[str, UsageTotals] = Field(default_factory=dict)
+    breakdown: List[UsageBreakdown] = Field(default_factory=list)
+    live_counters: Optional[Dict[str, Dict[str, int]]] = Field(
+        default=None, description="Per-session counters from Redis (active sessions)"
+    )
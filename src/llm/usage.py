@@ -0,0 +1,223 @@
+"""
+LLM usage accounting - token counts, latency and estimated cost per call.
+
+Every call is added to per-session counters in Redis immediately and
+buffered for batched inserts into the llm_usage table. Full batches are
+inserted on a background thread so the async LLM client never waits on
+the database.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session as DBSession
+
+from src.config import get_settings
+from src.database import SessionLocal
+from src.llm.models import LLMUsage as DBLLMUsage
+from src.llm.schemas import LLMUsage, UsageBreakdown, UsageReport, UsageTotals
+from src.redis_client import redis_client
+
+settings = get_settings()
+
+
+# USD per 1M tokens: (input, cached input, output)
+MODEL_PRICING: Dict[str, Tuple[float, float, float]] = {
+    "gpt-5": (1.25, 0.125, 10.0),
+    "gpt-4o": (2.5, 1.25, 10.0),
+    "claude-sonnet-4-20250514": (3.0, 0.3, 15.0),
+}
+
+
+def estimate_cost(
+    model: str, input_tokens: int, output_tokens: int, cached_tokens: int = 0
+) -> float:
+    """
+    Estimate the USD cost of a call.
+
+    Cached tokens are billed at the cached rate; the remaining input
+    tokens at the normal input rate. Unknown models cost 0.
+    """
+    pricing = MODEL_PRICING.get(model)
+    if pricing is None:
+        return 0.0
+
+    input_price, cached_price, output_price = pricing
+    uncached = max(input_tokens - cached_tokens, 0)
+    cost = (
+        uncached * input_price
+        + cached_tokens * cached_price
+        + output_tokens * output_price
+    )
+    return round(cost / 1_000_000, 6)
+
+
+class UsageRecorder:
+    """
+    Records LLM usage to Redis counters and batches rows for the database.
+    """
+
+    def __init__(self, batch_size: int = None, max_pending: int = None):
+        self.batch_size = batch_size or settings.llm_usage_batch_size
+        self.max_pending = max_pending or settings.llm_usage_max_pending
+        self.dropped = 0  # Rows discarded because the backlog was full
+        self._pending: List[dict] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flushing = False
+        self._retry_at = 0.0
+
+    def record(self, session_id: Optional[str], usage: LLMUsage) -> None:
+        """
+        Record a single LLM call.
+
+        Args:
+            session_id: Session the call belongs to (None for sessionless calls)
+            usage: Usage reported by the provider
+        """
+        row = usage.model_dump()
+        row["session_id"] = session_id
+
+        if session_id:
+            redis_client.increment_llm_usage(session_id, row)
+
+        with self._lock:
+            self._pending.append(row)
+            self._trim()
+            should_flush = (
+                len(self._pending) >= self.batch_size
+                and not self._flushing
+                and time.monotonic() >= self._retry_at
+            )
+            if should_flush:
+                self._flushing = True
+
+        if should_flush:
+            # Called from the async LLM client: insert off the event loop
+            threading.Thread(target=self._flush_in_background, daemon=True).start()
+
+    def _flush_in_background(self) -> None:
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                self._flushing = False
+
+    def _trim(self) -> None:
+        """Drop the oldest rows beyond max_pending (caller holds _lock)"""
+        excess = len(self._pending) - self.max_pending
+        if excess > 0:
+            del self._pending[:excess]
+            self.dropped += excess
+
+    def flush(self) -> int:
+        """
+        Insert all buffered rows in a single batch.
+        Blocks on the database; async callers should use run_in_threadpool.
+
+        Returns:
+            Number of rows written
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._pending = self._pending, []
+
+            if not rows:
+                return 0
+
+            db = SessionLocal()
+            try:
+                db.execute(insert(DBLLMUsage), rows)
+                db.commit()
+                self._retry_at = 0.0
+                return len(rows)
+            except Exception as e:
+                db.rollback()
+                # Keep rows for the next flush, up to max_pending
+                with self._lock:
+                    self._pending = rows + self._pending
+                    self._trim()
+                    self._retry_at = time.monotonic() + settings.llm_usage_retry_seconds
+                    kept, dropped = len(self._pending), self.dropped
+                print(
+                    f"⚠️  Failed to persist LLM usage: {e}"
+                    f" ({kept} rows pending, {dropped} dropped)"
+                )
+                return 0
+            finally:
+                db.close()
+
+
+def _add_to_totals(totals: UsageTotals, row: UsageTotals) -> None:
+    """Accumulate one aggregate into another"""
+    totals.calls += row.calls
+    totals.input_tokens += row.input_tokens
+    totals.output_tokens += row.output_tokens
+    totals.cached_tokens += row.cached_tokens
+    totals.latency_ms += row.latency_ms
+    totals.estimated_cost_usd = round(
+        totals.estimated_cost_usd + row.estimated_cost_usd, 6
+    )
+
+
+def build_usage_report(db: DBSession, session_id: Optional[str] = None) -> UsageReport:
+    """
+    Aggregate persisted usage by stage, provider and model.
+
+    Args:
+        db: Database session
+        session_id: Limit the report to one session (default: all sessions)
+
+    Returns:
+        Usage report
+    """
+    query = db.query(
+        DBLLMUsage.stage,
+        DBLLMUsage.provider,
+        DBLLMUsage.model,
+        func.count(DBLLMUsage.id),
+        func.coalesce(func.sum(DBLLMUsage.input_tokens), 0),
+        func.coalesce(func.sum(DBLLMUsage.output_tokens), 0),
+        func.coalesce(func.sum(DBLLMUsage.cached_tokens), 0),
+        func.coalesce(func.sum(DBLLMUsage.latency_ms), 0),
+    )
+    if session_id:
+        query = query.filter(DBLLMUsage.session_id == session_id)
+    query = query.group_by(DBLLMUsage.stage, DBLLMUsage.provider, DBLLMUsage.model)
+
+    report = UsageReport(session_id=session_id)
+
+    for stage, provider, model, calls, inp, out, cached, latency in query.all():
+        row = UsageBreakdown(
+            stage=stage,
+            provider=provider,
+            model=model,
+            calls=calls,
+            input_tokens=inp,
+            output_tokens=out,
+            cached_tokens=cached,
+            latency_ms=latency,
+            estimated_cost_usd=estimate_cost(model, inp, out, cached),
+        )
+        report.breakdown.append(row)
+
+        _add_to_totals(report.totals, row)
+        _add_to_totals(report.by_stage.setdefault(stage or "none", UsageTotals()), row)
+        _add_to_totals(report.by_provider.setdefault(provider, UsageTotals()), row)
+        _add_to_totals(report.by_model.setdefault(model, UsageTotals()), row)
+
+    return report
+
+
+# Global recorder instance
+_usage_recorder: Optional[UsageRecorder] = None
+
+
+def get_usage_recorder() -> UsageRecorder:
+    """Get or create the global usage recorder instance"""
+    global _usage_recorder
+    if _usage_recorder is None:
+        _usage_recorder = UsageRecorder()
+    return _usage_recorder
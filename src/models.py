@@ -5,14 +5,17 @@ This makes it easy to import all models in one place (e.g., for Alembic migratio
 
 from src.database import Base
 from src.session.models import Session, SessionStatus
-from src.workflow.models import Workflow
+from src.workflow.models import Workflow, WorkflowVersion
 from src.prompt.models import PromptExport, ExportFormat
+from src.llm.models import LLMUsage
 
 __all__ = [
     "Base",
     "Session",
     "SessionStatus",
     "Workflow",
+    "WorkflowVersion",
     "PromptExport",
     "ExportFormat",
+    "LLMUsage",
 ]
@@ -8,7 +8,7 @@ from datetime import datetime
 
 from src.session.schemas import SessionState, ConversationStage, ToolConfigSchema
 from src.llm.client import get_llm_client
-from src.llm.prompts import get_system_prompt, get_context_for_stage
+from src.llm.prompts import render_system_prompt
 from src.llm.schemas import LLMResponse
 from src.orchestrator.stages import determine_next_stage, is_stage_complete
 from src.workflow.synthesizer import get_synthesizer
@@ -43,11 +43,8 @@ class ConversationOrchestrator:
                 - is_complete: Whether conversation is done
         """
 
-        # 1. Build context for LLM
-        context = get_context_for_stage(session_state.stage, session_state)
-
-        # 2. Get system prompt for current stage
-        system_prompt = get_system_prompt(session_state.stage, context)
+        # 1-2. Get system prompt for current stage (memoized on the context it uses)
+        system_prompt = render_system_prompt(session_state.stage, session_state)
 
         # 3. Call LLM
         llm_response = await self.llm_client.chat(
@@ -55,6 +52,7 @@ class ConversationOrchestrator:
             user_message=user_message,
             conversation_history=session_state.conversation_history,
             stage=session_state.stage,
+            session_id=session_state.session_id,
         )
 
         # 4. Update session state with extracted data
@@ -99,6 +97,75 @@ class ConversationOrchestrator:
             "new_stage": new_stage if stage_changed else None,
         }
 
+    async def apply_template(
+        self, session_state: SessionState, template: SessionState
+    ) -> Dict[str, Any]:
+        """
+        Pre-fill a new session from a past completed agent.
+
+        The specification is copied over and the session jumps straight
+        to workflow review, skipping the collection stages (and their LLM
+        calls). The user can still request changes during review.
+
+        Args:
+            session_state: Current session state (early stage)
+            template: Completed agent to copy from
+
+        Returns:
+            Same shape as process_message
+        """
+
+        copied = template.model_dump(
+            exclude={
+                "session_id",
+                "stage",
+                "conversation_history",
+                "collected_fields",
+                "workflow",
+                "final_prompt",
+                "created_at",
+                "updated_at",
+            }
+        )
+        updated_state = session_state.model_copy(update=copied)
+        updated_state.tools = [tool.model_copy() for tool in template.tools]
+
+        for field in ("agent_type", "goals", "tone", "use_tools"):
+            if (
+                getattr(updated_state, field) is not None
+                and field not in updated_state.collected_fields
+            ):
+                updated_state.collected_fields.append(field)
+        if updated_state.tools and "tools" not in updated_state.collected_fields:
+            updated_state.collected_fields.append("tools")
+
+        new_stage = ConversationStage.REVIEWING_WORKFLOW
+        print(f"📊 Stage transition: {session_state.stage} → {new_stage}")
+        print(f"   Reason: Seeded from template {template.session_id}")
+        updated_state.stage = new_stage
+
+        workflow_summary = await self._generate_workflow_summary(updated_state)
+        updated_state.workflow = {"summary": workflow_summary}
+        updated_state.updated_at = datetime.utcnow()
+
+        ai_response = "\n".join(
+            [
+                "Great! I've started from a similar past agent"
+                f" ({template.agent_type or 'voice agent'}).",
+                "\n📋 Here's your agent workflow:\n",
+                workflow_summary,
+                "\nDoes this look good to you? Would you like to make any changes?",
+            ]
+        )
+
+        return {
+            "ai_response": ai_response,
+            "updated_state": updated_state,
+            "stage_changed": True,
+            "is_complete": False,
+            "new_stage": new_stage,
+        }
+
     def _update_session_state(
         self, session_state: SessionState, llm_response: LLMResponse
     ) -> SessionState:
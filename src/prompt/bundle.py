@@ -0,0 +1,168 @@
+"""
+Bundle Export - Streams many agents' exports as a single ZIP archive.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+import json
+import re
+import zipfile
+
+from src.config import get_settings
+from src.prompt.generator import get_prompt_generator
+from src.prompt.schemas import PromptFormat
+from src.redis_client import redis_client
+from src.session.schemas import SessionState
+
+settings = get_settings()
+
+
+class _ZipStream:
+    """
+    Write-only file object that hands written bytes back to the caller.
+    ZipFile treats it as unseekable and writes data descriptors instead
+    of seeking back, so the archive can be streamed.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _agent_folder(session_state: SessionState) -> str:
+    """Folder name for an agent inside the archive"""
+    agent_type = re.sub(r"[^A-Za-z0-9_-]+", "_", session_state.agent_type or "agent")
+    return f"{agent_type.strip('_') or 'agent'}_{session_state.session_id}"
+
+
+def _build_entries(
+    session_state: SessionState,
+    prompt_formats: Optional[List[PromptFormat]],
+    include_workflow: bool,
+) -> List[Tuple[str, bytes]]:
+    """
+    Generate one agent's archive entries (runs on a worker thread).
+
+    Returns:
+        List of (path inside archive, file content)
+    """
+    # Prefer live state (has full tool configs) over the persisted copy
+    live_state = redis_client.get_session(session_state.session_id)
+    if live_state:
+        session_state = SessionState(**live_state)
+
+    generator = get_prompt_generator()
+    export_package = generator.get_export_package(
+        session_state=session_state,
+        prompt_formats=prompt_formats,
+        include_workflow=include_workflow,
+    )
+
+    folder = _agent_folder(session_state)
+    entries = []
+
+    for format_name, prompt in export_package.prompts.items():
+        entries.append(
+            (f"{folder}/prompts/{format_name}.txt", prompt.system_prompt.encode())
+        )
+
+    tools = [tool.model_dump(mode="json") for tool in export_package.tools]
+    entries.append(
+        (
+            f"{folder}/tools.json",
+            json.dumps(tools, indent=2, ensure_ascii=False).encode(),
+        )
+    )
+
+    if export_package.workflow_diagram:
+        entries.append(
+            (f"{folder}/workflow.mmd", export_package.workflow_diagram.encode())
+        )
+
+    return entries
+
+
+def stream_bundle(
+    session_states: List[SessionState],
+    prompt_formats: Optional[List[PromptFormat]] = None,
+    include_workflow: bool = True,
+    max_workers: int = None,
+) -> Iterator[bytes]:
+    """
+    Stream a ZIP archive of exports for many sessions.
+
+    Agents are generated in parallel on a bounded pool with a bounded
+    number in flight, and each is written to the archive (and yielded)
+    as soon as it is ready, so memory does not grow with the bundle size.
+
+    Args:
+        session_states: Sessions to include
+        prompt_formats: Prompt formats to include (default: all)
+        include_workflow: Whether to include Mermaid workflow files
+        max_workers: Worker pool size (default: BUNDLE_EXPORT_WORKERS)
+
+    Yields:
+        ZIP archive bytes
+    """
+    max_workers = max_workers or settings.bundle_export_workers
+    max_in_flight = max_workers * 2
+
+    stream = _ZipStream()
+    manifest: Dict[str, list] = {"exported": [], "skipped": [], "failed": []}
+
+    pending_states = iter(session_states)
+    in_flight: Dict[Future, str] = {}
+
+    with zipfile.ZipFile(stream, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="bundle-export"
+        ) as executor:
+
+            def submit_next() -> None:
+                for state in pending_states:
+                    if not state.agent_type or not state.goals:
+                        manifest["skipped"].append(state.session_id)
+                        continue
+                    future = executor.submit(
+                        _build_entries, state, prompt_formats, include_workflow
+                    )
+                    in_flight[future] = state.session_id
+                    return
+
+            for _ in range(max_in_flight):
+                submit_next()
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+                # Write agents in completion order, topping up the pool as we go
+                for future in done:
+                    session_id = in_flight.pop(future)
+                    submit_next()
+
+                    try:
+                        entries = future.result()
+                    except Exception as e:
+                        print(f"⚠️  Bundle export failed for {session_id}: {e}")
+                        manifest["failed"].append(session_id)
+                        continue
+
+                    for arcname, content in entries:
+                        zf.writestr(arcname, content)
+                        yield stream.drain()
+                    manifest["exported"].append(session_id)
+
+        zf.writestr("manifest.json", json.dumps(manifest, indent=2))
+
+    yield stream.drain()
@@ -0,0 +1,125 @@
+"""
+Content-addressed cache for generated export packages.
+
+Packages are keyed by a hash of the normalized session content, the
+template version and the export options, so identical agents share one
+artifact across requests and sessions, and any state change misses.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import threading
+
+from src.config import get_settings
+from src.prompt.schemas import PromptExport
+from src.prompt.templates import TEMPLATE_VERSION
+from src.session.schemas import SessionState
+
+settings = get_settings()
+
+
+# Session bookkeeping that never affects generated exports
+NON_CONTENT_FIELDS = {
+    "session_id",
+    "stage",
+    "conversation_history",
+    "collected_fields",
+    "workflow",
+    "final_prompt",
+    "created_at",
+    "updated_at",
+}
+
+
+def compute_export_key(session_state: SessionState, options: Dict[str, Any]) -> str:
+    """
+    Hash the content that determines an export package.
+
+    Args:
+        session_state: Session state to export
+        options: Export options (included formats, workflow, ...)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    content = session_state.model_dump(mode="json", exclude=NON_CONTENT_FIELDS)
+    payload = json.dumps(
+        {"template_version": TEMPLATE_VERSION, "state": content, "options": options},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ExportCache:
+    """
+    LRU cache of export packages, bounded by total serialized size.
+    """
+
+    def __init__(self, max_bytes: int = None):
+        self.max_bytes = max_bytes or settings.export_cache_max_bytes
+        self._entries: "OrderedDict[str, tuple[PromptExport, int]]" = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[PromptExport]:
+        """Return the cached package for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, package: PromptExport) -> None:
+        """Store a package, evicting least recently used entries if over budget"""
+        size = len(package.model_dump_json().encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._size_bytes -= self._entries.pop(key)[1]
+
+            self._entries[key] = (package, size)
+            self._size_bytes += size
+
+            while self._size_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size_bytes -= evicted_size
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit-rate statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# Global cache instance
+_export_cache: Optional[ExportCache] = None
+
+
+def get_export_cache() -> ExportCache:
+    """Get or create the global export cache instance"""
+    global _export_cache
+    if _export_cache is None:
+        _export_cache = ExportCache()
+    return _export_cache
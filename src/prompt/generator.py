@@ -2,11 +2,14 @@
 Prompt Generator - Creates production-ready system prompts from session data.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import json
 import yaml
 
+from src.config import get_settings
+
 from src.prompt.schemas import (
     PromptFormat,
     PromptExportFormat,
@@ -15,16 +18,31 @@ from src.prompt.schemas import (
     PromptExport,
 )
 from src.prompt.templates import PROMPT_GENERATORS
+from src.prompt.cache import compute_export_key, get_export_cache
 from src.session.schemas import SessionState
 from src.workflow.schemas import WorkflowData
+from src.workflow.synthesizer import get_synthesizer
 from src.workflow.visualizer import generate_mermaid_diagram, generate_text_summary
 
+settings = get_settings()
+
+# Target size of chunks yielded by streaming renderers
+STREAM_CHUNK_SIZE = 64 * 1024
+
 
 class PromptGenerator:
     """
     Generates production-ready system prompts and tool configurations.
+    Independent renders (one per format, plus workflow visualizations)
+    run concurrently on a bounded thread pool.
     """
 
+    def __init__(self, max_workers: int = None):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.prompt_generation_workers,
+            thread_name_prefix="prompt-gen",
+        )
+
     def generate_prompt(
         self, session_state: SessionState, format: PromptFormat
     ) -> GeneratedPrompt:
@@ -50,7 +68,7 @@ class PromptGenerator:
             goals=session_state.goals or "assist users",
             tone=session_state.tone or "helpful",
             use_tools=session_state.use_tools or False,
-            tools=session_state.tools,
+            tools=[tool.model_dump() for tool in session_state.tools],
         )
 
         # Build instructions list
@@ -94,11 +112,13 @@ class PromptGenerator:
         if formats is None:
             formats = list(PromptFormat)
 
-        prompts = {}
-        for format in formats:
-            prompts[format.value] = self.generate_prompt(session_state, format)
+        if len(formats) == 1:
+            return {formats[0].value: self.generate_prompt(session_state, formats[0])}
 
-        return prompts
+        results = self._executor.map(
+            lambda format: self.generate_prompt(session_state, format), formats
+        )
+        return {format.value: prompt for format, prompt in zip(formats, results)}
 
     def generate_tool_configurations(
         self, session_state: SessionState
@@ -117,11 +137,12 @@ class PromptGenerator:
             return []
 
         tool_configs = []
-        for tool_data in session_state.tools:
+        for tool in session_state.tools:
+            tool_data = tool.model_dump()
             tool_config = ToolConfiguration(
-                name=tool_data.get("name", "Unnamed Tool"),
-                description=tool_data.get("description", ""),
-                parameters=tool_data.get("parameters", {}),
+                name=tool_data.get("name") or "Unnamed Tool",
+                description=tool_data.get("description") or "",
+                parameters=tool_data.get("input_schema", {}),
                 endpoint=tool_data.get("endpoint"),
                 method=tool_data.get("method", "POST"),
                 headers=tool_data.get("headers", {}),
@@ -151,18 +172,31 @@ class PromptGenerator:
             Complete export package
         """
 
-        # Generate prompts
-        prompts = self.generate_all_prompts(session_state, prompt_formats)
+        if prompt_formats is None:
+            prompt_formats = list(PromptFormat)
 
-        # Generate tool configurations
+        # Submit every independent render to the pool up front
+        prompt_futures = {
+            format.value: self._executor.submit(
+                self.generate_prompt, session_state, format
+            )
+            for format in prompt_formats
+        }
+
+        diagram_future = None
+        summary_future = None
+        if include_workflow and workflow:
+            diagram_future = self._executor.submit(generate_mermaid_diagram, workflow)
+            summary_future = self._executor.submit(generate_text_summary, workflow)
+
+        # Generate tool configurations while renders run
         tools = self.generate_tool_configurations(session_state)
 
+        prompts = {name: future.result() for name, future in prompt_futures.items()}
+
         # Get workflow visualizations if available
-        workflow_diagram = None
-        workflow_summary = None
-        if include_workflow and workflow:
-            workflow_diagram = generate_mermaid_diagram(workflow)
-            workflow_summary = generate_text_summary(workflow)
+        workflow_diagram = diagram_future.result() if diagram_future else None
+        workflow_summary = summary_future.result() if summary_future else None
 
         return PromptExport(
             session_id=session_state.session_id,
@@ -176,6 +210,71 @@ class PromptGenerator:
             created_at=datetime.utcnow().isoformat(),
         )
 
+    def export_key(
+        self,
+        session_state: SessionState,
+        prompt_formats: List[PromptFormat] = None,
+        include_workflow: bool = True,
+    ) -> str:
+        """
+        Content hash identifying the export package for this state and options.
+
+        Args:
+            session_state: Current session state
+            prompt_formats: Formats to include (default: all)
+            include_workflow: Whether to include workflow diagram
+
+        Returns:
+            Hex digest usable as a cache key
+        """
+        formats = prompt_formats or list(PromptFormat)
+        options = {
+            "prompt_formats": sorted(f.value for f in formats),
+            "include_workflow": include_workflow,
+        }
+        return compute_export_key(session_state, options)
+
+    def get_export_package(
+        self,
+        session_state: SessionState,
+        prompt_formats: List[PromptFormat] = None,
+        include_workflow: bool = True,
+    ) -> PromptExport:
+        """
+        Get the export package for a session, reusing a cached package
+        generated from identical content (by any session) when available.
+
+        Args:
+            session_state: Current session state
+            prompt_formats: Formats to include (default: all)
+            include_workflow: Whether to include workflow diagram
+
+        Returns:
+            Complete export package
+        """
+
+        key = self.export_key(session_state, prompt_formats, include_workflow)
+        cache = get_export_cache()
+
+        export_package = cache.get(key)
+        if export_package is None:
+            workflow = None
+            if include_workflow:
+                workflow = get_synthesizer().synthesize(session_state)
+
+            export_package = self.create_export_package(
+                session_state=session_state,
+                workflow=workflow,
+                prompt_formats=prompt_formats,
+                include_workflow=include_workflow,
+            )
+            cache.put(key, export_package)
+
+        # Cached packages may come from another session with the same content
+        return export_package.model_copy(
+            update={"session_id": session_state.session_id}
+        )
+
     def export_to_format(
         self, export_package: PromptExport, format: PromptExportFormat
     ) -> str:
@@ -190,27 +289,50 @@ class PromptGenerator:
             Formatted string ready for file output
         """
 
+        return "".join(self.iter_export(export_package, format))
+
+    def iter_export(
+        self, export_package: PromptExport, format: PromptExportFormat
+    ) -> Iterator[str]:
+        """
+        Render the package to a file format incrementally.
+        Concatenated chunks equal export_to_format() output.
+
+        Args:
+            export_package: Complete export package
+            format: Output format
+
+        Yields:
+            Text chunks of roughly STREAM_CHUNK_SIZE characters
+        """
+
         if format == PromptExportFormat.JSON:
-            return json.dumps(
-                export_package.model_dump(mode="json"), indent=2, ensure_ascii=False
-            )
+            encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+            chunks = encoder.iterencode(export_package.model_dump(mode="json"))
 
         elif format == PromptExportFormat.YAML:
-            return yaml.dump(
-                export_package.model_dump(mode="json"),
-                default_flow_style=False,
-                allow_unicode=True,
-            )
+            chunks = self._iter_yaml(export_package.model_dump(mode="json"))
 
         elif format == PromptExportFormat.MARKDOWN:
-            return self._export_to_markdown(export_package)
+            chunks = _join_lines(self._iter_markdown_lines(export_package))
 
         elif format == PromptExportFormat.TEXT:
-            return self._export_to_text(export_package)
+            chunks = _join_lines(self._iter_text_lines(export_package))
 
         else:
             raise ValueError(f"Unsupported export format: {format}")
 
+        return _coalesce(chunks)
+
+    def _iter_yaml(self, data: Dict[str, Any]) -> Iterator[str]:
+        """Dump a mapping one top-level key at a time (same output as yaml.dump)"""
+        for key in sorted(data):
+            yield yaml.dump(
+                {key: data[key]},
+                default_flow_style=False,
+                allow_unicode=True,
+            )
+
     def _build_instructions(self, session_state: SessionState) -> List[str]:
         """Build specific instructions list from session data"""
 
@@ -244,106 +366,121 @@ class PromptGenerator:
         # to include actual example conversations
         return None
 
-    def _export_to_markdown(self, export_package: PromptExport) -> str:
-        """Export package as markdown document"""
-
-        lines = []
+    def _iter_markdown_lines(self, export_package: PromptExport) -> Iterator[str]:
+        """Yield the package as markdown document lines"""
 
         # Header
-        lines.append(f"# {export_package.agent_type.upper()} Agent Configuration")
-        lines.append(f"\n**Generated:** {export_package.created_at}")
-        lines.append(f"**Session ID:** {export_package.session_id}\n")
+        yield f"# {export_package.agent_type.upper()} Agent Configuration"
+        yield f"\n**Generated:** {export_package.created_at}"
+        yield f"**Session ID:** {export_package.session_id}\n"
 
         # Overview
-        lines.append("## Overview")
-        lines.append(f"- **Type:** {export_package.agent_type}")
-        lines.append(f"- **Goals:** {export_package.agent_goals}")
-        lines.append(f"- **Tone:** {export_package.agent_tone}")
-        lines.append(f"- **Tools:** {len(export_package.tools)}\n")
+        yield "## Overview"
+        yield f"- **Type:** {export_package.agent_type}"
+        yield f"- **Goals:** {export_package.agent_goals}"
+        yield f"- **Tone:** {export_package.agent_tone}"
+        yield f"- **Tools:** {len(export_package.tools)}\n"
 
         # System Prompts
-        lines.append("## System Prompts")
+        yield "## System Prompts"
         for format_name, prompt in export_package.prompts.items():
-            lines.append(f"\n### {format_name.upper()}")
-            lines.append("```")
-            lines.append(prompt.system_prompt)
-            lines.append("```\n")
+            yield f"\n### {format_name.upper()}"
+            yield "```"
+            yield prompt.system_prompt
+            yield "```\n"
 
         # Tools
         if export_package.tools:
-            lines.append("## Tool Configurations")
+            yield "## Tool Configurations"
             for tool in export_package.tools:
-                lines.append(f"\n### {tool.name}")
-                lines.append(f"**Description:** {tool.description}")
+                yield f"\n### {tool.name}"
+                yield f"**Description:** {tool.description}"
                 if tool.endpoint:
-                    lines.append(f"**Endpoint:** `{tool.method} {tool.endpoint}`")
-                lines.append("")
+                    yield f"**Endpoint:** `{tool.method} {tool.endpoint}`"
+                yield ""
 
         # Workflow
         if export_package.workflow_diagram:
-            lines.append("## Workflow Diagram")
-            lines.append("```mermaid")
-            lines.append(export_package.workflow_diagram)
-            lines.append("```\n")
+            yield "## Workflow Diagram"
+            yield "```mermaid"
+            yield export_package.workflow_diagram
+            yield "```\n"
 
         if export_package.workflow_summary:
-            lines.append("## Workflow Summary")
-            lines.append(export_package.workflow_summary)
-            lines.append("")
+            yield "## Workflow Summary"
+            yield export_package.workflow_summary
+            yield ""
 
-        return "\n".join(lines)
-
-    def _export_to_text(self, export_package: PromptExport) -> str:
-        """Export package as plain text"""
-
-        lines = []
+    def _iter_text_lines(self, export_package: PromptExport) -> Iterator[str]:
+        """Yield the package as plain text lines"""
 
         # Header
-        lines.append("=" * 70)
-        lines.append(f"  {export_package.agent_type.upper()} AGENT CONFIGURATION")
-        lines.append("=" * 70)
-        lines.append(f"Generated: {export_package.created_at}")
-        lines.append(f"Session ID: {export_package.session_id}")
-        lines.append("")
+        yield "=" * 70
+        yield f"  {export_package.agent_type.upper()} AGENT CONFIGURATION"
+        yield "=" * 70
+        yield f"Generated: {export_package.created_at}"
+        yield f"Session ID: {export_package.session_id}"
+        yield ""
 
         # Overview
-        lines.append("OVERVIEW")
-        lines.append("-" * 70)
-        lines.append(f"Type: {export_package.agent_type}")
-        lines.append(f"Goals: {export_package.agent_goals}")
-        lines.append(f"Tone: {export_package.agent_tone}")
-        lines.append(f"Tools: {len(export_package.tools)}")
-        lines.append("")
+        yield "OVERVIEW"
+        yield "-" * 70
+        yield f"Type: {export_package.agent_type}"
+        yield f"Goals: {export_package.agent_goals}"
+        yield f"Tone: {export_package.agent_tone}"
+        yield f"Tools: {len(export_package.tools)}"
+        yield ""
 
         # System Prompts
-        lines.append("SYSTEM PROMPTS")
-        lines.append("-" * 70)
+        yield "SYSTEM PROMPTS"
+        yield "-" * 70
         for format_name, prompt in export_package.prompts.items():
-            lines.append(f"\n[ {format_name.upper()} ]")
-            lines.append(prompt.system_prompt)
-            lines.append("")
+            yield f"\n[ {format_name.upper()} ]"
+            yield prompt.system_prompt
+            yield ""
 
         # Tools
         if export_package.tools:
-            lines.append("TOOL CONFIGURATIONS")
-            lines.append("-" * 70)
+            yield "TOOL CONFIGURATIONS"
+            yield "-" * 70
             for i, tool in enumerate(export_package.tools, 1):
-                lines.append(f"\n{i}. {tool.name}")
-                lines.append(f"   Description: {tool.description}")
+                yield f"\n{i}. {tool.name}"
+                yield f"   Description: {tool.description}"
                 if tool.endpoint:
-                    lines.append(f"   Endpoint: {tool.method} {tool.endpoint}")
-                lines.append("")
+                    yield f"   Endpoint: {tool.method} {tool.endpoint}"
+                yield ""
 
         # Workflow
         if export_package.workflow_summary:
-            lines.append("WORKFLOW")
-            lines.append("-" * 70)
-            lines.append(export_package.workflow_summary)
-            lines.append("")
-
-        lines.append("=" * 70)
-
-        return "\n".join(lines)
+            yield "WORKFLOW"
+            yield "-" * 70
+            yield export_package.workflow_summary
+            yield ""
+
+        yield "=" * 70
+
+
+def _join_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Lazy equivalent of joining lines with newlines"""
+    first = True
+    for line in lines:
+        yield line if first else f"\n{line}"
+        first = False
+
+
+def _coalesce(chunks: Iterable[str], size: int = None) -> Iterator[str]:
+    """Merge small chunks into ones of about `size` characters"""
+    size = size or STREAM_CHUNK_SIZE
+    buffer: List[str] = []
+    buffered = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= size:
+            yield "".join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield "".join(buffer)
 
 
 # Global generator instance
@@ -0,0 +1,427 @@
+"""
+Agent Importer - Bulk-creates agents from external definitions.
+
+Definitions have the shape of a PromptExport (JSON or YAML). Each one is
+validated, its workflow synthesized and its export package rendered on a
+process pool; the resulting sessions, workflows and prompt_exports rows
+are then inserted one batch per transaction, and each batch's session
+states are written to one archive file, as finished sessions are.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import json
+import multiprocessing
+import os
+import time
+import uuid
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session as DBSession
+import yaml
+
+from src.blob_store import get_blob_store
+from src.config import get_settings
+from src.prompt.generator import get_prompt_generator
+from src.prompt.models import PromptExport as DBPromptExport, ExportFormat
+from src.prompt.schemas import (
+    AgentImportItemResult,
+    AgentImportReport,
+    AgentImportSpec,
+    ImportItemStatus,
+    PromptExportFormat,
+    PromptFormat,
+)
+from src.session.archive import get_session_archiver
+from src.session.models import Session, SessionStatus
+from src.session.schemas import ConversationStage, SessionState, ToolConfigSchema
+from src.workflow.queries import workflow_values
+from src.workflow.synthesizer import get_synthesizer
+from src.workflow.visualizer import generate_mermaid_diagram
+from src.workflow.models import Workflow
+from src.search.index import get_search_index
+
+settings = get_settings()
+
+# Outcome of preparing one agent: (index, session id, rows or None, error or None)
+Prepared = Tuple[int, str, Optional[Dict[str, Any]], Optional[str]]
+
+
+def load_agent_specs(content: Union[str, bytes], yaml_format: bool = False) -> list:
+    """
+    Parse agent definitions from a JSON or YAML document.
+
+    The document may hold a list of definitions, {"agents": [...]}, or
+    a single definition.
+
+    Args:
+        content: Document text
+        yaml_format: Parse as YAML instead of JSON
+
+    Returns:
+        Raw definitions (validated per item on import)
+
+    Raises:
+        ValueError: If the document cannot be parsed
+    """
+    try:
+        data = yaml.safe_load(content) if yaml_format else json.loads(content)
+    except (yaml.YAMLError, ValueError) as e:
+        raise ValueError(f"Invalid {'YAML' if yaml_format else 'JSON'}: {e}")
+
+    if isinstance(data, dict) and isinstance(data.get("agents"), list):
+        return data["agents"]
+    if isinstance(data, dict):
+        return [data]
+    if isinstance(data, list):
+        return data
+    raise ValueError("Expected a list of agent definitions")
+
+
+def spec_to_session_state(spec: AgentImportSpec, session_id: str) -> SessionState:
+    """
+    Session state of a completed agent built from an imported definition.
+    Tool headers and extraction rules have no place in the session state
+    and are only kept in the export package.
+
+    Args:
+        spec: Validated definition
+        session_id: Session ID to use
+
+    Returns:
+        Session state
+    """
+    generic_prompt = next(
+        (
+            prompt.system_prompt
+            for prompt in spec.prompts.values()
+            if prompt.format == PromptFormat.GENERIC
+        ),
+        None,
+    )
+    return SessionState(
+        session_id=session_id,
+        stage=ConversationStage.COMPLETED,
+        agent_type=spec.agent_type,
+        goals=spec.agent_goals,
+        tone=spec.agent_tone,
+        use_tools=bool(spec.tools),
+        tools=[
+            ToolConfigSchema(
+                name=tool.name,
+                description=tool.description or None,
+                endpoint=tool.endpoint,
+                method=tool.method,
+                input_schema=tool.parameters,
+            )
+            for tool in spec.tools
+        ],
+        final_prompt=generic_prompt,
+    )
+
+
+def _format_error(error: Exception) -> str:
+    """One-line description of why a definition could not be imported"""
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in item['loc']) or 'agent'}: {item['msg']}"
+            for item in error.errors()
+        )
+    # Database errors: the driver's message, without the SQL statement
+    error = getattr(error, "orig", None) or error
+    return str(error) or type(error).__name__
+
+
+def _prepare_agent(task: Tuple[int, Any, str]) -> Prepared:
+    """
+    Validate a definition and build its rows (runs in a worker process).
+
+    Args:
+        task: (index, raw definition, session id)
+
+    Returns:
+        (index, session id, rows, error); rows hold the session, workflow
+        and export row values, the session state and the rendered export
+    """
+    index, raw, session_id = task
+    try:
+        spec = AgentImportSpec.model_validate(raw)
+        session_state = spec_to_session_state(spec, session_id)
+
+        workflow = get_synthesizer().synthesize(session_state)
+        mermaid_diagram = generate_mermaid_diagram(workflow)
+
+        # Keep the imported prompts; generate the formats that are missing
+        imported = {prompt.format: prompt for prompt in spec.prompts.values()}
+        generator = get_prompt_generator()
+        export_package = generator.create_export_package(
+            session_state=session_state,
+            workflow=workflow,
+            prompt_formats=[
+                format for format in PromptFormat if format not in imported
+            ],
+        )
+        export_package.prompts = {
+            format.value: imported.get(format) or export_package.prompts[format.value]
+            for format in PromptFormat
+        }
+        export_data = generator.export_to_format(
+            export_package, PromptExportFormat.JSON
+        ).encode("utf-8")
+
+        content_hash = generator.export_key(session_state, include_workflow=True)
+    except Exception as e:
+        return index, session_id, None, _format_error(e)
+
+    now = datetime.utcnow()
+    session_values = {
+        "id": session_id,
+        "status": SessionStatus.COMPLETED,
+        "stage": ConversationStage.COMPLETED.value,
+        "completed_at": now,
+        "final_prompt": session_state.final_prompt,
+        "agent_type": session_state.agent_type,
+        "goals": session_state.goals,
+        "tone": session_state.tone,
+        "use_tools": session_state.use_tools,
+    }
+    # Arrays are stored as native JSON (left NULL when empty)
+    if session_state.tools:
+        session_values["tools_config"] = [
+            tool.model_dump(mode="json") for tool in session_state.tools
+        ]
+    export_values = {
+        "id": str(uuid.uuid4()),
+        "session_id": session_id,
+        "agent_type": export_package.agent_type,
+        "export_format": ExportFormat.JSON,
+        "blob_key": f"{session_id}/{content_hash}.json",
+        "content_hash": content_hash,
+        "file_size": f"{len(export_data)} bytes",
+    }
+    rows = {
+        "session": session_values,
+        "workflow": workflow_values(session_id, workflow, mermaid_diagram),
+        "export": export_values,
+        "export_data": export_data,
+        "state": session_state.model_dump_json(),
+    }
+    return index, session_id, rows, None
+
+
+class AgentImporter:
+    """
+    Imports agent definitions in bulk.
+    """
+
+    def __init__(self, max_workers: int = None, batch_size: int = None):
+        """
+        Args:
+            max_workers: Worker processes (default: AGENT_IMPORT_WORKERS;
+                1 prepares agents in this process)
+            batch_size: Agents inserted per transaction
+                (default: AGENT_IMPORT_BATCH_SIZE)
+        """
+        self.max_workers = max_workers or settings.agent_import_workers
+        self.batch_size = batch_size or settings.agent_import_batch_size
+
+    def import_agents(self, db: DBSession, specs: List[Any]) -> AgentImportReport:
+        """
+        Create sessions, workflows and exports for many agent definitions.
+
+        A definition that fails validation, synthesis or insertion is
+        reported and skipped; it never fails the rest of the import.
+
+        Args:
+            db: Database session (committed by this call)
+            specs: Raw agent definitions (see load_agent_specs)
+
+        Returns:
+            Report with one item per definition, in submission order
+        """
+        started = time.monotonic()
+        results: Dict[int, AgentImportItemResult] = {}
+
+        def fail(index: int, error: str) -> None:
+            # Nothing was created, so only a requested session id is reported
+            raw = specs[index] if isinstance(specs[index], dict) else {}
+            session_id, agent_type = raw.get("session_id"), raw.get("agent_type")
+            results[index] = AgentImportItemResult(
+                index=index,
+                session_id=str(session_id) if session_id else None,
+                agent_type=agent_type if isinstance(agent_type, str) else None,
+                status=ImportItemStatus.FAILED,
+                error=error,
+            )
+
+        tasks = self._assign_session_ids(db, specs, fail)
+
+        batch: List[Dict[str, Any]] = []
+        for index, _, rows, error in self._prepare(tasks):
+            if error is not None:
+                fail(index, error)
+                continue
+            rows["index"] = index
+            batch.append(rows)
+            if len(batch) >= self.batch_size:
+                self._write_batch(db, batch, results, fail)
+                batch = []
+        if batch:
+            self._write_batch(db, batch, results, fail)
+
+        items = [results[index] for index in sorted(results)]
+        imported = sum(1 for item in items if item.status == ImportItemStatus.IMPORTED)
+        report = AgentImportReport(
+            total=len(specs),
+            imported=imported,
+            failed=len(items) - imported,
+            duration_seconds=round(time.monotonic() - started, 3),
+            items=items,
+        )
+        print(
+            f"📥 Imported {report.imported}/{report.total} agents"
+            f" in {report.duration_seconds:.1f}s ({report.failed} failed)"
+        )
+        return report
+
+    def _assign_session_ids(
+        self, db: DBSession, specs: List[Any], fail
+    ) -> List[Tuple[int, Any, str]]:
+        """Session id per definition; ids already taken are reported as failures"""
+        requested: Dict[int, str] = {}
+        for index, raw in enumerate(specs):
+            session_id = raw.get("session_id") if isinstance(raw, dict) else None
+            if session_id:
+                requested[index] = str(session_id)
+
+        existing = set()
+        requested_ids = list(set(requested.values()))
+        for start in range(0, len(requested_ids), self.batch_size):
+            chunk = requested_ids[start : start + self.batch_size]
+            existing.update(
+                row.id for row in db.query(Session.id).filter(Session.id.in_(chunk))
+            )
+
+        tasks = []
+        seen = set()
+        for index, raw in enumerate(specs):
+            session_id = requested.get(index)
+            if session_id in existing:
+                fail(index, f"Session {session_id} already exists")
+            elif session_id in seen:
+                fail(index, f"Session {session_id} is imported twice")
+            else:
+                session_id = session_id or str(uuid.uuid4())
+                seen.add(session_id)
+                tasks.append((index, raw, session_id))
+        return tasks
+
+    def _prepare(self, tasks: List[Tuple[int, Any, str]]) -> Iterator[Prepared]:
+        """
+        Prepare agents, yielding results in task order.
+
+        Starting worker processes costs more than preparing a batch of
+        agents in this process, so only imports of at least one batch use
+        the pool (with no more workers than CPUs).
+        """
+        workers = min(self.max_workers, os.cpu_count() or 1)
+        if workers <= 1 or len(tasks) < self.batch_size:
+            yield from map(_prepare_agent, tasks)
+            return
+
+        # Spawned workers do not inherit this process's threads and connections
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            chunksize = max(1, min(64, len(tasks) // (workers * 4)))
+            yield from executor.map(_prepare_agent, tasks, chunksize=chunksize)
+
+    def _write_batch(
+        self,
+        db: DBSession,
+        batch: List[Dict[str, Any]],
+        results: Dict[int, AgentImportItemResult],
+        fail,
+    ) -> None:
+        """
+        Store a batch of prepared agents: export files and one archive file,
+        then all rows in one transaction. If the transaction fails, agents
+        are retried one by one so only the offending ones are reported.
+        """
+        store = get_blob_store()
+        session_states = [
+            SessionState.model_validate_json(rows["state"]) for rows in batch
+        ]
+
+        try:
+            for rows in batch:
+                store.write(rows["export"]["blob_key"], [rows["export_data"]])
+            archive_key = get_session_archiver().write_batch(session_states)
+        except Exception as e:
+            print(f"⚠️  Failed to store files for {len(batch)} imported agents: {e}")
+            for rows in batch:
+                fail(rows["index"], f"Storage failed: {e}")
+            return
+
+        for rows in batch:
+            rows["session"]["archive_key"] = archive_key
+
+        try:
+            self._insert_rows(db, batch)
+            db.commit()
+            written = batch
+        except Exception as e:
+            db.rollback()
+            written = []
+            print(
+                f"⚠️  Batch insert of {len(batch)} agents failed, retrying each:"
+                f" {_format_error(e)}"
+            )
+            for rows in batch:
+                try:
+                    self._insert_rows(db, [rows])
+                    db.commit()
+                    written.append(rows)
+                except Exception as item_error:
+                    db.rollback()
+                    fail(rows["index"], _format_error(item_error))
+
+        for rows in written:
+            results[rows["index"]] = AgentImportItemResult(
+                index=rows["index"],
+                session_id=rows["session"]["id"],
+                agent_type=rows["session"]["agent_type"],
+                status=ImportItemStatus.IMPORTED,
+            )
+
+        # Make the agents searchable (best-effort, like completed sessions)
+        written_ids = {rows["session"]["id"] for rows in written}
+        try:
+            get_search_index().index_sessions(
+                db,
+                [state for state in session_states if state.session_id in written_ids],
+            )
+        except Exception as e:
+            db.rollback()
+            print(f"⚠️  Failed to index {len(written_ids)} imported agents: {e}")
+
+    @staticmethod
+    def _insert_rows(db: DBSession, batch: List[Dict[str, Any]]) -> None:
+        """Insert the sessions, workflows and exports of prepared agents"""
+        db.execute(insert(Session), [rows["session"] for rows in batch])
+        db.execute(insert(Workflow), [rows["workflow"] for rows in batch])
+        db.execute(insert(DBPromptExport), [rows["export"] for rows in batch])
+
+
+# Global importer instance
+_agent_importer: Optional[AgentImporter] = None
+
+
+def get_agent_importer() -> AgentImporter:
+    """Get or create the global agent importer instance"""
+    global _agent_importer
+    if _agent_importer is None:
+        _agent_importer = AgentImporter()
+    return _agent_importer
@@ -2,7 +2,15 @@
 Database models for prompt exports.
 """
 
-from sqlalchemy import Column, String, Text, DateTime, Enum as SQLEnum, ForeignKey
+from sqlalchemy import (
+    Column,
+    String,
+    Text,
+    DateTime,
+    Enum as SQLEnum,
+    ForeignKey,
+    Index,
+)
 from sqlalchemy.sql import func
 import enum
 
@@ -24,16 +32,30 @@ class PromptExport(Base):
     """
 
     __tablename__ = "prompt_exports"
+    __table_args__ = (
+        # Download lookup; also prevents duplicate rows from concurrent downloads
+        Index(
+            "uq_prompt_exports_session_format_hash",
+            "session_id",
+            "export_format",
+            "content_hash",
+            unique=True,
+        ),
+    )
 
     id = Column(String, primary_key=True, index=True)
-    session_id = Column(String, ForeignKey("sessions.id"), nullable=False, index=True)
+    session_id = Column(String, ForeignKey("sessions.id"), nullable=False)
 
     # Export metadata
     agent_type = Column(String, nullable=False)
     export_format = Column(SQLEnum(ExportFormat), nullable=False)
 
     # Export content
-    content = Column(Text, nullable=False)  # The actual export file content
+    content = Column(Text, nullable=True)  # Legacy inline content (pre blob storage)
+    blob_key = Column(String, nullable=True)  # Key of the file in the blob store
+    content_hash = Column(
+        String, nullable=True, index=True
+    )  # Hash of session content + template version + options
 
     # Metadata
     file_size = Column(String, nullable=True)  # Human-readable size
@@ -2,26 +2,44 @@
 API endpoints for prompt generation and export.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session as DBSession
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator
 import uuid
+import zlib
 
-from src.database import get_db
-from src.redis_client import redis_client
+try:
+    import zstandard
+except ImportError:  # Optional dependency for zstd downloads
+    zstandard = None
+
+from src.blob_store import get_blob_store
+from src.config import get_settings
+
+from src.database import get_db, get_read_db, upsert
+from src.session.archive import load_session_state
 from src.session.models import Session, SessionStatus as DBSessionStatus
 from src.session.schemas import SessionState
 from src.prompt.schemas import (
     PromptFormat,
     PromptExportFormat,
+    ExportCompression,
     GeneratedPrompt,
     PromptExport,
     PromptGenerateRequest,
     PromptExportRequest,
+    BundleExportRequest,
+    AgentImportReport,
 )
 from src.prompt.models import PromptExport as DBPromptExport, ExportFormat
 from src.prompt.generator import get_prompt_generator
-from src.workflow.synthesizer import get_synthesizer
+from src.prompt.cache import get_export_cache
+from src.prompt.bundle import stream_bundle
+from src.prompt.importer import get_agent_importer, load_agent_specs
+
+settings = get_settings()
 
 router = APIRouter(prefix="/prompts", tags=["prompts"])
 
@@ -30,7 +48,7 @@ router = APIRouter(prefix="/prompts", tags=["prompts"])
 async def generate_prompts(
     session_id: str,
     request: PromptGenerateRequest,
-    db: DBSession = Depends(get_db),
+    db: DBSession = Depends(get_read_db),
 ) -> Dict[str, GeneratedPrompt]:
     """
     Generate system prompts for a session in multiple formats.
@@ -51,16 +69,14 @@ async def generate_prompts(
             detail=f"Session {session_id} not found",
         )
 
-    # Get session state from Redis
-    session_data = redis_client.get_session(session_id)
-    if not session_data:
+    # Get session state (live or archived)
+    session_state = load_session_state(db_session)
+    if not session_state:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Session state not found. Session may have expired.",
         )
 
-    session_state = SessionState(**session_data)
-
     # Validate session has required data
     if not session_state.agent_type or not session_state.goals:
         raise HTTPException(
@@ -70,28 +86,19 @@ async def generate_prompts(
 
     # Generate prompts
     generator = get_prompt_generator()
-    prompts = generator.generate_all_prompts(session_state, request.formats)
+    prompts = await run_in_threadpool(
+        generator.generate_all_prompts, session_state, request.formats
+    )
 
     return prompts
 
 
-@router.get("/{session_id}/export")
-async def export_agent_package(
-    session_id: str,
-    export_format: PromptExportFormat = PromptExportFormat.JSON,
-    include_workflow: bool = True,
-    db: DBSession = Depends(get_db),
-) -> PromptExport:
+def _load_exportable_state(session_id: str, db: DBSession) -> SessionState:
     """
-    Export complete agent package including prompts, tools, and workflow.
+    Load a session's state and check it has enough data to export.
 
-    Args:
-        session_id: Session ID
-        export_format: Desired export format
-        include_workflow: Whether to include workflow diagram
-
-    Returns:
-        Complete export package
+    Raises:
+        HTTPException: If the session or its state is missing, or incomplete
     """
 
     # Check session exists
@@ -102,16 +109,14 @@ async def export_agent_package(
             detail=f"Session {session_id} not found",
         )
 
-    # Get session state
-    session_data = redis_client.get_session(session_id)
-    if not session_data:
+    # Get session state (live or archived)
+    session_state = load_session_state(db_session)
+    if not session_state:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Session state not found. Session may have expired.",
         )
 
-    session_state = SessionState(**session_data)
-
     # Validate session has required data
     if not session_state.agent_type or not session_state.goals:
         raise HTTPException(
@@ -119,21 +124,70 @@ async def export_agent_package(
             detail="Session must have agent_type and goals to export",
         )
 
-    # Get workflow if requested
-    workflow = None
-    if include_workflow:
-        synthesizer = get_synthesizer()
-        workflow = synthesizer.synthesize(session_state)
+    return session_state
+
+
+@router.get("/{session_id}/export")
+async def export_agent_package(
+    session_id: str,
+    export_format: PromptExportFormat = PromptExportFormat.JSON,
+    include_workflow: bool = True,
+    db: DBSession = Depends(get_db),
+) -> PromptExport:
+    """
+    Export complete agent package including prompts, tools, and workflow.
+
+    Packages are cached by content, so repeated exports of an unchanged
+    session skip workflow synthesis and prompt generation.
+
+    Args:
+        session_id: Session ID
+        export_format: Desired export format
+        include_workflow: Whether to include workflow diagram
+
+    Returns:
+        Complete export package
+    """
+
+    session_state = _load_exportable_state(session_id, db)
 
-    # Generate export package
+    # Generation is CPU-bound; keep it off the event loop
     generator = get_prompt_generator()
-    export_package = generator.create_export_package(
+    return await run_in_threadpool(
+        generator.get_export_package,
         session_state=session_state,
-        workflow=workflow,
         include_workflow=include_workflow,
     )
 
-    return export_package
+
+# Content type and file extension per export format
+EXPORT_CONTENT_TYPES = {
+    PromptExportFormat.JSON: ("application/json", "json"),
+    PromptExportFormat.YAML: ("application/x-yaml", "yaml"),
+    PromptExportFormat.MARKDOWN: ("text/markdown", "md"),
+    PromptExportFormat.TEXT: ("text/plain", "txt"),
+}
+
+
+def _encode_stream(
+    chunks: Iterable[bytes], compression: ExportCompression
+) -> Iterator[bytes]:
+    """Apply the requested content encoding to a byte stream chunk by chunk"""
+
+    if compression == ExportCompression.NONE:
+        yield from chunks
+        return
+
+    if compression == ExportCompression.GZIP:
+        compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    else:
+        compressor = zstandard.ZstdCompressor().compressobj()
+
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
 
 
 @router.get("/{session_id}/export/download")
@@ -141,22 +195,32 @@ async def download_agent_package(
     session_id: str,
     format: PromptExportFormat = PromptExportFormat.JSON,
     include_workflow: bool = True,
+    compression: ExportCompression = ExportCompression.NONE,
     db: DBSession = Depends(get_db),
 ):
     """
-    Download agent package as a file.
+    Download agent package as a streamed file.
 
-    First checks if export exists in database, otherwise generates it.
+    Reuses a stored export only if it was generated from the session's
+    current content; otherwise renders a fresh one straight into the blob
+    store. If the session state has expired, the latest stored export is served.
 
     Args:
         session_id: Session ID
         format: File format (json, yaml, markdown, text)
         include_workflow: Whether to include workflow
+        compression: Content encoding (none, gzip, zstd)
 
     Returns:
-        File download response
+        Streaming file download response
     """
 
+    if compression == ExportCompression.ZSTD and zstandard is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="zstd compression is not available. Install 'zstandard'.",
+        )
+
     # Map PromptExportFormat to ExportFormat
     format_map = {
         PromptExportFormat.JSON: ExportFormat.JSON,
@@ -166,72 +230,207 @@ async def download_agent_package(
     }
     db_format = format_map.get(format, ExportFormat.JSON)
 
-    # Check if export already exists in database
-    existing_export = (
-        db.query(DBPromptExport)
-        .filter(
-            DBPromptExport.session_id == session_id,
-            DBPromptExport.export_format == db_format,
-        )
-        .first()
+    content_type, extension = EXPORT_CONTENT_TYPES.get(
+        format, ("application/octet-stream", "txt")
+    )
+
+    session_state = None
+    state_error = None
+    try:
+        session_state = _load_exportable_state(session_id, db)
+    except HTTPException as e:
+        if e.status_code != status.HTTP_404_NOT_FOUND:
+            raise
+        state_error = e
+
+    existing_query = db.query(DBPromptExport).filter(
+        DBPromptExport.session_id == session_id,
+        DBPromptExport.export_format == db_format,
     )
 
-    if existing_export:
-        # Return existing export
-        content = existing_export.content
+    generator = get_prompt_generator()
+    store = get_blob_store()
+    content_hash = None
+    if session_state is not None:
+        content_hash = generator.export_key(
+            session_state, include_workflow=include_workflow
+        )
+        existing_export = existing_query.filter(
+            DBPromptExport.content_hash == content_hash
+        ).first()
+    else:
+        # State is gone, so the session can no longer change
+        existing_export = existing_query.order_by(
+            DBPromptExport.created_at.desc()
+        ).first()
+
+    if (
+        existing_export
+        and existing_export.blob_key
+        and store.exists(existing_export.blob_key)
+    ):
+        body = store.read(existing_export.blob_key)
+        agent_type = existing_export.agent_type
+    elif existing_export and existing_export.content is not None:
+        # Legacy row stored inline
+        body = iter([existing_export.content.encode("utf-8")])
         agent_type = existing_export.agent_type
+    elif session_state is None:
+        raise state_error or HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Export file for session {session_id} not found",
+        )
     else:
-        # Generate new export
-        export_package = await export_agent_package(
-            session_id=session_id,
-            export_format=format,
+        # Generate new export (cached packages are shared across sessions)
+        export_package = await run_in_threadpool(
+            generator.get_export_package,
+            session_state=session_state,
             include_workflow=include_workflow,
-            db=db,
         )
 
-        # Convert to requested format
-        generator = get_prompt_generator()
-        content = generator.export_to_format(export_package, format)
-
-        # Save to database
-        db_export = DBPromptExport(
-            id=str(uuid.uuid4()),
-            session_id=session_id,
-            agent_type=export_package.agent_type,
-            export_format=db_format,
-            content=content,
-            file_size=f"{len(content)} bytes",
+        # Render straight into the blob store, chunk by chunk
+        blob_key = f"{session_id}/{content_hash}.{extension}"
+        size = await run_in_threadpool(
+            store.write,
+            blob_key,
+            (
+                chunk.encode("utf-8")
+                for chunk in generator.iter_export(export_package, format)
+            ),
+        )
+
+        # Insert, or re-point a row whose blob went missing; concurrent
+        # downloads of the same content resolve to a single row
+        upsert(
+            db,
+            DBPromptExport,
+            {
+                "id": str(uuid.uuid4()),
+                "session_id": session_id,
+                "agent_type": export_package.agent_type,
+                "export_format": db_format,
+                "blob_key": blob_key,
+                "content_hash": content_hash,
+                "file_size": f"{size} bytes",
+            },
+            conflict_columns=["session_id", "export_format", "content_hash"],
+            update_columns=["blob_key", "file_size"],
         )
-        db.add(db_export)
         db.commit()
 
+        body = store.read(blob_key)
         agent_type = export_package.agent_type
 
-    # Determine content type and file extension
-    content_types = {
-        PromptExportFormat.JSON: ("application/json", "json"),
-        PromptExportFormat.YAML: ("application/x-yaml", "yaml"),
-        PromptExportFormat.MARKDOWN: ("text/markdown", "md"),
-        PromptExportFormat.TEXT: ("text/plain", "txt"),
-    }
-
-    content_type, extension = content_types.get(
-        format, ("application/octet-stream", "txt")
-    )
-
     # Create filename
     filename = f"{agent_type.replace(' ', '_')}_agent.{extension}"
 
-    # Return as downloadable file
-    return Response(
-        content=content,
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    if compression != ExportCompression.NONE:
+        headers["Content-Encoding"] = compression.value
+
+    # Stream the file so memory stays constant regardless of package size
+    return StreamingResponse(
+        _encode_stream(body, compression),
         media_type=content_type,
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
+        headers=headers,
     )
 
 
+@router.post("/bundle")
+async def download_bundle(
+    request: BundleExportRequest, db: DBSession = Depends(get_read_db)
+):
+    """
+    Download many agents as a single streamed ZIP archive.
+
+    Each agent gets a folder with its prompts, tool configs and Mermaid
+    workflow; manifest.json lists exported, skipped and failed sessions.
+
+    Args:
+        request: Session ids, or status/date filters
+
+    Returns:
+        Streaming ZIP response
+    """
+
+    query = db.query(Session)
+    if request.session_ids:
+        query = query.filter(Session.id.in_(request.session_ids))
+    else:
+        if request.status:
+            query = query.filter(
+                Session.status == DBSessionStatus(request.status.value)
+            )
+        if request.created_after:
+            query = query.filter(Session.created_at >= request.created_after)
+        if request.created_before:
+            query = query.filter(Session.created_at < request.created_before)
+
+    records = query.order_by(Session.created_at).limit(request.limit).all()
+    if not records:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No sessions match the bundle request",
+        )
+
+    # Load everything from the DB now; the stream runs after this session closes
+    session_states = [record.to_session_state() for record in records]
+
+    return StreamingResponse(
+        stream_bundle(
+            session_states,
+            prompt_formats=request.prompt_formats,
+            include_workflow=request.include_workflow,
+        ),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=agents_bundle.zip"},
+    )
+
+
+@router.post("/import", response_model=AgentImportReport)
+async def import_agents(request: Request, db: DBSession = Depends(get_db)):
+    """
+    Import agent definitions from other platforms in bulk.
+
+    The body is a JSON document, or YAML with a YAML Content-Type, holding
+    PromptExport-shaped definitions: a list, {"agents": [...]} or a single
+    definition. Each agent becomes a completed session with its workflow
+    and a stored JSON export; invalid definitions are reported per item.
+
+    Returns:
+        Import report with one item per definition
+    """
+
+    yaml_format = "yaml" in request.headers.get("content-type", "")
+    try:
+        specs = load_agent_specs(await request.body(), yaml_format=yaml_format)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if len(specs) > settings.agent_import_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.agent_import_max_items} agents per import",
+        )
+
+    # Synthesis runs on worker processes; inserts are blocking
+    return await run_in_threadpool(get_agent_importer().import_agents, db, specs)
+
+
+@router.get("/cache/stats")
+async def get_export_cache_stats():
+    """
+    Get export cache size and hit-rate statistics.
+
+    Returns:
+        Cache statistics
+    """
+
+    return get_export_cache().stats()
+
+
 @router.get("/{session_id}/exports")
-async def list_exports(session_id: str, db: DBSession = Depends(get_db)):
+async def list_exports(session_id: str, db: DBSession = Depends(get_read_db)):
     """
     List all exports for a session.
 
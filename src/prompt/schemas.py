@@ -4,8 +4,11 @@ Pydantic schemas for prompt generation.
 
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
+from datetime import datetime
 from enum import Enum
 
+from src.session.schemas import SessionStatus
+
 
 class PromptFormat(str, Enum):
     """Available prompt formats for different platforms"""
@@ -26,6 +29,14 @@ class PromptExportFormat(str, Enum):
     MARKDOWN = "markdown"
 
 
+class ExportCompression(str, Enum):
+    """Content encodings for streamed export downloads"""
+
+    NONE = "none"
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
 class ToolConfiguration(BaseModel):
     """Tool configuration for agent"""
 
@@ -109,12 +120,100 @@ class PromptExportRequest(BaseModel):
     )
 
 
+class BundleExportRequest(BaseModel):
+    """Request to export many agents as one ZIP archive"""
+
+    session_ids: Optional[List[str]] = Field(
+        default=None, description="Sessions to export (overrides the filters)"
+    )
+    status: Optional[SessionStatus] = Field(
+        default=SessionStatus.COMPLETED, description="Filter by session status"
+    )
+    created_after: Optional[datetime] = Field(
+        default=None, description="Only sessions created at or after this time"
+    )
+    created_before: Optional[datetime] = Field(
+        default=None, description="Only sessions created before this time"
+    )
+    prompt_formats: Optional[List[PromptFormat]] = Field(
+        default=None, description="Prompt formats to include (default: all)"
+    )
+    include_workflow: bool = Field(
+        default=True, description="Include Mermaid workflow files"
+    )
+    limit: int = Field(
+        default=1000, ge=1, le=10000, description="Maximum sessions to include"
+    )
+
+
+class AgentImportSpec(BaseModel):
+    """
+    External agent definition to import (the shape of PromptExport).
+    The workflow is synthesized on import, so workflow_diagram and
+    workflow_summary are accepted but not used.
+    """
+
+    session_id: Optional[str] = Field(
+        default=None, description="Session ID to create (generated if omitted)"
+    )
+    agent_type: str = Field(min_length=1, description="Type of agent")
+    agent_goals: str = Field(min_length=1, description="Agent goals")
+    agent_tone: str = Field(default="professional", description="Agent tone")
+
+    prompts: Dict[str, GeneratedPrompt] = Field(
+        default_factory=dict,
+        description="Existing prompts (formats not given are generated)",
+    )
+    tools: List[ToolConfiguration] = Field(
+        default_factory=list, description="Tool configurations"
+    )
+
+    workflow_diagram: Optional[str] = Field(default=None)
+    workflow_summary: Optional[str] = Field(default=None)
+    created_at: Optional[str] = Field(default=None)
+
+
+class ImportItemStatus(str, Enum):
+    """Outcome of importing one agent"""
+
+    IMPORTED = "imported"
+    FAILED = "failed"
+
+
+class AgentImportItemResult(BaseModel):
+    """Import outcome for one submitted agent definition"""
+
+    index: int = Field(description="Position of the definition in the import")
+    session_id: Optional[str] = Field(
+        default=None, description="Session created (or requested) for the agent"
+    )
+    agent_type: Optional[str] = None
+    status: ImportItemStatus
+    error: Optional[str] = Field(default=None, description="Why the import failed")
+
+
+class AgentImportReport(BaseModel):
+    """Per-item report of a bulk agent import"""
+
+    total: int
+    imported: int
+    failed: int
+    duration_seconds: float
+    items: List[AgentImportItemResult] = Field(default_factory=list)
+
+
 __all__ = [
     "PromptFormat",
     "PromptExportFormat",
+    "ExportCompression",
     "ToolConfiguration",
     "GeneratedPrompt",
     "PromptExport",
     "PromptGenerateRequest",
     "PromptExportRequest",
+    "BundleExportRequest",
+    "AgentImportSpec",
+    "ImportItemStatus",
+    "AgentImportItemResult",
+    "AgentImportReport",
 ]
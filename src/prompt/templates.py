@@ -4,6 +4,9 @@ Prompt templates for different platforms and formats.
 
 from typing import Dict, Any, List
 
+# Bump whenever a template's output changes so cached exports are invalidated
+TEMPLATE_VERSION = "1"
+
 
 def generate_elevenlabs_prompt(
     agent_type: str,
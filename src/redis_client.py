@@ -38,6 +38,17 @@ class RedisClient:
             print(f"Error getting session: {e}")
             return None
 
+    def get_sessions(self, session_ids: list) -> list:
+        """Retrieve many sessions with one MGET (None for missing ones)"""
+        if not session_ids:
+            return []
+        try:
+            values = self.client.mget([f"session:{sid}" for sid in session_ids])
+            return [json.loads(data) if data else None for data in values]
+        except Exception as e:
+            print(f"Error getting sessions: {e}")
+            return [None] * len(session_ids)
+
     def delete_session(self, session_id: str) -> bool:
         """Delete session from Redis"""
         try:
@@ -47,6 +58,19 @@ class RedisClient:
             print(f"Error deleting session: {e}")
             return False
 
+    def delete_sessions(self, session_ids: list) -> bool:
+        """Delete many sessions (and their usage counters) in one round-trip"""
+        if not session_ids:
+            return True
+        try:
+            keys = [f"session:{sid}" for sid in session_ids]
+            keys += [f"usage:{sid}" for sid in session_ids]
+            self.client.delete(*keys)
+            return True
+        except Exception as e:
+            print(f"Error deleting sessions: {e}")
+            return False
+
     def extend_session(self, session_id: str, expiry: int = None) -> bool:
         """Extend session expiry time"""
         expiry = expiry or settings.session_expiry_seconds
@@ -61,5 +85,78 @@ class RedisClient:
         """Check if session exists"""
         return self.client.exists(f"session:{session_id}") > 0
 
+    def sessions_exist(self, session_ids: list) -> list:
+        """Check many sessions in one pipelined round-trip"""
+        pipe = self.client.pipeline(transaction=False)
+        for sid in session_ids:
+            pipe.exists(f"session:{sid}")
+        return [bool(result) for result in pipe.execute()]
+
+    def subscribe_expired_sessions(self, handler):
+        """
+        Call handler(session_id) whenever a session key expires.
+        Enables keyspace notifications if the server allows CONFIG SET.
+        Returns the listener thread (call .stop() to unsubscribe).
+        """
+        try:
+            flags = self.client.config_get("notify-keyspace-events").get(
+                "notify-keyspace-events", ""
+            )
+            if "E" not in flags or ("x" not in flags and "A" not in flags):
+                self.client.config_set("notify-keyspace-events", flags + "Ex")
+        except Exception as e:
+            # Managed Redis often disallows CONFIG; it may already be enabled
+            print(f"⚠️  Could not enable keyspace notifications: {e}")
+
+        def on_message(message):
+            key = message["data"]
+            if key.startswith("session:"):
+                handler(key[len("session:") :])
+
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(**{f"__keyevent@{settings.redis_db}__:expired": on_message})
+        return pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def increment_llm_usage(
+        self, session_id: str, usage: dict, expiry: int = None
+    ) -> bool:
+        """Add one LLM call's token counts to the session's usage counters"""
+        expiry = expiry or settings.session_expiry_seconds
+        key = f"usage:{session_id}"
+        prefix = f"{usage.get('stage')}|{usage['provider']}|{usage['model']}"
+        try:
+            pipe = self.client.pipeline()
+            pipe.hincrby(key, f"{prefix}|calls", 1)
+            for metric in (
+                "input_tokens",
+                "output_tokens",
+                "cached_tokens",
+                "latency_ms",
+            ):
+                pipe.hincrby(key, f"{prefix}|{metric}", int(usage.get(metric, 0)))
+            pipe.expire(key, expiry)
+            pipe.execute()
+            return True
+        except Exception as e:
+            print(f"Error incrementing LLM usage: {e}")
+            return False
+
+    def get_llm_usage(self, session_id: str) -> dict:
+        """
+        Retrieve a session's usage counters.
+        Returns {"stage|provider|model": {"calls": n, "input_tokens": n, ...}}
+        """
+        try:
+            raw = self.client.hgetall(f"usage:{session_id}")
+        except Exception as e:
+            print(f"Error getting LLM usage: {e}")
+            return {}
+
+        counters: dict = {}
+        for field, value in raw.items():
+            group, _, metric = field.rpartition("|")
+            counters.setdefault(group, {})[metric] = int(value)
+        return counters
+
 
 redis_client = RedisClient()
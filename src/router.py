@@ -6,6 +6,9 @@ from fastapi import APIRouter
 from src.session.router import router as session_router
 from src.workflow.router import router as workflow_router
 from src.prompt.router import router as prompt_router
+from src.llm.router import router as usage_router
+from src.search.router import router as search_router
+from src.simulation.router import router as simulation_router
 
 # Create main API router
 api_router = APIRouter(prefix="/api/v1")
@@ -14,5 +17,8 @@ api_router = APIRouter(prefix="/api/v1")
 api_router.include_router(session_router)
 api_router.include_router(workflow_router)
 api_router.include_router(prompt_router)
+api_router.include_router(usage_router)
+api_router.include_router(search_router)
+api_router.include_router(simulation_router)
 
 __all__ = ["api_router"]
@@ -0,0 +1,14 @@
+from src.search.index import SearchIndex, get_search_index, ensure_search_schema
+from src.search.similar import SimilarAgentIndex, get_similar_agent_index
+from src.search.schemas import SearchMode, SearchResult, SearchResponse
+
+__all__ = [
+    "SearchIndex",
+    "get_search_index",
+    "ensure_search_schema",
+    "SearchMode",
+    "SearchResult",
+    "SearchResponse",
+    "SimilarAgentIndex",
+    "get_similar_agent_index",
+]
@@ -0,0 +1,306 @@
+"""
+Full-text index over agent specifications and conversation transcripts.
+
+Backed by an FTS5 virtual table on SQLite and a tsvector column with a
+GIN index on PostgreSQL. Sessions are indexed when they complete, while
+their transcript is still in Redis.
+"""
+
+from typing import Dict, List, Optional
+import re
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session as DBSession
+
+from src.search.schemas import SearchMode, SearchResult
+from src.session.models import Session, SessionStatus
+from src.session.schemas import SessionState
+
+# Spec fields folded into the "spec" column
+SPEC_FIELDS = [
+    "target_users",
+    "greeting_style",
+    "conversation_flow",
+    "example_interactions",
+    "constraints",
+    "edge_cases",
+    "escalation_rules",
+    "success_criteria",
+    "brand_voice",
+    "additional_notes",
+]
+
+SQLITE_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS session_search USING fts5(
+    session_id UNINDEXED,
+    agent_type,
+    goals,
+    spec,
+    transcript,
+    tokenize = 'porter unicode61'
+)
+"""
+
+POSTGRES_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS session_search (
+        session_id VARCHAR PRIMARY KEY REFERENCES sessions(id),
+        agent_type TEXT,
+        goals TEXT,
+        spec TEXT,
+        transcript TEXT,
+        document TSVECTOR NOT NULL
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_session_search_document
+    ON session_search USING GIN (document)
+    """,
+]
+
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def ensure_search_schema(engine: Engine) -> None:
+    """Create the search table for the engine's dialect if missing"""
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            for statement in POSTGRES_SCHEMA:
+                conn.execute(text(statement))
+        else:
+            conn.execute(text(SQLITE_SCHEMA))
+
+
+def build_document(session_state: SessionState) -> Dict[str, str]:
+    """
+    Flatten a session into the indexed columns.
+
+    Args:
+        session_state: Session state (with transcript, if still available)
+
+    Returns:
+        Column name -> text
+    """
+    spec_parts = []
+    for field in SPEC_FIELDS:
+        value = getattr(session_state, field, None)
+        if not value:
+            continue
+        if isinstance(value, list):
+            spec_parts.extend(str(item) for item in value)
+        else:
+            spec_parts.append(str(value))
+
+    spec_parts.extend(
+        f"{tool.name} {tool.description or ''}".strip() for tool in session_state.tools
+    )
+
+    transcript = "\n".join(
+        f"{message.get('role', '')}: {message.get('content', '')}"
+        for message in session_state.conversation_history
+    )
+
+    return {
+        "session_id": session_state.session_id,
+        "agent_type": session_state.agent_type or "",
+        "goals": session_state.goals or "",
+        "spec": "\n".join(spec_parts),
+        "transcript": transcript,
+    }
+
+
+class SearchIndex:
+    """
+    Dialect-aware full-text index of sessions.
+    """
+
+    def index_session(self, db: DBSession, session_state: SessionState) -> None:
+        """
+        Add or replace a session in the index.
+
+        Args:
+            db: Database session (committed by this call)
+            session_state: Session state to index
+        """
+        self.index_sessions(db, [session_state])
+
+    def index_sessions(self, db: DBSession, session_states: List[SessionState]) -> None:
+        """
+        Add or replace many sessions in the index in one transaction.
+
+        Args:
+            db: Database session (committed by this call)
+            session_states: Session states to index
+        """
+        documents = [build_document(session_state) for session_state in session_states]
+        if not documents:
+            return
+
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(
+                text(
+                    """
+                    INSERT INTO session_search
+                        (session_id, agent_type, goals, spec, transcript, document)
+                    VALUES (
+                        :session_id, :agent_type, :goals, :spec, :transcript,
+                        setweight(to_tsvector('english', :agent_type), 'A')
+                        || setweight(to_tsvector('english', :goals), 'A')
+                        || setweight(to_tsvector('english', :spec), 'B')
+                        || setweight(to_tsvector('english', :transcript), 'C')
+                    )
+                    ON CONFLICT (session_id) DO UPDATE SET
+                        agent_type = EXCLUDED.agent_type,
+                        goals = EXCLUDED.goals,
+                        spec = EXCLUDED.spec,
+                        transcript = EXCLUDED.transcript,
+                        document = EXCLUDED.document
+                    """,
+                ),
+                documents,
+            )
+        else:
+            db.execute(
+                text("DELETE FROM session_search WHERE session_id = :session_id"),
+                [{"session_id": document["session_id"]} for document in documents],
+            )
+            db.execute(
+                text(
+                    """
+                    INSERT INTO session_search
+                        (session_id, agent_type, goals, spec, transcript)
+                    VALUES (:session_id, :agent_type, :goals, :spec, :transcript)
+                    """,
+                ),
+                documents,
+            )
+
+        db.commit()
+
+    def backfill(self, db: DBSession) -> int:
+        """
+        Index every completed session from its persisted specification.
+        Transcripts of sessions that already left Redis are not recoverable.
+
+        Returns:
+            Number of sessions indexed
+        """
+        records = (
+            db.query(Session).filter(Session.status == SessionStatus.COMPLETED).all()
+        )
+        for record in records:
+            self.index_session(db, record.to_session_state())
+        return len(records)
+
+    def remove_session(self, db: DBSession, session_id: str) -> None:
+        """Remove a session from the index"""
+        db.execute(
+            text("DELETE FROM session_search WHERE session_id = :session_id"),
+            {"session_id": session_id},
+        )
+        db.commit()
+
+    def search(
+        self,
+        db: DBSession,
+        query: str,
+        mode: SearchMode = SearchMode.ALL,
+        limit: int = 20,
+    ) -> List[SearchResult]:
+        """
+        Ranked full-text search.
+
+        Args:
+            db: Database session
+            query: Free-text query
+            mode: Require all terms or any term
+            limit: Maximum results
+
+        Returns:
+            Results ordered by relevance
+        """
+        terms = _TERM_PATTERN.findall(query)
+        if not terms:
+            return []
+
+        if db.get_bind().dialect.name == "postgresql":
+            rows = self._search_postgres(db, terms, mode, limit)
+        else:
+            rows = self._search_sqlite(db, terms, mode, limit)
+
+        return [
+            SearchResult(
+                session_id=row.session_id,
+                agent_type=row.agent_type or None,
+                rank=round(float(row.rank), 6),
+                snippet=row.snippet or "",
+            )
+            for row in rows
+        ]
+
+    def _search_sqlite(
+        self, db: DBSession, terms: List[str], mode: SearchMode, limit: int
+    ):
+        # Quote every term so user input can't inject FTS5 syntax
+        joiner = " OR " if mode == SearchMode.ANY else " "
+        match = joiner.join(f'"{term}"' for term in terms)
+
+        # bm25() is lower-is-better; negate it so higher ranks are better
+        return db.execute(
+            text(
+                """
+                SELECT session_id, agent_type,
+                       -bm25(session_search, 0.0, 4.0, 4.0, 2.0, 1.0) AS rank,
+                       snippet(session_search, -1, '<b>', '</b>', '…', 16) AS snippet
+                FROM session_search
+                WHERE session_search MATCH :match
+                ORDER BY rank DESC
+                LIMIT :limit
+                """,
+            ),
+            {"match": match, "limit": limit},
+        ).all()
+
+    def _search_postgres(
+        self, db: DBSession, terms: List[str], mode: SearchMode, limit: int
+    ):
+        joiner = " | " if mode == SearchMode.ANY else " & "
+        tsquery = joiner.join(terms)
+
+        # Rank first, then build headlines for the top rows only
+        return db.execute(
+            text(
+                """
+                SELECT s.session_id, s.agent_type, ranked.rank,
+                       ts_headline(
+                           'english',
+                           concat_ws(' … ', s.goals, s.spec, s.transcript),
+                           to_tsquery('english', :tsquery),
+                           'StartSel=<b>, StopSel=</b>, MaxFragments=2'
+                       ) AS snippet
+                FROM (
+                    SELECT session_id, ts_rank(document, query) AS rank
+                    FROM session_search, to_tsquery('english', :tsquery) AS query
+                    WHERE document @@ query
+                    ORDER BY rank DESC
+                    LIMIT :limit
+                ) AS ranked
+                JOIN session_search AS s ON s.session_id = ranked.session_id
+                ORDER BY ranked.rank DESC
+                """,
+            ),
+            {"tsquery": tsquery, "limit": limit},
+        ).all()
+
+
+# Global index instance
+_search_index: Optional[SearchIndex] = None
+
+
+def get_search_index() -> SearchIndex:
+    """Get or create the global search index instance"""
+    global _search_index
+    if _search_index is None:
+        _search_index = SearchIndex()
+    return _search_index
@@ -0,0 +1,46 @@
+"""
+API endpoints for full-text search over sessions.
+"""
+
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session as DBSession
+
+from src.database import get_read_db
+from src.search.index import get_search_index
+from src.search.schemas import SearchMode, SearchResponse
+from src.search.similar import get_similar_agent_index
+from src.session.schemas import SimilarAgent
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("", response_model=SearchResponse)
+async def search_sessions(
+    q: str = Query(min_length=1, description="Search terms"),
+    mode: SearchMode = SearchMode.ALL,
+    limit: int = Query(default=20, ge=1, le=100),
+    db: DBSession = Depends(get_read_db),
+):
+    """
+    Search completed agents by specification and transcript text.
+    Results are ranked by relevance with highlighted snippets.
+    """
+    results = get_search_index().search(db, q, mode=mode, limit=limit)
+    return SearchResponse(query=q, mode=mode, results=results)
+
+
+@router.get("/similar", response_model=List[SimilarAgent])
+async def find_similar_agents(
+    q: str = Query(min_length=1, description="Agent description"),
+    limit: int = Query(default=5, ge=1, le=50),
+    db: DBSession = Depends(get_read_db),
+):
+    """
+    Find completed agents similar to a free-text description.
+    """
+    return get_similar_agent_index().find_similar(db, q, top_k=limit)
+
+
+__all__ = ["router"]
@@ -0,0 +1,34 @@
+"""
+Pydantic schemas for full-text search.
+"""
+
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from enum import Enum
+
+
+class SearchMode(str, Enum):
+    """How query terms are combined"""
+
+    ALL = "all"  # Every term must match
+    ANY = "any"  # At least one term must match
+
+
+class SearchResult(BaseModel):
+    """A matching session"""
+
+    session_id: str
+    agent_type: Optional[str] = None
+    rank: float = Field(description="Relevance score (higher is better)")
+    snippet: str = Field(description="Matching excerpt with terms highlighted")
+
+
+class SearchResponse(BaseModel):
+    """Ranked search results"""
+
+    query: str
+    mode: SearchMode
+    results: List[SearchResult] = Field(default_factory=list)
+
+
+__all__ = ["SearchMode", "SearchResult", "SearchResponse"]
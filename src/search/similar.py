@@ -0,0 +1,280 @@
+"""
+Similar-agent retrieval over completed sessions.
+
+A local TF-IDF index over agent type, goals, tone and tool names, kept
+in memory and refreshed incrementally from the sessions table, so new
+sessions can be offered past agents as templates without any external
+embedding service.
+"""
+
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+import math
+import re
+import threading
+
+from sqlalchemy.orm import Session as DBSession
+
+from src.config import get_settings
+from src.session.models import Session, SessionStatus
+from src.session.schemas import SessionState, SimilarAgent
+
+settings = get_settings()
+
+# Term-frequency multiplier per field
+FIELD_WEIGHTS = {
+    "agent_type": 3,
+    "goals": 1,
+    "tone": 1,
+    "tools": 2,
+}
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "for", "from",
+    "i", "in", "is", "it", "me", "my", "of", "on", "or", "our", "that",
+    "the", "their", "this", "to", "we", "with", "would", "you", "your",
+    "agent", "want", "like", "need", "help", "build", "create", "voice",
+}  # fmt: skip
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    """Lowercase word tokens without stopwords, with a naive plural fold"""
+    tokens = []
+    for token in _TOKEN_PATTERN.findall((value or "").lower()):
+        if token in STOPWORDS or len(token) < 2:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def agent_terms(session_state: SessionState) -> Counter:
+    """
+    Weighted term counts describing an agent.
+
+    Args:
+        session_state: Agent specification
+
+    Returns:
+        Term -> weighted frequency
+    """
+    terms: Counter = Counter()
+    for field in ("agent_type", "goals", "tone"):
+        for token in tokenize(getattr(session_state, field)):
+            terms[token] += FIELD_WEIGHTS[field]
+
+    for tool in session_state.tools:
+        # Split snake_case / camelCase names into words
+        name = re.sub(r"([a-z])([A-Z])", r"\1 \2", tool.name).replace("_", " ")
+        for token in tokenize(name):
+            terms[token] += FIELD_WEIGHTS["tools"]
+
+    return terms
+
+
+class SimilarAgentIndex:
+    """
+    In-memory TF-IDF index of completed agents with cosine ranking.
+
+    Postings are kept per term, so a query only touches documents that
+    share a term with it. Document norms depend on IDF and are recomputed
+    lazily after the index changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._documents: Dict[str, Counter] = {}
+        self._summaries: Dict[str, SimilarAgent] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._norms: Optional[Dict[str, float]] = None
+
+        # Highest updated_at loaded from completed sessions
+        self._watermark: Optional[datetime] = None
+
+    def add(self, session_state: SessionState) -> None:
+        """Add or replace an agent in the index"""
+        terms = agent_terms(session_state)
+
+        with self._lock:
+            self._remove(session_state.session_id)
+            if not terms:
+                return
+
+            self._documents[session_state.session_id] = terms
+            for term, count in terms.items():
+                self._postings.setdefault(term, {})[session_state.session_id] = count
+
+            self._summaries[session_state.session_id] = SimilarAgent(
+                session_id=session_state.session_id,
+                agent_type=session_state.agent_type,
+                goals=session_state.goals,
+                tone=session_state.tone,
+                tools=[tool.name for tool in session_state.tools],
+                score=0.0,
+            )
+            self._norms = None
+
+    def remove(self, session_id: str) -> None:
+        """Remove an agent from the index"""
+        with self._lock:
+            self._remove(session_id)
+
+    def _remove(self, session_id: str) -> None:
+        terms = self._documents.pop(session_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(session_id, None)
+            if not postings:
+                del self._postings[term]
+        self._summaries.pop(session_id, None)
+        self._norms = None
+
+    def refresh(self, db: DBSession) -> int:
+        """
+        Load sessions completed since the last refresh and drop those
+        abandoned since (DELETE /sessions/{id} in any worker).
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of sessions (re)indexed
+        """
+        query = db.query(Session).filter(Session.status == SessionStatus.COMPLETED)
+        if self._watermark is not None:
+            query = query.filter(Session.updated_at >= self._watermark)
+
+            abandoned = db.query(Session.id).filter(
+                Session.status == SessionStatus.ABANDONED,
+                Session.updated_at >= self._watermark,
+            )
+            for (session_id,) in abandoned:
+                self.remove(session_id)
+
+        records = query.all()
+        for record in records:
+            self.add(record.to_session_state())
+            if self._watermark is None or record.updated_at > self._watermark:
+                self._watermark = record.updated_at
+
+        return len(records)
+
+    def _idf(self, term: str) -> float:
+        return (
+            math.log((1 + len(self._documents)) / (1 + len(self._postings[term]))) + 1
+        )
+
+    def _compute_norms(self) -> Dict[str, float]:
+        norms = {}
+        for session_id, terms in self._documents.items():
+            norms[session_id] = math.sqrt(
+                sum((count * self._idf(term)) ** 2 for term, count in terms.items())
+            )
+        return norms
+
+    def query(
+        self,
+        terms: Counter,
+        top_k: int = None,
+        min_score: float = None,
+        exclude: Optional[str] = None,
+    ) -> List[SimilarAgent]:
+        """
+        Rank indexed agents by cosine similarity to the given terms.
+
+        Args:
+            terms: Weighted query terms (see agent_terms / tokenize)
+            top_k: Maximum results (default: SIMILAR_AGENTS_TOP_K)
+            min_score: Minimum similarity (default: SIMILAR_AGENTS_MIN_SCORE)
+            exclude: Session ID to leave out (the caller's own session)
+
+        Returns:
+            Most similar agents, best first
+        """
+        top_k = top_k or settings.similar_agents_top_k
+        if min_score is None:
+            min_score = settings.similar_agents_min_score
+
+        with self._lock:
+            if self._norms is None:
+                self._norms = self._compute_norms()
+
+            scores: Dict[str, float] = {}
+            query_norm = 0.0
+            for term, count in terms.items():
+                if term not in self._postings:
+                    continue
+                idf = self._idf(term)
+                weight = count * idf
+                query_norm += weight**2
+                for session_id, doc_count in self._postings[term].items():
+                    scores[session_id] = (
+                        scores.get(session_id, 0.0) + weight * doc_count * idf
+                    )
+
+            if not scores:
+                return []
+
+            # Terms unknown to the index still count towards the query norm
+            unseen_idf = math.log(1 + len(self._documents)) + 1
+            for term, count in terms.items():
+                if term not in self._postings:
+                    query_norm += (count * unseen_idf) ** 2
+            query_norm = math.sqrt(query_norm)
+
+            results = []
+            for session_id, dot in scores.items():
+                if session_id == exclude:
+                    continue
+                score = dot / (query_norm * self._norms[session_id])
+                if score >= min_score:
+                    results.append(
+                        self._summaries[session_id].model_copy(
+                            update={"score": round(score, 4)}
+                        )
+                    )
+
+        results.sort(key=lambda agent: agent.score, reverse=True)
+        return results[:top_k]
+
+    def find_similar(
+        self, db: DBSession, text: str, exclude: Optional[str] = None, **kwargs
+    ) -> List[SimilarAgent]:
+        """
+        Find past agents similar to a free-text description.
+
+        Args:
+            db: Database session (used to pick up newly completed agents)
+            text: Description, e.g. the user's first message
+            exclude: Session ID to leave out
+
+        Returns:
+            Most similar agents, best first
+        """
+        terms = Counter(tokenize(text))
+        if not terms:
+            return []
+
+        self.refresh(db)
+        return self.query(terms, exclude=exclude, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+
+# Global index instance
+_similar_agent_index: Optional[SimilarAgentIndex] = None
+
+
+def get_similar_agent_index() -> SimilarAgentIndex:
+    """Get or create the global similar-agent index instance"""
+    global _similar_agent_index
+    if _similar_agent_index is None:
+        _similar_agent_index = SimilarAgentIndex()
+    return _similar_agent_index
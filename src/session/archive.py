@@ -0,0 +1,262 @@
+"""
+Session archive - moves finished sessions out of Redis.
+
+When a session is completed or abandoned its full state (transcript
+included) is buffered and written in batches to compressed JSONL files
+partitioned by day. Once a batch is stored, each session row records
+its archive key and the Redis keys are evicted, so Redis only holds
+active sessions. Archived sessions are rehydrated lazily on read.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+import gzip
+import threading
+import uuid
+
+from sqlalchemy import update
+
+from src.blob_store import BlobStore, LocalBlobStore
+from src.config import get_settings
+from src.database import SessionLocal, mark_written
+from src.redis_client import redis_client
+from src.session.models import Session
+from src.session.schemas import SessionState
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency; falls back to gzip
+    zstandard = None
+
+settings = get_settings()
+
+
+def _compress(lines: List[bytes]) -> Iterator[bytes]:
+    """Compress newline-delimited records with zstd (or gzip)"""
+    data = b"".join(lines)
+    if zstandard is not None:
+        yield zstandard.ZstdCompressor(level=10).compress(data)
+    else:
+        yield gzip.compress(data)
+
+
+def _decompress(key: str, data: bytes) -> bytes:
+    """Decompress an archive file based on its extension"""
+    if key.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(
+                f"Archive {key} is zstd-compressed. Install 'zstandard'."
+            )
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return gzip.decompress(data)
+
+
+class SessionArchiver:
+    """
+    Batches finished sessions into compressed, day-partitioned archive files.
+    """
+
+    def __init__(self, store: BlobStore = None, batch_size: int = None):
+        self.store = store or LocalBlobStore(settings.session_archive_dir)
+        self.batch_size = batch_size or settings.session_archive_batch_size
+        self._pending: Dict[str, SessionState] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def archive(self, session_state: SessionState) -> bool:
+        """
+        Queue a finished session for archival.
+        Its Redis keys are evicted once its batch has been stored.
+
+        Args:
+            session_state: Full session state, transcript included
+
+        Returns:
+            True if a full batch is queued; the caller should flush it
+            (from async code, with run_in_threadpool)
+        """
+        with self._lock:
+            self._pending[session_state.session_id] = session_state
+            return len(self._pending) >= self.batch_size
+
+    def flush(self) -> int:
+        """
+        Write all queued sessions as one archive file, record the archive
+        key on their rows in a single UPDATE and evict them from Redis.
+
+        Returns:
+            Number of sessions archived
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending.values())
+
+            if not batch:
+                return 0
+
+            session_ids = [state.session_id for state in batch]
+
+            db = SessionLocal()
+            try:
+                key = self.write_batch(batch)
+                db.execute(
+                    update(Session)
+                    .where(Session.id.in_(session_ids))
+                    .values(archive_key=key)
+                )
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"⚠️  Failed to archive {len(batch)} sessions: {e}")
+                # Keep sessions queued (and in Redis) for the next flush
+                return 0
+            finally:
+                db.close()
+
+            with self._lock:
+                for state in batch:
+                    # Sessions re-queued meanwhile stay for the next batch
+                    if self._pending.get(state.session_id) is state:
+                        del self._pending[state.session_id]
+
+            for session_id in session_ids:
+                mark_written(session_id)
+            redis_client.delete_sessions(session_ids)
+            print(f"📦 Archived {len(batch)} sessions to {key}")
+            return len(batch)
+
+    def write_batch(self, session_states: List[SessionState]) -> str:
+        """
+        Write sessions to a new archive file (rows are not updated).
+
+        Args:
+            session_states: Full session states
+
+        Returns:
+            Archive key to record on the sessions' rows
+        """
+        now = datetime.utcnow()
+        extension = "zst" if zstandard is not None else "gz"
+        key = (
+            f"sessions/date={now:%Y-%m-%d}/"
+            f"{now:%H%M%S}-{uuid.uuid4().hex[:8]}.jsonl.{extension}"
+        )
+        lines = [
+            state.model_dump_json().encode("utf-8") + b"\n" for state in session_states
+        ]
+        self.store.write(key, _compress(lines))
+        return key
+
+    def load(
+        self, session_id: str, archive_key: Optional[str] = None
+    ) -> Optional[SessionState]:
+        """
+        Rehydrate an archived session.
+
+        Args:
+            session_id: Session to load
+            archive_key: Archive file recorded on the session row
+
+        Returns:
+            Session state, or None if it is not archived
+        """
+        with self._lock:
+            pending = self._pending.get(session_id)
+        if pending is not None:
+            return pending
+
+        if not archive_key or not self.store.exists(archive_key):
+            return None
+
+        data = _decompress(archive_key, b"".join(self.store.read(archive_key)))
+        for line in data.splitlines():
+            state = SessionState.model_validate_json(line)
+            if state.session_id == session_id:
+                return state
+        return None
+
+    def load_many(self, archive_keys: Dict[str, str]) -> Dict[str, SessionState]:
+        """
+        Rehydrate many archived sessions, reading each archive file once.
+
+        Args:
+            archive_keys: Session ID -> archive key recorded on its row
+
+        Returns:
+            Session ID -> state for the sessions found
+        """
+        states: Dict[str, SessionState] = {}
+        by_key: Dict[str, set] = {}
+
+        with self._lock:
+            for session_id, archive_key in archive_keys.items():
+                pending = self._pending.get(session_id)
+                if pending is not None:
+                    states[session_id] = pending
+                elif archive_key:
+                    by_key.setdefault(archive_key, set()).add(session_id)
+
+        for archive_key, session_ids in by_key.items():
+            if not self.store.exists(archive_key):
+                continue
+            data = _decompress(archive_key, b"".join(self.store.read(archive_key)))
+            for line in data.splitlines():
+                state = SessionState.model_validate_json(line)
+                if state.session_id in session_ids:
+                    states[state.session_id] = state
+
+        return states
+
+
+def load_session_states(db_sessions: List[Session]) -> Dict[str, SessionState]:
+    """
+    Full state of many sessions: one Redis MGET, then the archive for
+    sessions no longer in Redis.
+
+    Args:
+        db_sessions: Session rows
+
+    Returns:
+        Session ID -> state; sessions that expired unarchived are missing
+    """
+    states: Dict[str, SessionState] = {}
+    missing: Dict[str, Optional[str]] = {}
+
+    session_data = redis_client.get_sessions([row.id for row in db_sessions])
+    for row, data in zip(db_sessions, session_data):
+        if data:
+            states[row.id] = SessionState(**data)
+        else:
+            missing[row.id] = row.archive_key
+
+    if missing:
+        states.update(get_session_archiver().load_many(missing))
+    return states
+
+
+def load_session_state(db_session: Session) -> Optional[SessionState]:
+    """
+    Full state of a session: live from Redis, else from the archive.
+
+    Args:
+        db_session: Session row
+
+    Returns:
+        Session state, or None if it expired without being archived
+    """
+    session_data = redis_client.get_session(db_session.id)
+    if session_data:
+        return SessionState(**session_data)
+    return get_session_archiver().load(db_session.id, db_session.archive_key)
+
+
+# Global archiver instance
+_session_archiver: Optional[SessionArchiver] = None
+
+
+def get_session_archiver() -> SessionArchiver:
+    """Get or create the global session archiver instance"""
+    global _session_archiver
+    if _session_archiver is None:
+        _session_archiver = SessionArchiver()
+    return _session_archiver
@@ -1,8 +1,19 @@
-from sqlalchemy import Column, String, DateTime, Text, Enum as SQLEnum
+from sqlalchemy import (
+    Boolean,
+    Column,
+    String,
+    DateTime,
+    Text,
+    Index,
+    Enum as SQLEnum,
+    text,
+)
 from sqlalchemy.sql import func
-from src.database import Base
+from src.database import Base, JSONType
 import enum
 
+from src.session.schemas import SessionState, ConversationStage
+
 
 class SessionStatus(str, enum.Enum):
     ACTIVE = "active"
@@ -17,11 +28,25 @@ class Session(Base):
     """
 
     __tablename__ = "sessions"
+    __table_args__ = (
+        # Listing: filter by status, page by recency
+        Index("ix_sessions_status_updated_at", "status", "updated_at"),
+        Index("ix_sessions_agent_type", "agent_type"),
+        # "Agents that use tool X": jsonb containment on tools_config
+        Index(
+            "ix_sessions_tools_config",
+            "tools_config",
+            postgresql_using="gin",
+            postgresql_ops={"tools_config": "jsonb_path_ops"},
+            postgresql_where=text("use_tools"),
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(String, primary_key=True, index=True)
     status = Column(
         SQLEnum(SessionStatus), default=SessionStatus.ACTIVE, nullable=False
     )
+    stage = Column(String, nullable=True)  # ConversationStage (mirrors Redis)
     created_at = Column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -36,7 +61,8 @@ class Session(Base):
     # Store final outputs when session completes
     final_prompt = Column(Text, nullable=True)
     workflow_json = Column(Text, nullable=True)
-    tools_config = Column(Text, nullable=True)
+    tools_config = Column(JSONType, nullable=True)  # List of tool configs
+    archive_key = Column(String, nullable=True)  # Archive file with full state
 
     # Store detailed agent specifications
     agent_type = Column(String, nullable=True)
@@ -45,15 +71,50 @@ class Session(Base):
     target_users = Column(Text, nullable=True)
     greeting_style = Column(Text, nullable=True)
     conversation_flow = Column(Text, nullable=True)
-    example_interactions = Column(Text, nullable=True)  # JSON array as text
-    constraints = Column(Text, nullable=True)  # JSON array as text
-    edge_cases = Column(Text, nullable=True)  # JSON array as text
+    example_interactions = Column(JSONType, nullable=True)
+    constraints = Column(JSONType, nullable=True)
+    edge_cases = Column(JSONType, nullable=True)
     escalation_rules = Column(Text, nullable=True)
     success_criteria = Column(Text, nullable=True)
     brand_voice = Column(Text, nullable=True)
     verbosity_level = Column(String, nullable=True)
     additional_notes = Column(Text, nullable=True)
-    use_tools = Column(String, nullable=True)  # "true", "false", or null
+    use_tools = Column(Boolean, nullable=True)
+
+    def to_session_state(self) -> SessionState:
+        """
+        Rebuild a SessionState from the persisted agent specification.
+        Used when the live state is no longer in Redis.
+        """
+
+        if self.stage:
+            stage = ConversationStage(self.stage)
+        elif self.status == SessionStatus.COMPLETED:
+            stage = ConversationStage.COMPLETED
+        else:
+            stage = ConversationStage.INITIAL
+
+        return SessionState(
+            session_id=self.id,
+            stage=stage,
+            agent_type=self.agent_type,
+            goals=self.goals,
+            tone=self.tone,
+            use_tools=self.use_tools,
+            tools=self.tools_config or [],
+            target_users=self.target_users,
+            greeting_style=self.greeting_style,
+            conversation_flow=self.conversation_flow,
+            example_interactions=self.example_interactions or [],
+            constraints=self.constraints or [],
+            edge_cases=self.edge_cases or [],
+            escalation_rules=self.escalation_rules,
+            success_criteria=self.success_criteria,
+            brand_voice=self.brand_voice,
+            verbosity_level=self.verbosity_level,
+            additional_notes=self.additional_notes,
+            final_prompt=self.final_prompt,
+        )
 
     def __repr__(self):
         return f"<Session(id={self.id}, status={self.status}, agent_type={self.agent_type})>"
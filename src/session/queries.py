@@ -0,0 +1,61 @@
+"""
+Query helpers over the native JSON session columns.
+"""
+
+from typing import List, Optional
+import json
+
+from sqlalchemy import and_, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session as DBSession
+
+from src.session.models import Session, SessionStatus
+
+
+def uses_tool(tool_name: str, dialect: str):
+    """
+    Filter clause matching sessions with a tool of the given name.
+
+    On PostgreSQL this is a jsonb containment test served by the partial
+    GIN index ix_sessions_tools_config; elsewhere it scans json_each().
+
+    Args:
+        tool_name: Tool name to look for
+        dialect: Database dialect name (db.get_bind().dialect.name)
+    """
+    if dialect == "postgresql":
+        # Bare use_tools matches the partial index predicate
+        return and_(
+            Session.use_tools,
+            Session.tools_config.op("@>")(
+                cast(json.dumps([{"name": tool_name}]), JSONB)
+            ),
+        )
+
+    tools = func.json_each(Session.tools_config).table_valued("value")
+    return (
+        select(literal(1))
+        .select_from(tools)
+        .where(func.json_extract(tools.c.value, "$.name") == tool_name)
+        .exists()
+    )
+
+
+def sessions_using_tool(
+    db: DBSession, tool_name: str, status: Optional[SessionStatus] = None
+) -> List[Session]:
+    """
+    All sessions whose agent uses the given tool, in a single query.
+
+    Args:
+        db: Database session
+        tool_name: Tool name to look for
+        status: Optionally restrict to one status
+
+    Returns:
+        Matching sessions
+    """
+    query = db.query(Session).filter(uses_tool(tool_name, db.get_bind().dialect.name))
+    if status:
+        query = query.filter(Session.status == status)
+    return query.all()
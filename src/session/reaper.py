@@ -0,0 +1,200 @@
+"""
+Session reaper - marks sessions ABANDONED once their Redis state expires.
+
+Expired session keys are picked up from Redis keyspace notifications and
+reaped in batched UPDATEs. A periodic sweep covers missed notifications
+(restarts, notifications disabled): ACTIVE rows idle for longer than the
+session expiry are checked against Redis in pipelined batches.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+import threading
+
+from sqlalchemy import update
+
+from src.config import get_settings
+from src.database import SessionLocal
+from src.redis_client import redis_client
+from src.session.models import Session, SessionStatus
+
+settings = get_settings()
+
+
+class SessionReaper:
+    """
+    Reconciles Redis session expiry with session status in the database.
+    """
+
+    def __init__(self, batch_size: int = None):
+        self.batch_size = batch_size or settings.session_reaper_batch_size
+        self._expired: set = set()
+        self._lock = threading.Lock()
+        self._listener = None
+
+        self.reaped_from_notifications = 0
+        self.reaped_from_sweeps = 0
+        self.sweeps = 0
+        self.last_sweep_at: Optional[datetime] = None
+
+    def start_listener(self) -> bool:
+        """
+        Subscribe to Redis expired-key notifications.
+
+        Returns:
+            True if subscribed (the sweep still runs either way)
+        """
+        if self._listener is not None:
+            return True
+        try:
+            self._listener = redis_client.subscribe_expired_sessions(self.on_expired)
+            return True
+        except Exception as e:
+            print(f"⚠️  Session expiry notifications unavailable: {e}")
+            return False
+
+    def stop_listener(self) -> None:
+        """Unsubscribe from expiry notifications"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    def on_expired(self, session_id: str) -> None:
+        """Queue a session whose Redis key expired"""
+        with self._lock:
+            self._expired.add(session_id)
+
+    def reap(self, session_ids: Iterable[str]) -> int:
+        """
+        Mark ACTIVE sessions ABANDONED in batched UPDATEs.
+
+        Args:
+            session_ids: Sessions whose state is gone from Redis
+
+        Returns:
+            Number of rows updated
+        """
+        session_ids = list(session_ids)
+        reaped = 0
+
+        db = SessionLocal()
+        try:
+            for start in range(0, len(session_ids), self.batch_size):
+                chunk = session_ids[start : start + self.batch_size]
+                result = db.execute(
+                    update(Session)
+                    .where(
+                        Session.id.in_(chunk),
+                        Session.status == SessionStatus.ACTIVE,
+                    )
+                    .values(status=SessionStatus.ABANDONED)
+                    .execution_options(synchronize_session=False)
+                )
+                reaped += result.rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        return reaped
+
+    def flush_notifications(self) -> int:
+        """
+        Reap all sessions queued by expiry notifications.
+
+        Returns:
+            Number of sessions reaped
+        """
+        with self._lock:
+            session_ids, self._expired = self._expired, set()
+
+        if not session_ids:
+            return 0
+
+        try:
+            reaped = self.reap(session_ids)
+        except Exception as e:
+            print(f"⚠️  Failed to reap expired sessions: {e}")
+            with self._lock:
+                self._expired |= session_ids
+            return 0
+
+        self.reaped_from_notifications += reaped
+        return reaped
+
+    def sweep(self) -> int:
+        """
+        Reap ACTIVE sessions idle past the expiry whose Redis key is gone.
+
+        Returns:
+            Number of sessions reaped
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.session_expiry_seconds)
+        reaped = 0
+        last_id = ""
+
+        while True:
+            # Page through candidates by id; served by the status index
+            db = SessionLocal()
+            try:
+                candidates: List[str] = [
+                    row.id
+                    for row in db.query(Session.id)
+                    .filter(
+                        Session.status == SessionStatus.ACTIVE,
+                        Session.updated_at < cutoff,
+                        Session.id > last_id,
+                    )
+                    .order_by(Session.id)
+                    .limit(self.batch_size)
+                    .all()
+                ]
+            finally:
+                db.close()
+
+            if not candidates:
+                break
+            last_id = candidates[-1]
+
+            # Resumed sessions keep their Redis key without touching updated_at
+            exists = redis_client.sessions_exist(candidates)
+            expired = [sid for sid, alive in zip(candidates, exists) if not alive]
+            if expired:
+                reaped += self.reap(expired)
+
+        self.reaped_from_sweeps += reaped
+        self.sweeps += 1
+        self.last_sweep_at = datetime.utcnow()
+        if reaped:
+            print(f"🧹 Reaped {reaped} expired sessions")
+        return reaped
+
+    def stats(self) -> Dict[str, Any]:
+        """Reaper counters"""
+        with self._lock:
+            pending = len(self._expired)
+        return {
+            "listening": self._listener is not None,
+            "pending": pending,
+            "reaped_from_notifications": self.reaped_from_notifications,
+            "reaped_from_sweeps": self.reaped_from_sweeps,
+            "reaped_total": self.reaped_from_notifications + self.reaped_from_sweeps,
+            "sweeps": self.sweeps,
+            "last_sweep_at": (
+                self.last_sweep_at.isoformat() if self.last_sweep_at else None
+            ),
+        }
+
+
+# Global reaper instance
+_session_reaper: Optional[SessionReaper] = None
+
+
+def get_session_reaper() -> SessionReaper:
+    """Get or create the global session reaper instance"""
+    global _session_reaper
+    if _session_reaper is None:
+        _session_reaper = SessionReaper()
+    return _session_reaper
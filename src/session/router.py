@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import String, and_, or_, type_coerce
 from sqlalchemy.orm import Session as DBSession
-from typing import Optional
+from typing import List, Optional, Tuple, Union
 import uuid
 import json
+import base64
+import hashlib
 from datetime import datetime
 
-from src.database import get_db
+from src.database import get_db, get_read_db, mark_written
 from src.redis_client import redis_client
 from src.session.models import Session, SessionStatus as DBSessionStatus
 from src.session.schemas import (
@@ -15,12 +19,28 @@ from src.session.schemas import (
     MessageRequest,
     MessageResponse,
     SessionStatusResponse,
+    SessionStatusBatchRequest,
+    SessionStatusBatchItem,
+    SessionStatusBatchResponse,
     ConversationStage,
+    SessionStatus,
+    SessionSortField,
+    SortOrder,
+    SessionListItem,
+    SessionListResponse,
+    SimilarAgent,
+    TemplateRequest,
 )
 from src.orchestrator import get_orchestrator
-from src.workflow.models import Workflow
-from src.workflow.synthesizer import get_synthesizer
-from src.workflow.visualizer import generate_mermaid_diagram
+from src.session.archive import (
+    get_session_archiver,
+    load_session_state,
+    load_session_states,
+)
+from src.session.queries import uses_tool
+from src.session.reaper import get_session_reaper
+from src.search.similar import get_similar_agent_index
+from src.workflow.queries import resynthesize_workflow
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 
@@ -35,6 +55,322 @@ def get_initial_question() -> str:
     )
 
 
+def _sort_key(column, dialect: str):
+    """
+    Keyset expression for a timestamp column.
+
+    SQLite stores timestamps as text in more than one format (server
+    defaults have whole seconds, Python-side values have microseconds),
+    so the cursor keeps the raw stored text and compares against it as
+    text, which is also how SQLite orders the column.
+    """
+    if dialect == "sqlite":
+        return type_coerce(column, String)
+    return column
+
+
+def _encode_cursor(sort_value: Union[datetime, str], session_id: str) -> str:
+    """Encode the last row's sort key as an opaque cursor"""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, session_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor: str, dialect: str) -> Tuple[Union[datetime, str], str]:
+    """Decode a cursor produced by _encode_cursor"""
+    try:
+        sort_value, session_id = json.loads(base64.urlsafe_b64decode(cursor))
+        if not isinstance(sort_value, str) or not isinstance(session_id, str):
+            raise ValueError("Malformed cursor")
+        if dialect == "sqlite":
+            return sort_value, session_id
+        return datetime.fromisoformat(sort_value), session_id
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+# Stages a session can still be seeded from a template in
+TEMPLATE_STAGES = {ConversationStage.INITIAL, ConversationStage.COLLECTING_BASICS}
+
+
+def _suggest_templates(
+    db: DBSession, session_state: SessionState
+) -> List[SimilarAgent]:
+    """
+    Offer similar completed agents after the user's first message.
+    Suggestions are best-effort and never fail the request.
+    """
+    user_messages = [
+        message
+        for message in session_state.conversation_history
+        if message.get("role") == "user"
+    ]
+    if len(user_messages) != 1 or session_state.stage not in TEMPLATE_STAGES:
+        return []
+
+    try:
+        return get_similar_agent_index().find_similar(
+            db, user_messages[0].get("content", ""), exclude=session_state.session_id
+        )
+    except Exception as e:
+        print(f"⚠️  Failed to find similar agents: {e}")
+        return []
+
+
+def _ensure_workflow_record(
+    db: DBSession, session_id: str, session_state: SessionState
+) -> None:
+    """Create the session's workflow, or apply state changes to the stored one"""
+    workflow, workflow_data, diff = resynthesize_workflow(db, session_id, session_state)
+
+    if diff is None:
+        print(
+            f"✅ Workflow created with {len(workflow_data.nodes)} nodes and {len(workflow_data.edges)} edges"
+        )
+    elif not diff.is_empty():
+        print(f"💾 Workflow for session {session_id} updated to v{workflow.version}")
+
+
+def _save_agent_spec(db_session: Session, session_state: SessionState) -> None:
+    """Copy the agent specification from session state onto the DB record"""
+    db_session.agent_type = session_state.agent_type
+    db_session.goals = session_state.goals
+    db_session.tone = session_state.tone
+    db_session.target_users = session_state.target_users
+    db_session.greeting_style = session_state.greeting_style
+    db_session.conversation_flow = session_state.conversation_flow
+    db_session.escalation_rules = session_state.escalation_rules
+    db_session.success_criteria = session_state.success_criteria
+    db_session.brand_voice = session_state.brand_voice
+    db_session.verbosity_level = session_state.verbosity_level
+    db_session.additional_notes = session_state.additional_notes
+    db_session.use_tools = session_state.use_tools
+
+    # Arrays are stored as native JSON
+    if session_state.example_interactions:
+        db_session.example_interactions = list(session_state.example_interactions)
+    if session_state.constraints:
+        db_session.constraints = list(session_state.constraints)
+    if session_state.edge_cases:
+        db_session.edge_cases = list(session_state.edge_cases)
+    if session_state.tools:
+        db_session.tools_config = [
+            tool.model_dump(mode="json") for tool in session_state.tools
+        ]
+
+
+def _build_session_status(
+    db_session: Session, session_state: SessionState
+) -> SessionStatusResponse:
+    """Status summary of a session, shared by the single and batch endpoints"""
+    # Calculate progress
+    total_fields = 3  # agent_type, goals, tone (minimum)
+    collected = len(session_state.collected_fields)
+    if session_state.use_tools:
+        total_fields += len(session_state.tools)
+    progress = min(int((collected / total_fields) * 100), 100)
+
+    # Collected info summary
+    collected_info = {
+        "agent_type": session_state.agent_type,
+        "goals": session_state.goals,
+        "tone": session_state.tone,
+        "use_tools": session_state.use_tools,
+        "tools_count": len(session_state.tools),
+    }
+
+    return SessionStatusResponse(
+        session_id=db_session.id,
+        status=db_session.status,
+        stage=session_state.stage,
+        progress_percentage=progress,
+        collected_info=collected_info,
+        created_at=db_session.created_at,
+        updated_at=session_state.updated_at,
+    )
+
+
+def _status_etag(session_status: SessionStatusResponse) -> str:
+    """Strong ETag over the status body"""
+    digest = hashlib.sha1(session_status.model_dump_json().encode()).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match value covers the given ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+@router.get("", response_model=SessionListResponse)
+async def list_sessions(
+    status_filter: Optional[SessionStatus] = Query(default=None, alias="status"),
+    stage: Optional[ConversationStage] = None,
+    agent_type: Optional[str] = None,
+    tool: Optional[str] = Query(default=None, description="Agents using this tool"),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    updated_after: Optional[datetime] = None,
+    updated_before: Optional[datetime] = None,
+    sort_by: SessionSortField = SessionSortField.UPDATED_AT,
+    order: SortOrder = SortOrder.DESC,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: DBSession = Depends(get_read_db),
+):
+    """
+    List sessions with filters and keyset pagination.
+    Reads only the sessions table (no Redis lookups per row).
+    """
+    dialect = db.get_bind().dialect.name
+    sort_column = getattr(Session, sort_by.value)
+    sort_key = _sort_key(sort_column, dialect)
+
+    query = db.query(
+        sort_key.label("sort_key"),
+        Session.id,
+        Session.status,
+        Session.stage,
+        Session.agent_type,
+        Session.tone,
+        Session.created_at,
+        Session.updated_at,
+        Session.completed_at,
+    )
+
+    # Filters
+    if status_filter:
+        query = query.filter(Session.status == DBSessionStatus(status_filter.value))
+    if stage:
+        query = query.filter(Session.stage == stage.value)
+    if agent_type:
+        query = query.filter(Session.agent_type == agent_type)
+    if tool:
+        query = query.filter(uses_tool(tool, dialect))
+    if created_after:
+        query = query.filter(Session.created_at >= created_after)
+    if created_before:
+        query = query.filter(Session.created_at < created_before)
+    if updated_after:
+        query = query.filter(Session.updated_at >= updated_after)
+    if updated_before:
+        query = query.filter(Session.updated_at < updated_before)
+
+    # Keyset pagination on (sort column, id)
+    if cursor:
+        last_value, last_id = _decode_cursor(cursor, dialect)
+        if order == SortOrder.DESC:
+            query = query.filter(
+                or_(
+                    sort_key < last_value,
+                    and_(sort_key == last_value, Session.id < last_id),
+                )
+            )
+        else:
+            query = query.filter(
+                or_(
+                    sort_key > last_value,
+                    and_(sort_key == last_value, Session.id > last_id),
+                )
+            )
+
+    if order == SortOrder.DESC:
+        query = query.order_by(sort_column.desc(), Session.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), Session.id.asc())
+
+    # Fetch one extra row to know whether there is a next page
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    sessions = [
+        SessionListItem(
+            session_id=row.id,
+            status=row.status.value,
+            stage=row.stage,
+            agent_type=row.agent_type,
+            tone=row.tone,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            completed_at=row.completed_at,
+        )
+        for row in rows
+    ]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = _encode_cursor(last.sort_key, last.id)
+
+    return SessionListResponse(sessions=sessions, next_cursor=next_cursor, limit=limit)
+
+
+@router.get("/reaper/stats")
+async def get_reaper_stats():
+    """
+    Get counts of sessions reaped after their Redis state expired.
+    """
+    return get_session_reaper().stats()
+
+
+@router.post("/status:batch", response_model=SessionStatusBatchResponse)
+async def get_session_statuses(
+    request: SessionStatusBatchRequest, db: DBSession = Depends(get_read_db)
+):
+    """
+    Get the status of up to 500 sessions in one call.
+
+    Rows are fetched with one IN query and live state with one Redis MGET.
+    Sessions whose ETag matches the one sent in `etags` come back as
+    not_modified without a status body.
+    """
+    session_ids = list(dict.fromkeys(request.session_ids))
+
+    rows = db.query(Session).filter(Session.id.in_(session_ids)).all()
+    states = load_session_states(rows)
+    rows_by_id = {row.id: row for row in rows}
+
+    items = []
+    for session_id in session_ids:
+        db_session = rows_by_id.get(session_id)
+        if db_session is None:
+            items.append(
+                SessionStatusBatchItem(session_id=session_id, error="not_found")
+            )
+            continue
+
+        session_state = states.get(session_id)
+        if session_state is None:
+            items.append(SessionStatusBatchItem(session_id=session_id, error="expired"))
+            continue
+
+        session_status = _build_session_status(db_session, session_state)
+        etag = _status_etag(session_status)
+        if _etag_matches(request.etags.get(session_id), etag):
+            items.append(
+                SessionStatusBatchItem(
+                    session_id=session_id, etag=etag, not_modified=True
+                )
+            )
+        else:
+            items.append(
+                SessionStatusBatchItem(
+                    session_id=session_id, etag=etag, status=session_status
+                )
+            )
+
+    return SessionStatusBatchResponse(sessions=items)
+
+
 @router.post(
     "/create", response_model=SessionResponse, status_code=status.HTTP_201_CREATED
 )
@@ -47,10 +383,15 @@ async def create_session(request: SessionCreate, db: DBSession = Depends(get_db)
     session_id = str(uuid.uuid4())
 
     # Create session in database
-    db_session = Session(id=session_id, status=DBSessionStatus.ACTIVE)
+    db_session = Session(
+        id=session_id,
+        status=DBSessionStatus.ACTIVE,
+        stage=ConversationStage.INITIAL.value,
+    )
     db.add(db_session)
     db.commit()
     db.refresh(db_session)
+    mark_written(session_id)
 
     # Initialize session state in Redis
     session_state = SessionState(session_id=session_id, stage=ConversationStage.INITIAL)
@@ -74,6 +415,7 @@ async def create_session(request: SessionCreate, db: DBSession = Depends(get_db)
         stage=ConversationStage.INITIAL,
         created_at=db_session.created_at,
         message=get_initial_question(),
+        similar_agents=_suggest_templates(db, session_state),
     )
 
 
@@ -118,6 +460,8 @@ async def send_message(
         }
     )
 
+    similar_agents = _suggest_templates(db, session_state)
+
     # Process message through orchestrator
     orchestrator = get_orchestrator()
     result = await orchestrator.process_message(session_state, request.message)
@@ -140,67 +484,17 @@ async def send_message(
 
     # Auto-create workflow in database when entering REVIEWING_WORKFLOW stage
     if stage_changed and new_stage == ConversationStage.REVIEWING_WORKFLOW:
-        # Check if workflow already exists
-        existing_workflow = (
-            db.query(Workflow).filter(Workflow.session_id == session_id).first()
-        )
-
-        if not existing_workflow:
-            print(f"💾 Auto-creating workflow in database for session {session_id}")
-
-            # Synthesize workflow from session state
-            synthesizer = get_synthesizer()
-            workflow_data = synthesizer.synthesize(updated_state)
-
-            # Generate visualization
-            mermaid_diagram = generate_mermaid_diagram(workflow_data)
-
-            # Create workflow record in PostgreSQL
-            db_workflow = Workflow(
-                id=str(uuid.uuid4()),
-                session_id=session_id,
-                agent_type=workflow_data.agent_type,
-                goals=workflow_data.goals,
-                tone=workflow_data.tone,
-                use_tools=workflow_data.use_tools,
-                workflow_json=workflow_data.model_dump_json(),
-                mermaid_diagram=mermaid_diagram,
-                is_approved=False,
-            )
-            db.add(db_workflow)
-            print(
-                f"✅ Workflow created with {len(workflow_data.nodes)} nodes and {len(workflow_data.edges)} edges"
-            )
+        _ensure_workflow_record(db, session_id, updated_state)
 
     # Update Redis with new state
     redis_client.set_session(session_id, updated_state.model_dump(mode="json"))
 
-    # Update DB timestamp and status
+    # Update DB timestamp, stage and status
     db_session.updated_at = datetime.utcnow()
+    db_session.stage = updated_state.stage.value
 
     # Save detailed agent specifications to PostgreSQL
-    db_session.agent_type = updated_state.agent_type
-    db_session.goals = updated_state.goals
-    db_session.tone = updated_state.tone
-    db_session.target_users = updated_state.target_users
-    db_session.greeting_style = updated_state.greeting_style
-    db_session.conversation_flow = updated_state.conversation_flow
-    db_session.escalation_rules = updated_state.escalation_rules
-    db_session.success_criteria = updated_state.success_criteria
-    db_session.brand_voice = updated_state.brand_voice
-    db_session.verbosity_level = updated_state.verbosity_level
-    db_session.additional_notes = updated_state.additional_notes
-    db_session.use_tools = (
-        str(updated_state.use_tools) if updated_state.use_tools is not None else None
-    )
-
-    # Store arrays as JSON strings
-    if updated_state.example_interactions:
-        db_session.example_interactions = json.dumps(updated_state.example_interactions)
-    if updated_state.constraints:
-        db_session.constraints = json.dumps(updated_state.constraints)
-    if updated_state.edge_cases:
-        db_session.edge_cases = json.dumps(updated_state.edge_cases)
+    _save_agent_spec(db_session, updated_state)
 
     if is_complete:
         db_session.status = DBSessionStatus.COMPLETED
@@ -208,20 +502,38 @@ async def send_message(
 
     db.commit()
 
+    # Index completed agents while the transcript is still available
+    if is_complete:
+        # Imported here: src.search.index imports the session package
+        from src.search.index import get_search_index
+
+        try:
+            get_search_index().index_session(db, updated_state)
+        except Exception as e:
+            print(f"⚠️  Failed to index session {session_id}: {e}")
+
+        # Move the full state out of Redis
+        archiver = get_session_archiver()
+        if archiver.archive(updated_state):
+            await run_in_threadpool(archiver.flush)
+
     return MessageResponse(
         session_id=session_id,
         stage=updated_state.stage,
         ai_response=ai_response,
         is_complete=is_complete,
+        similar_agents=similar_agents,
     )
 
 
-@router.get("/{session_id}/status", response_model=SessionStatusResponse)
-async def get_session_status(session_id: str, db: DBSession = Depends(get_db)):
+@router.post("/{session_id}/template", response_model=MessageResponse)
+async def apply_template(
+    session_id: str, request: TemplateRequest, db: DBSession = Depends(get_db)
+):
     """
-    Get current status of a session.
+    Pre-fill the session from a past completed agent (e.g. one offered in
+    `similar_agents`) and go straight to workflow review.
     """
-    # Check DB
     db_session = db.query(Session).filter(Session.id == session_id).first()
     if not db_session:
         raise HTTPException(
@@ -229,43 +541,136 @@ async def get_session_status(session_id: str, db: DBSession = Depends(get_db)):
             detail=f"Session {session_id} not found",
         )
 
-    # Get from Redis
+    if db_session.status != DBSessionStatus.ACTIVE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Session {session_id} is not active (status: {db_session.status})",
+        )
+
+    template_session = (
+        db.query(Session)
+        .filter(
+            Session.id == request.template_session_id,
+            Session.status == DBSessionStatus.COMPLETED,
+        )
+        .first()
+    )
+    if not template_session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Completed session {request.template_session_id} not found",
+        )
+
     session_data = redis_client.get_session(session_id)
     if not session_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session state not found. Session may have expired.",
+            detail=f"Session state not found in cache. Session may have expired.",
         )
 
     session_state = SessionState(**session_data)
+    if session_state.stage not in TEMPLATE_STAGES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Templates can only be applied before the basics are collected (stage: {session_state.stage.value})",
+        )
 
-    # Calculate progress
-    total_fields = 3  # agent_type, goals, tone (minimum)
-    collected = len(session_state.collected_fields)
-    if session_state.use_tools:
-        total_fields += len(session_state.tools)
-    progress = min(int((collected / total_fields) * 100), 100)
+    # Prefer the full template state (has complete tool configs)
+    template_state = (
+        load_session_state(template_session) or template_session.to_session_state()
+    )
 
-    # Collected info summary
-    collected_info = {
-        "agent_type": session_state.agent_type,
-        "goals": session_state.goals,
-        "tone": session_state.tone,
-        "use_tools": session_state.use_tools,
-        "tools_count": len(session_state.tools),
-    }
+    orchestrator = get_orchestrator()
+    result = await orchestrator.apply_template(session_state, template_state)
+    ai_response = result["ai_response"]
+    updated_state = result["updated_state"]
 
-    return SessionStatusResponse(
+    updated_state.conversation_history.append(
+        {
+            "role": "assistant",
+            "content": ai_response,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+    )
+
+    _ensure_workflow_record(db, session_id, updated_state)
+
+    redis_client.set_session(session_id, updated_state.model_dump(mode="json"))
+
+    db_session.updated_at = datetime.utcnow()
+    db_session.stage = updated_state.stage.value
+    _save_agent_spec(db_session, updated_state)
+    db.commit()
+
+    return MessageResponse(
         session_id=session_id,
-        status=db_session.status,
-        stage=session_state.stage,
-        progress_percentage=progress,
-        collected_info=collected_info,
-        created_at=db_session.created_at,
-        updated_at=session_state.updated_at,
+        stage=updated_state.stage,
+        ai_response=ai_response,
+        is_complete=False,
     )
 
 
+@router.get("/{session_id}/status", response_model=SessionStatusResponse)
+async def get_session_status(
+    session_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    db: DBSession = Depends(get_read_db),
+):
+    """
+    Get current status of a session.
+    Sends an ETag; a matching If-None-Match gets 304 Not Modified.
+    """
+    # Check DB
+    db_session = db.query(Session).filter(Session.id == session_id).first()
+    if not db_session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Session {session_id} not found",
+        )
+
+    # Get from Redis (or the archive, for finished sessions)
+    session_state = load_session_state(db_session)
+    if not session_state:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Session state not found. Session may have expired.",
+        )
+
+    session_status = _build_session_status(db_session, session_state)
+    etag = _status_etag(session_status)
+    if _etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+    response.headers["ETag"] = etag
+    return session_status
+
+
+@router.get("/{session_id}/state", response_model=SessionState)
+async def get_session_state(session_id: str, db: DBSession = Depends(get_read_db)):
+    """
+    Get the full state of a session, transcript included.
+    Finished sessions are rehydrated from the archive.
+    """
+    db_session = db.query(Session).filter(Session.id == session_id).first()
+    if not db_session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Session {session_id} not found",
+        )
+
+    session_state = load_session_state(db_session)
+    if not session_state:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Session state not found. Session may have expired.",
+        )
+
+    return session_state
+
+
 @router.post("/{session_id}/resume", response_model=MessageResponse)
 async def resume_session(session_id: str, db: DBSession = Depends(get_db)):
     """
@@ -321,7 +726,14 @@ async def delete_session(session_id: str, db: DBSession = Depends(get_db)):
     db_session.status = DBSessionStatus.ABANDONED
     db.commit()
 
-    # Delete from Redis
-    redis_client.delete_session(session_id)
+    # No longer offered as a template
+    get_similar_agent_index().remove(session_id)
+
+    # Archive the transcript; the Redis key is evicted once it is stored
+    session_data = redis_client.get_session(session_id)
+    if session_data:
+        archiver = get_session_archiver()
+        if archiver.archive(SessionState(**session_data)):
+            await run_in_threadpool(archiver.flush)
 
     return {"message": f"Session {session_id} deleted successfully"}
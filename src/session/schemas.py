@@ -88,6 +88,17 @@ class SessionCreate(BaseModel):
     initial_message: Optional[str] = None
 
 
+class SimilarAgent(BaseModel):
+    """A completed agent offered as a template"""
+
+    session_id: str
+    agent_type: Optional[str] = None
+    goals: Optional[str] = None
+    tone: Optional[str] = None
+    tools: List[str] = Field(default_factory=list)
+    score: float = Field(description="Cosine similarity (0-1)")
+
+
 class SessionResponse(BaseModel):
     """Response when creating or retrieving a session"""
 
@@ -96,6 +107,9 @@ class SessionResponse(BaseModel):
     stage: ConversationStage
     created_at: datetime
     message: Optional[str] = None  # AI's first question or response
+    similar_agents: List[SimilarAgent] = Field(
+        default_factory=list
+    )  # Past agents offered as templates
 
     class Config:
         from_attributes = True
@@ -116,6 +130,15 @@ class MessageResponse(BaseModel):
     is_complete: bool = False
     final_prompt: Optional[str] = None
     workflow: Optional[Dict[str, Any]] = None
+    similar_agents: List[SimilarAgent] = Field(
+        default_factory=list
+    )  # Past agents offered as templates
+
+
+class TemplateRequest(BaseModel):
+    """Start a session from a past completed agent"""
+
+    template_session_id: str
 
 
 class SessionStatusResponse(BaseModel):
@@ -128,3 +151,67 @@ class SessionStatusResponse(BaseModel):
     collected_info: Dict[str, Any]
     created_at: datetime
     updated_at: datetime
+
+
+MAX_STATUS_BATCH = 500
+
+
+class SessionStatusBatchRequest(BaseModel):
+    """Statuses to fetch in one call"""
+
+    session_ids: List[str] = Field(..., min_length=1, max_length=MAX_STATUS_BATCH)
+    etags: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Session ID -> ETag from a previous response (If-None-Match)",
+    )
+
+
+class SessionStatusBatchItem(BaseModel):
+    """Status of one session in a batch"""
+
+    session_id: str
+    etag: Optional[str] = None
+    not_modified: bool = False
+    status: Optional[SessionStatusResponse] = None
+    error: Optional[str] = None
+
+
+class SessionStatusBatchResponse(BaseModel):
+    """Statuses in request order"""
+
+    sessions: List[SessionStatusBatchItem]
+
+
+class SessionSortField(str, Enum):
+    """Columns sessions can be listed by"""
+
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+
+
+class SortOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+
+class SessionListItem(BaseModel):
+    """Session summary row, built from the sessions table only"""
+
+    session_id: str
+    status: SessionStatus
+    stage: Optional[ConversationStage] = None
+    agent_type: Optional[str] = None
+    tone: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    completed_at: Optional[datetime] = None
+
+
+class SessionListResponse(BaseModel):
+    """One page of sessions"""
+
+    sessions: List[SessionListItem]
+    next_cursor: Optional[str] = Field(
+        default=None, description="Pass as `cursor` to fetch the next page"
+    )
+    limit: int
@@ -0,0 +1,24 @@
+"""
+Simulation Module - Runs synthetic callers against generated agents and scores them.
+"""
+
+from src.simulation.schemas import (
+    CallerPersona,
+    SimulationProvider,
+    SimulationReport,
+    SimulationRequest,
+)
+from src.simulation.backends import FakeBackend, LLMBackend, get_simulation_backend
+from src.simulation.runner import SimulationRunner, get_simulation_runner
+
+__all__ = [
+    "CallerPersona",
+    "SimulationProvider",
+    "SimulationReport",
+    "SimulationRequest",
+    "FakeBackend",
+    "LLMBackend",
+    "get_simulation_backend",
+    "SimulationRunner",
+    "get_simulation_runner",
+]
@@ -0,0 +1,164 @@
+"""
+Simulation backends - play the agent under test and LLM-driven callers.
+
+FakeBackend runs offline: the agent answers with the system prompt lines
+most relevant to the caller's message, and callers work through their
+goal in a fixed number of turns. LLMBackend uses the configured provider.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from src.llm.client import get_llm_client
+from src.search.similar import tokenize
+from src.simulation.schemas import CallerPersona, SimulationProvider
+
+# Lines of the system prompt quoted per fake agent reply
+FAKE_REPLY_LINES = 2
+
+CALLER_SYSTEM_PROMPT = """You are role-playing a caller phoning a voice agent.
+Your goal: {goal}
+
+Reply with your next line to the agent only, in one or two short sentences.
+When your goal has been met or the call should end, reply with exactly END."""
+
+
+class SimulationBackend:
+    """
+    Produces agent replies and caller messages for simulated conversations.
+    """
+
+    async def agent_reply(
+        self, system_prompt: str, transcript: List[Dict[str, str]]
+    ) -> str:
+        """
+        Reply as the agent under test.
+
+        Args:
+            system_prompt: Generated system prompt of the agent
+            transcript: Conversation so far, ending with the caller's message
+
+        Returns:
+            Agent reply
+        """
+        raise NotImplementedError
+
+    async def caller_message(
+        self, persona: CallerPersona, transcript: List[Dict[str, str]]
+    ) -> Optional[str]:
+        """
+        Next message of an LLM-driven caller.
+
+        Args:
+            persona: Caller persona (goal set, no script)
+            transcript: Conversation so far
+
+        Returns:
+            Caller message, or None to hang up
+        """
+        raise NotImplementedError
+
+
+@lru_cache(maxsize=64)
+def _prompt_lines(system_prompt: str) -> Tuple[Tuple[str, frozenset], ...]:
+    """Non-empty prompt lines with their tokens (shared across conversations)"""
+    lines = []
+    for line in system_prompt.splitlines():
+        line = line.strip().lstrip("-*#• ").strip()
+        if line:
+            lines.append((line, frozenset(tokenize(line))))
+    return tuple(lines)
+
+
+class FakeBackend(SimulationBackend):
+    """
+    Deterministic offline backend.
+    """
+
+    async def agent_reply(
+        self, system_prompt: str, transcript: List[Dict[str, str]]
+    ) -> str:
+        lines = _prompt_lines(system_prompt)
+        if not lines:
+            return "How can I help you?"
+
+        message = set(tokenize(transcript[-1]["content"])) if transcript else set()
+        ranked = sorted(
+            range(len(lines)),
+            key=lambda i: (-len(lines[i][1] & message), i),
+        )
+        chosen = [i for i in ranked[:FAKE_REPLY_LINES] if lines[i][1] & message]
+        if not chosen:
+            chosen = [ranked[0]]
+        return " ".join(lines[i][0] for i in sorted(chosen))
+
+    async def caller_message(
+        self, persona: CallerPersona, transcript: List[Dict[str, str]]
+    ) -> Optional[str]:
+        turn = sum(1 for message in transcript if message["role"] == "user")
+        goal = persona.goal or "get some help"
+        messages = [
+            f"Hi, {goal}",
+            f"Okay. What else do you need from me to {goal}?",
+            "Thanks, that's all.",
+        ]
+        return messages[turn] if turn < len(messages) else None
+
+
+class LLMBackend(SimulationBackend):
+    """
+    Backend using the configured LLM provider.
+    """
+
+    def __init__(self, session_id: Optional[str] = None):
+        self.session_id = session_id
+        self.llm_client = get_llm_client()
+
+    async def agent_reply(
+        self, system_prompt: str, transcript: List[Dict[str, str]]
+    ) -> str:
+        return await self.llm_client.complete(
+            system_prompt, transcript, session_id=self.session_id
+        )
+
+    async def caller_message(
+        self, persona: CallerPersona, transcript: List[Dict[str, str]]
+    ) -> Optional[str]:
+        # The caller sees the conversation from the other side
+        messages = [
+            {
+                "role": "assistant" if message["role"] == "user" else "user",
+                "content": message["content"],
+            }
+            for message in transcript
+        ]
+        if not messages or messages[0]["role"] != "user":
+            messages.insert(0, {"role": "user", "content": "(The agent picks up.)"})
+
+        reply = await self.llm_client.complete(
+            CALLER_SYSTEM_PROMPT.format(goal=persona.goal or "get some help"),
+            messages,
+            max_tokens=200,
+            session_id=self.session_id,
+        )
+        if not reply or reply.strip().upper().rstrip(".") == "END":
+            return None
+        return reply
+
+
+def get_simulation_backend(
+    provider: SimulationProvider, session_id: Optional[str] = None
+) -> SimulationBackend:
+    """
+    Get a backend for the given provider.
+
+    Args:
+        provider: Simulation provider
+        session_id: Session to attribute LLM token usage to
+
+    Returns:
+        Simulation backend
+    """
+    if provider == SimulationProvider.LLM:
+        return LLMBackend(session_id)
+    return FakeBackend()
@@ -0,0 +1,52 @@
+"""
+Simulation API endpoints for testing generated agents before shipping.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session as DBSession
+
+from src.database import get_read_db
+from src.session.archive import load_session_state
+from src.session.models import Session
+from src.simulation.runner import get_simulation_runner
+from src.simulation.schemas import SimulationReport, SimulationRequest
+
+router = APIRouter(prefix="/simulations", tags=["simulations"])
+
+
+@router.post("/{session_id}", response_model=SimulationReport)
+async def simulate_agent(
+    session_id: str,
+    request: SimulationRequest,
+    db: DBSession = Depends(get_read_db),
+):
+    """
+    Simulate conversations with the agent generated from a session and
+    score them against its success criteria, constraints and edge cases.
+    The default fake provider runs offline.
+    """
+
+    db_session = db.query(Session).filter(Session.id == session_id).first()
+    if not db_session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Session {session_id} not found",
+        )
+
+    session_state = load_session_state(db_session)
+    if not session_state:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session state not found. Session may have expired.",
+        )
+
+    if not session_state.agent_type or not session_state.goals:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Session must have agent_type and goals to simulate",
+        )
+
+    try:
+        return await get_simulation_runner().run(session_state, request)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
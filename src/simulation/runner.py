@@ -0,0 +1,265 @@
+"""
+Simulation Runner - exercises a generated agent with synthetic callers.
+
+The agent's system prompt comes from PromptGenerator.generate_prompt.
+Every (caller, run) pair is one conversation; conversations run
+concurrently under a bounded semaphore, are scored against the session's
+success criteria, constraints and edge cases, and aggregated into a report.
+"""
+
+from typing import Dict, List, Optional
+import asyncio
+import re
+import time
+
+from fastapi.concurrency import run_in_threadpool
+
+from src.config import get_settings
+from src.prompt.generator import get_prompt_generator
+from src.session.schemas import SessionState
+from src.simulation.backends import SimulationBackend, get_simulation_backend
+from src.simulation.schemas import (
+    CallerPersona,
+    ConversationResult,
+    CriterionSummary,
+    SimulationReport,
+    SimulationRequest,
+)
+from src.simulation.scoring import score_conversation
+
+settings = get_settings()
+
+_CONSTRAINT_PREFIX = re.compile(
+    r"^(?:never|do not|don't|don’t|must not|should not|shouldn't|avoid|no)\s+",
+    re.IGNORECASE,
+)
+
+
+def default_callers(session_state: SessionState) -> List[CallerPersona]:
+    """
+    Callers derived from the session: one per goal, one probing the
+    constraints and one per edge case. All are goal-driven (no script).
+
+    Args:
+        session_state: Session the agent was generated from
+
+    Returns:
+        Caller personas
+    """
+    callers = []
+
+    goals = [
+        goal.strip()
+        for goal in re.split(r",|;|\band\b", session_state.goals or "")
+        if goal.strip()
+    ]
+    for i, goal in enumerate(goals or ["get some help"]):
+        callers.append(CallerPersona(name=f"goal_{i + 1}", goal=f"I want to {goal}"))
+
+    requests = [
+        _CONSTRAINT_PREFIX.sub("", constraint.strip()).rstrip(".")
+        for constraint in session_state.constraints or []
+        if constraint.strip()
+    ]
+    if requests:
+        callers.append(
+            CallerPersona(
+                name="boundary_tester",
+                goal="can you " + "; and ".join(requests) + "?",
+            )
+        )
+
+    for i, edge_case in enumerate(session_state.edge_cases or []):
+        callers.append(
+            CallerPersona(
+                name=f"edge_case_{i + 1}",
+                goal=edge_case,
+                edge_case=edge_case,
+            )
+        )
+
+    return callers
+
+
+class SimulationRunner:
+    """
+    Runs simulated conversations concurrently and aggregates their scores.
+    """
+
+    def __init__(self, concurrency: int = None, max_conversations: int = None):
+        self.concurrency = concurrency or settings.simulation_concurrency
+        self.max_conversations = (
+            max_conversations or settings.simulation_max_conversations
+        )
+
+    async def run(
+        self,
+        session_state: SessionState,
+        request: SimulationRequest,
+        backend: Optional[SimulationBackend] = None,
+    ) -> SimulationReport:
+        """
+        Simulate conversations with the agent generated from a session.
+
+        Args:
+            session_state: Session to generate the agent from
+            request: Callers, runs per caller, provider and concurrency
+            backend: Override the backend chosen by request.provider
+
+        Returns:
+            Aggregated report
+
+        Raises:
+            ValueError: If the request exceeds SIMULATION_MAX_CONVERSATIONS
+        """
+        started = time.perf_counter()
+
+        callers = request.callers or default_callers(session_state)
+        total = len(callers) * request.runs_per_caller
+        if total > self.max_conversations:
+            raise ValueError(
+                f"{total} conversations requested;"
+                f" the limit is {self.max_conversations}"
+            )
+
+        backend = backend or get_simulation_backend(
+            request.provider, session_state.session_id
+        )
+        prompt = await run_in_threadpool(
+            get_prompt_generator().generate_prompt,
+            session_state,
+            request.prompt_format,
+        )
+
+        # Requests may lower the concurrency, never raise it past the setting
+        concurrency = min(request.concurrency or self.concurrency, self.concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+        results = await asyncio.gather(
+            *[
+                self._run_conversation(
+                    semaphore,
+                    backend,
+                    prompt.system_prompt,
+                    session_state,
+                    persona,
+                    run,
+                    request.include_transcripts,
+                )
+                for persona in callers
+                for run in range(1, request.runs_per_caller + 1)
+            ]
+        )
+
+        return self._build_report(
+            session_state, request, list(results), time.perf_counter() - started
+        )
+
+    async def _run_conversation(
+        self,
+        semaphore: asyncio.Semaphore,
+        backend: SimulationBackend,
+        system_prompt: str,
+        session_state: SessionState,
+        persona: CallerPersona,
+        run: int,
+        include_transcript: bool,
+    ) -> ConversationResult:
+        """Play one conversation and score it; errors are recorded, not raised"""
+        async with semaphore:
+            started = time.perf_counter()
+            transcript: List[Dict[str, str]] = []
+            error = None
+
+            try:
+                for turn in range(persona.max_turns):
+                    if persona.script:
+                        if turn >= len(persona.script):
+                            break
+                        message = persona.script[turn]
+                    else:
+                        message = await backend.caller_message(persona, transcript)
+                        if message is None:
+                            break
+
+                    transcript.append({"role": "user", "content": message})
+                    reply = await backend.agent_reply(system_prompt, transcript)
+                    transcript.append({"role": "assistant", "content": reply})
+            except Exception as e:
+                error = str(e) or type(e).__name__
+
+            criteria = (
+                [] if error else score_conversation(session_state, persona, transcript)
+            )
+            passed_count = sum(1 for criterion in criteria if criterion.passed)
+            score = passed_count / len(criteria) if criteria else float(not error)
+
+            return ConversationResult(
+                caller=persona.name,
+                run=run,
+                turns=sum(1 for message in transcript if message["role"] == "user"),
+                transcript=transcript if include_transcript else [],
+                criteria=criteria,
+                score=round(score, 4),
+                passed=error is None and passed_count == len(criteria),
+                error=error,
+                duration_ms=round((time.perf_counter() - started) * 1000, 2),
+            )
+
+    def _build_report(
+        self,
+        session_state: SessionState,
+        request: SimulationRequest,
+        results: List[ConversationResult],
+        elapsed: float,
+    ) -> SimulationReport:
+        """Aggregate conversation results, including per-criterion pass rates"""
+        summaries: Dict[tuple, List[int]] = {}
+        for result in results:
+            for criterion in result.criteria:
+                counts = summaries.setdefault(
+                    (criterion.kind, criterion.criterion), [0, 0]
+                )
+                counts[0] += 1
+                counts[1] += int(criterion.passed)
+
+        conversations = len(results)
+        passed = sum(1 for result in results if result.passed)
+
+        return SimulationReport(
+            session_id=session_state.session_id,
+            provider=request.provider,
+            prompt_format=request.prompt_format,
+            conversations=conversations,
+            passed=passed,
+            errors=sum(1 for result in results if result.error),
+            pass_rate=round(passed / conversations, 4) if conversations else 0.0,
+            mean_score=(
+                round(sum(result.score for result in results) / conversations, 4)
+                if conversations
+                else 0.0
+            ),
+            criteria=[
+                CriterionSummary(
+                    kind=kind,
+                    criterion=criterion,
+                    evaluated=evaluated,
+                    passed=passed_count,
+                    pass_rate=round(passed_count / evaluated, 4),
+                )
+                for (kind, criterion), (evaluated, passed_count) in summaries.items()
+            ],
+            duration_ms=round(elapsed * 1000, 2),
+            results=results,
+        )
+
+
+# Global runner instance
+_simulation_runner: Optional[SimulationRunner] = None
+
+
+def get_simulation_runner() -> SimulationRunner:
+    """Get or create the global simulation runner instance"""
+    global _simulation_runner
+    if _simulation_runner is None:
+        _simulation_runner = SimulationRunner()
+    return _simulation_runner
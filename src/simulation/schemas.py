@@ -0,0 +1,110 @@
+"""
+Pydantic schemas for agent simulation runs.
+"""
+
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from enum import Enum
+
+from src.prompt.schemas import PromptFormat
+
+
+class SimulationProvider(str, Enum):
+    """Backend that plays the agent (and LLM-driven callers)"""
+
+    FAKE = "fake"  # Offline and deterministic
+    LLM = "llm"  # Configured OpenAI / Anthropic provider
+
+
+class CallerPersona(BaseModel):
+    """A synthetic caller"""
+
+    name: str = Field(description="Persona name, used to group results")
+    script: List[str] = Field(
+        default_factory=list,
+        description="Scripted caller messages; leave empty for an LLM-driven caller",
+    )
+    goal: Optional[str] = Field(
+        default=None, description="What an LLM-driven caller is trying to achieve"
+    )
+    edge_case: Optional[str] = Field(
+        default=None, description="Session edge case this caller exercises"
+    )
+    max_turns: int = Field(default=6, ge=1, le=50)
+
+
+class SimulationRequest(BaseModel):
+    """Request to simulate conversations with a generated agent"""
+
+    callers: Optional[List[CallerPersona]] = Field(
+        default=None,
+        description="Callers to simulate (default: derived from goals, constraints"
+        " and edge cases)",
+    )
+    runs_per_caller: int = Field(default=1, ge=1, le=100)
+    provider: SimulationProvider = Field(default=SimulationProvider.FAKE)
+    prompt_format: PromptFormat = Field(default=PromptFormat.GENERIC)
+    concurrency: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=500,
+        description="Conversations in flight at once (capped at SIMULATION_CONCURRENCY)",
+    )
+    include_transcripts: bool = Field(default=True)
+
+
+class CriterionKind(str, Enum):
+    """Where a criterion comes from in the session"""
+
+    SUCCESS = "success_criteria"
+    CONSTRAINT = "constraint"
+    EDGE_CASE = "edge_case"
+
+
+class CriterionResult(BaseModel):
+    """One criterion checked against one conversation"""
+
+    kind: CriterionKind
+    criterion: str
+    passed: bool
+    detail: Optional[str] = None
+
+
+class ConversationResult(BaseModel):
+    """Outcome of one simulated conversation"""
+
+    caller: str
+    run: int
+    turns: int
+    transcript: List[Dict[str, str]] = Field(default_factory=list)
+    criteria: List[CriterionResult] = Field(default_factory=list)
+    score: float = Field(description="Share of criteria passed (0-1)")
+    passed: bool
+    error: Optional[str] = None
+    duration_ms: float
+
+
+class CriterionSummary(BaseModel):
+    """Pass rate of one criterion across all conversations"""
+
+    kind: CriterionKind
+    criterion: str
+    evaluated: int
+    passed: int
+    pass_rate: float
+
+
+class SimulationReport(BaseModel):
+    """Aggregated simulation results"""
+
+    session_id: str
+    provider: SimulationProvider
+    prompt_format: PromptFormat
+    conversations: int
+    passed: int
+    errors: int
+    pass_rate: float
+    mean_score: float
+    criteria: List[CriterionSummary]
+    duration_ms: float
+    results: List[ConversationResult]
@@ -0,0 +1,134 @@
+"""
+Heuristic scoring of simulated conversations.
+
+Criteria come straight from the session: success criteria must be
+covered by the agent's replies, constraints ("what NOT to do") must not
+be acted on, and callers targeting an edge case must get an answer that
+addresses it. Checks are keyword based so they run offline and cheaply.
+"""
+
+from typing import Dict, List, Optional
+import re
+
+from src.search.similar import tokenize
+from src.session.schemas import SessionState
+from src.simulation.schemas import CallerPersona, CriterionKind, CriterionResult
+
+# Share of a success criterion's terms the agent must mention
+SUCCESS_COVERAGE = 0.5
+
+# Share of a constraint's terms in one affirmative agent sentence that
+# counts as acting on it
+VIOLATION_COVERAGE = 0.6
+
+# Tokens left over from negations ("don't" -> "don"), dropped from constraints
+NEGATIONS = {
+    "not", "never", "no", "don", "doesn", "won", "cannot", "avoid",
+    "without", "refuse", "shouldn", "mustn", "unable",
+}  # fmt: skip
+
+_NEGATION_PATTERN = re.compile(
+    r"\b(?:not|never|no|cannot|avoid|without|refuse|unable)\b|n't\b|n’t\b"
+)
+_CRITERIA_SPLIT = re.compile(r"[\n;]+|(?<=[.!?])\s+")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def split_criteria(text: Optional[str]) -> List[str]:
+    """Split free-text success criteria into individual checks"""
+    criteria = []
+    for part in _CRITERIA_SPLIT.split(text or ""):
+        part = part.strip().lstrip("-*•0123456789. ").strip()
+        if tokenize(part):
+            criteria.append(part)
+    return criteria
+
+
+def _strip_negations(text: str) -> set:
+    return set(tokenize(text)) - NEGATIONS
+
+
+def score_conversation(
+    session_state: SessionState,
+    persona: CallerPersona,
+    transcript: List[Dict[str, str]],
+) -> List[CriterionResult]:
+    """
+    Check a conversation against the session's criteria.
+
+    Args:
+        session_state: Session the agent was generated from
+        persona: Caller that was simulated
+        transcript: Conversation (role/content dicts)
+
+    Returns:
+        One result per applicable criterion
+    """
+    replies = [m["content"] for m in transcript if m["role"] == "assistant"]
+    sentences = [
+        sentence
+        for reply in replies
+        for sentence in _SENTENCE_SPLIT.split(reply)
+        if sentence.strip()
+    ]
+    # Negated sentences ("Never share...") restate a rule rather than act on it
+    affirmative = [
+        (sentence, set(tokenize(sentence)))
+        for sentence in sentences
+        if not _NEGATION_PATTERN.search(sentence.lower())
+    ]
+    reply_terms = set()
+    for sentence in sentences:
+        reply_terms.update(tokenize(sentence))
+
+    results: List[CriterionResult] = []
+
+    for criterion in split_criteria(session_state.success_criteria):
+        terms = set(tokenize(criterion))
+        coverage = len(terms & reply_terms) / len(terms)
+        results.append(
+            CriterionResult(
+                kind=CriterionKind.SUCCESS,
+                criterion=criterion,
+                passed=coverage >= SUCCESS_COVERAGE,
+                detail=f"{coverage:.0%} of key terms covered",
+            )
+        )
+
+    for constraint in session_state.constraints or []:
+        terms = _strip_negations(constraint)
+        if not terms:
+            continue
+        violation = next(
+            (
+                sentence
+                for sentence, sentence_terms in affirmative
+                if len(terms & sentence_terms) / len(terms) >= VIOLATION_COVERAGE
+            ),
+            None,
+        )
+        results.append(
+            CriterionResult(
+                kind=CriterionKind.CONSTRAINT,
+                criterion=constraint,
+                passed=violation is None,
+                detail=f"Possible violation: {violation[:120]}" if violation else None,
+            )
+        )
+
+    if persona.edge_case:
+        caller_turns = sum(1 for m in transcript if m["role"] == "user")
+        answered = len([reply for reply in replies if reply.strip()]) >= caller_turns
+        terms = set(tokenize(persona.edge_case))
+        escalation = set(tokenize(session_state.escalation_rules))
+        addressed = bool(terms & reply_terms) or bool(escalation & reply_terms)
+        results.append(
+            CriterionResult(
+                kind=CriterionKind.EDGE_CASE,
+                criterion=persona.edge_case,
+                passed=answered and addressed,
+                detail=None if answered else "Agent left caller turns unanswered",
+            )
+        )
+
+    return results
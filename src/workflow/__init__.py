@@ -1,5 +1,8 @@
 from src.workflow.synthesizer import WorkflowSynthesizer, get_synthesizer
 from src.workflow.schemas import WorkflowData, WorkflowNode, WorkflowEdge
+from src.workflow.graph import WorkflowGraph
+from src.workflow.runtime import CompiledWorkflow, compile_workflow
+from src.workflow.validator import validate_workflow
 
 __all__ = [
     "WorkflowSynthesizer",
@@ -7,4 +10,8 @@ __all__ = [
     "WorkflowData",
     "WorkflowNode",
     "WorkflowEdge",
+    "WorkflowGraph",
+    "CompiledWorkflow",
+    "compile_workflow",
+    "validate_workflow",
 ]
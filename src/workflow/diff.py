@@ -0,0 +1,154 @@
+"""
+Workflow Diff - Structural differences between workflow versions.
+
+diff_workflows() compares two WorkflowData graphs node by node (keyed by
+id) and edge by edge (keyed by content), and apply_diff() replays the
+result onto the older graph. Node positions are tracked apart from node
+content, so a layout shift does not mark a node as changed.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+from src.workflow.schemas import (
+    IndexedEdge,
+    IndexedNode,
+    WorkflowData,
+    WorkflowDiff,
+    WorkflowEdge,
+    WorkflowNode,
+)
+
+# Top-level fields compared between versions (version is managed on save)
+DIFF_FIELDS = ("agent_type", "goals", "tone", "use_tools", "tools", "description")
+
+
+def _node_content(node: WorkflowNode) -> Dict[str, Any]:
+    return node.model_dump(mode="json", exclude={"position"})
+
+
+def _edge_key(edge: WorkflowEdge) -> Tuple:
+    return (edge.source, edge.target, edge.label, edge.condition)
+
+
+def diff_workflows(old: WorkflowData, new: WorkflowData) -> WorkflowDiff:
+    """
+    Compute the changes that turn one workflow into another.
+
+    Args:
+        old: Stored workflow
+        new: Freshly synthesized workflow
+
+    Returns:
+        Diff (empty if the graphs are identical)
+    """
+    diff = WorkflowDiff()
+
+    for field in DIFF_FIELDS:
+        if getattr(old, field) != getattr(new, field):
+            diff.fields[field] = getattr(new, field)
+
+    # Nodes, by id
+    old_nodes = {node.id: node for node in old.nodes}
+    new_ids = {node.id for node in new.nodes}
+
+    diff.removed_nodes = [node.id for node in old.nodes if node.id not in new_ids]
+    for index, node in enumerate(new.nodes):
+        previous = old_nodes.get(node.id)
+        if previous is None:
+            diff.added_nodes.append(IndexedNode(index=index, node=node))
+            continue
+        if _node_content(previous) != _node_content(node):
+            diff.changed_nodes.append(node)
+        elif previous.position != node.position:
+            diff.moved_nodes[node.id] = node.position
+
+    kept_old = [node.id for node in old.nodes if node.id in new_ids]
+    kept_new = [node.id for node in new.nodes if node.id in old_nodes]
+    if kept_old != kept_new:
+        diff.node_order = [node.id for node in new.nodes]
+
+    # Edges, by content (a relabelled edge is a removal plus an addition)
+    new_counts: Dict[Tuple, int] = {}
+    for edge in new.edges:
+        key = _edge_key(edge)
+        new_counts[key] = new_counts.get(key, 0) + 1
+
+    kept_edges: List[Tuple] = []
+    for index, edge in enumerate(old.edges):
+        key = _edge_key(edge)
+        if new_counts.get(key, 0) > 0:
+            new_counts[key] -= 1
+            kept_edges.append(key)
+        else:
+            diff.removed_edges.append(index)
+
+    old_counts: Dict[Tuple, int] = {}
+    for key in kept_edges:
+        old_counts[key] = old_counts.get(key, 0) + 1
+
+    kept_in_new: List[Tuple] = []
+    for index, edge in enumerate(new.edges):
+        key = _edge_key(edge)
+        if old_counts.get(key, 0) > 0:
+            old_counts[key] -= 1
+            kept_in_new.append(key)
+        else:
+            diff.added_edges.append(IndexedEdge(index=index, edge=edge))
+
+    if kept_edges != kept_in_new:
+        diff.edges = list(new.edges)
+        diff.removed_edges = []
+        diff.added_edges = []
+
+    return diff
+
+
+def apply_diff(workflow: WorkflowData, diff: WorkflowDiff) -> WorkflowData:
+    """
+    Apply a diff to a workflow. Untouched nodes and edges are reused.
+
+    Args:
+        workflow: Version the diff was computed against
+        diff: Changes to apply
+
+    Returns:
+        New workflow (the input is not modified)
+    """
+    result = workflow.model_copy(update=diff.fields)
+
+    # Nodes
+    removed = set(diff.removed_nodes)
+    changed = {node.id: node for node in diff.changed_nodes}
+    nodes = []
+    for node in workflow.nodes:
+        if node.id in removed:
+            continue
+        node = changed.get(node.id, node)
+        if node.id in diff.moved_nodes:
+            node = node.model_copy(update={"position": diff.moved_nodes[node.id]})
+        nodes.append(node)
+
+    if diff.node_order is not None:
+        by_id = {node.id: node for node in nodes}
+        by_id.update({item.node.id: item.node for item in diff.added_nodes})
+        nodes = [by_id[node_id] for node_id in diff.node_order]
+    else:
+        for item in sorted(diff.added_nodes, key=lambda item: item.index):
+            nodes.insert(item.index, item.node)
+    result.nodes = nodes
+
+    # Edges
+    if diff.edges is not None:
+        result.edges = list(diff.edges)
+    else:
+        removed_edges = set(diff.removed_edges)
+        edges = [
+            edge
+            for index, edge in enumerate(workflow.edges)
+            if index not in removed_edges
+        ]
+        for item in sorted(diff.added_edges, key=lambda item: item.index):
+            edges.insert(item.index, item.edge)
+        result.edges = edges
+
+    return result
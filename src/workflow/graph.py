@@ -0,0 +1,251 @@
+"""
+Workflow Graph - Compact in-memory representation of a workflow graph.
+
+Nodes and edges are `__slots__` records, node ids are interned and
+mapped to integer indices, edge endpoints are kept as integer arrays and
+adjacency is stored in CSR form (an offsets array plus a flat array of
+neighbour indices, built once on first use). The synthesizer, layout and
+validator work on this structure; pydantic WorkflowNode/WorkflowEdge
+models are only built (or read) at the API boundary.
+"""
+
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+import sys
+
+from src.workflow.schemas import NodeType, WorkflowData, WorkflowEdge, WorkflowNode
+
+# Index of an edge endpoint that names no node
+UNKNOWN_NODE = -1
+
+
+class NodeRecord:
+    """A workflow node (same attributes as WorkflowNode)"""
+
+    __slots__ = ("id", "type", "label", "description", "config", "position")
+
+    def __init__(
+        self,
+        id: str,
+        type: NodeType,
+        label: str,
+        description: Optional[str] = None,
+        config: Optional[Dict[str, Any]] = None,
+        position: Optional[Dict[str, int]] = None,
+    ):
+        self.id = sys.intern(id)
+        self.type = type
+        self.label = label
+        self.description = description
+        self.config = config if config is not None else {}
+        self.position = position
+
+
+class EdgeRecord:
+    """A workflow edge (same attributes as WorkflowEdge)"""
+
+    __slots__ = ("source", "target", "label", "condition")
+
+    def __init__(
+        self,
+        source: str,
+        target: str,
+        label: Optional[str] = None,
+        condition: Optional[str] = None,
+    ):
+        self.source = sys.intern(source)
+        self.target = sys.intern(target)
+        self.label = label
+        self.condition = condition
+
+
+def _csr(count: int, sources: array, targets: array) -> Tuple[array, array]:
+    """Offsets and flat neighbour indices of the edges, grouped by source"""
+    offsets = array("l", bytes(array("l").itemsize * (count + 1)))
+    for source, target in zip(sources, targets):
+        if source != UNKNOWN_NODE and target != UNKNOWN_NODE:
+            offsets[source + 1] += 1
+    for i in range(count):
+        offsets[i + 1] += offsets[i]
+
+    neighbours = array("l", bytes(array("l").itemsize * offsets[count]))
+    cursor = array("l", offsets[:count])
+    for source, target in zip(sources, targets):
+        if source != UNKNOWN_NODE and target != UNKNOWN_NODE:
+            neighbours[cursor[source]] = target
+            cursor[source] += 1
+    return offsets, neighbours
+
+
+class WorkflowGraph:
+    """
+    Array-backed workflow graph.
+
+    Node i is nodes[i]; a node id that repeats an earlier one is recorded
+    in duplicate_ids and not added again. Edges keep their order; an edge
+    whose endpoint is not a node has UNKNOWN_NODE as that endpoint's index.
+    """
+
+    __slots__ = (
+        "nodes",
+        "edges",
+        "index",
+        "duplicate_ids",
+        "_edge_sources",
+        "_edge_targets",
+        "_out",
+        "_in",
+    )
+
+    def __init__(self):
+        self.nodes: List[NodeRecord] = []
+        self.edges: List[EdgeRecord] = []
+        self.index: Dict[str, int] = {}
+        self.duplicate_ids: List[str] = []
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        self._edge_sources: Optional[array] = None
+        self._edge_targets: Optional[array] = None
+        self._out: Optional[Tuple[array, array]] = None
+        self._in: Optional[Tuple[array, array]] = None
+
+    # Building
+
+    def add_node(
+        self,
+        id: str,
+        type: NodeType,
+        label: str,
+        description: Optional[str] = None,
+        config: Optional[Dict[str, Any]] = None,
+        position: Optional[Dict[str, int]] = None,
+    ) -> int:
+        """
+        Add a node.
+
+        Returns:
+            Index of the node (of the earlier node, for a duplicate id)
+        """
+        if id in self.index:
+            self.duplicate_ids.append(id)
+            return self.index[id]
+        record = NodeRecord(id, type, label, description, config, position)
+        self.index[record.id] = len(self.nodes)
+        self.nodes.append(record)
+        self._invalidate()
+        return len(self.nodes) - 1
+
+    def add_edge(
+        self,
+        source: str,
+        target: str,
+        label: Optional[str] = None,
+        condition: Optional[str] = None,
+    ) -> None:
+        """Add an edge; its endpoints may be added later"""
+        self.edges.append(EdgeRecord(source, target, label, condition))
+        self._invalidate()
+
+    @classmethod
+    def from_workflow(cls, workflow: WorkflowData) -> "WorkflowGraph":
+        """Build the graph of a workflow's nodes and edges"""
+        graph = cls()
+        for node in workflow.nodes:
+            graph.add_node(
+                node.id,
+                node.type,
+                node.label,
+                node.description,
+                node.config,
+                node.position,
+            )
+        for edge in workflow.edges:
+            graph.add_edge(edge.source, edge.target, edge.label, edge.condition)
+        return graph
+
+    def to_models(self) -> Tuple[List[WorkflowNode], List[WorkflowEdge]]:
+        """
+        Pydantic nodes and edges for the API boundary.
+
+        Records were typed when built, so the models are constructed
+        without re-validation.
+        """
+        nodes = [
+            WorkflowNode.model_construct(
+                id=node.id,
+                type=node.type,
+                label=node.label,
+                description=node.description,
+                config=node.config,
+                position=node.position,
+            )
+            for node in self.nodes
+        ]
+        edges = [
+            WorkflowEdge.model_construct(
+                source=edge.source,
+                target=edge.target,
+                label=edge.label,
+                condition=edge.condition,
+            )
+            for edge in self.edges
+        ]
+        return nodes, edges
+
+    # Structure
+
+    @property
+    def node_count(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edges)
+
+    def _resolve_edges(self) -> None:
+        if self._edge_sources is None:
+            get = self.index.get
+            self._edge_sources = array(
+                "l", [get(edge.source, UNKNOWN_NODE) for edge in self.edges]
+            )
+            self._edge_targets = array(
+                "l", [get(edge.target, UNKNOWN_NODE) for edge in self.edges]
+            )
+
+    @property
+    def edge_sources(self) -> array:
+        """Source node index per edge (UNKNOWN_NODE if not a node)"""
+        self._resolve_edges()
+        return self._edge_sources
+
+    @property
+    def edge_targets(self) -> array:
+        """Target node index per edge (UNKNOWN_NODE if not a node)"""
+        self._resolve_edges()
+        return self._edge_targets
+
+    @property
+    def out_edges(self) -> Tuple[array, array]:
+        """CSR (offsets, targets); successors of i: targets[offsets[i]:offsets[i+1]]"""
+        if self._out is None:
+            self._out = _csr(len(self.nodes), self.edge_sources, self.edge_targets)
+        return self._out
+
+    @property
+    def in_edges(self) -> Tuple[array, array]:
+        """CSR (offsets, sources): predecessors of i, as for out_edges"""
+        if self._in is None:
+            self._in = _csr(len(self.nodes), self.edge_targets, self.edge_sources)
+        return self._in
+
+    def successors(self, node: int) -> array:
+        offsets, targets = self.out_edges
+        return targets[offsets[node] : offsets[node + 1]]
+
+    def predecessors(self, node: int) -> array:
+        offsets, sources = self.in_edges
+        return sources[offsets[node] : offsets[node + 1]]
+
+    def nodes_of_type(self, node_type: NodeType) -> List[int]:
+        return [i for i, node in enumerate(self.nodes) if node.type == node_type]
@@ -0,0 +1,164 @@
+"""
+Intent Taxonomy - Maps phrases in free text to caller intents.
+
+The taxonomy (intent -> synonyms) is loaded from a JSON data file,
+intents.json next to this module unless WORKFLOW_INTENTS_PATH points
+elsewhere. All synonyms are compiled once into a single regex shaped like
+a trie (shared prefixes are merged). At each position the regex engine
+still tries a level's branches in turn, but a branch fails on its first
+character, so the cost grows with the trie's fan-out rather than with the
+number of synonyms, and only slightly as the taxonomy grows.
+
+Synonyms match whole words, case-insensitively, with simple inflections
+("book" also matches "books", "booked" and "booking").
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+import json
+import re
+
+from src.config import get_settings
+
+settings = get_settings()
+
+DEFAULT_INTENT = "general_inquiry"
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).with_name("intents.json")
+
+# Inflections accepted after a synonym
+_SUFFIXES = r"(?:s|es|d|ed|ing|ings)?"
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().replace("’", "'").split())
+
+
+def _trie_pattern(phrases: Iterable[str]) -> str:
+    """Regex alternation of phrases, factored into a trie"""
+    trie: Dict[str, dict] = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End of a phrase
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # A phrase ends here; longer phrases are optional
+            return f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+
+class IntentTaxonomy:
+    """
+    Intents and their synonyms, compiled for single-pass matching.
+    """
+
+    def __init__(
+        self,
+        intents: Dict[str, Sequence[str]],
+        default_intent: str = DEFAULT_INTENT,
+    ):
+        """
+        Args:
+            intents: Intent name -> synonyms, in priority order
+            default_intent: Intent used when nothing matches
+        """
+        self.default_intent = default_intent
+        self.intents = list(intents)
+        self._rank = {intent: rank for rank, intent in enumerate(self.intents)}
+
+        # Synonym -> intents (a synonym may signal several)
+        self._phrases: Dict[str, List[str]] = {}
+        for intent, synonyms in intents.items():
+            for synonym in synonyms:
+                phrase = _normalize(synonym)
+                if phrase:
+                    self._phrases.setdefault(phrase, []).append(intent)
+
+        self._pattern: Optional[re.Pattern] = None
+        if self._phrases:
+            self._pattern = re.compile(
+                rf"(?<!\w)({_trie_pattern(self._phrases)}){_SUFFIXES}(?!\w)"
+            )
+
+    def find(self, text: Optional[str]) -> set:
+        """Intents signalled anywhere in a text"""
+        found = set()
+        if not text or self._pattern is None:
+            return found
+        for match in self._pattern.finditer(_normalize(text)):
+            found.update(self._phrases[" ".join(match.group(1).split())])
+        return found
+
+    def extract(self, texts: Iterable[Optional[str]]) -> List[str]:
+        """
+        Intents signalled in any of the texts, in taxonomy order.
+
+        Args:
+            texts: Texts to scan (None entries are skipped)
+
+        Returns:
+            Matching intents, or [default_intent] if none match
+        """
+        # Scanned one by one so a phrase cannot span two texts
+        found = set()
+        for text in texts:
+            found |= self.find(text)
+        if not found:
+            return [self.default_intent]
+        return sorted(found, key=self._rank.__getitem__)
+
+
+def load_intent_taxonomy(path: Optional[str] = None) -> IntentTaxonomy:
+    """
+    Load an intent taxonomy from a JSON file.
+
+    The file holds {"default_intent": ..., "intents": {name: [synonyms]}}.
+
+    Args:
+        path: File to load (defaults to the bundled intents.json)
+
+    Returns:
+        Compiled taxonomy
+
+    Raises:
+        ValueError: If the file is not a valid taxonomy
+    """
+    path = Path(path) if path else DEFAULT_TAXONOMY_PATH
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    intents = data.get("intents") if isinstance(data, dict) else None
+    if not isinstance(intents, dict) or not all(
+        isinstance(synonyms, list) and all(isinstance(s, str) for s in synonyms)
+        for synonyms in intents.values()
+    ):
+        raise ValueError(
+            f"{path}: 'intents' must map intent names to lists of synonyms"
+        )
+
+    return IntentTaxonomy(intents, data.get("default_intent") or DEFAULT_INTENT)
+
+
+# Global taxonomy instance
+_intent_taxonomy: Optional[IntentTaxonomy] = None
+
+
+def get_intent_taxonomy() -> IntentTaxonomy:
+    """Get or load the global intent taxonomy"""
+    global _intent_taxonomy
+    if _intent_taxonomy is None:
+        _intent_taxonomy = load_intent_taxonomy(settings.workflow_intents_path)
+    return _intent_taxonomy
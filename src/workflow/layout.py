@@ -0,0 +1,260 @@
+"""
+Workflow Layout - Layered (Sugiyama-style) positions for workflow nodes.
+
+1. Cycle removal: back-edges found by a DFS from the start node (such as
+   continue_check -> intent_detection) are reversed.
+2. Layering: longest path from the sources over the resulting DAG.
+3. Ordering: one downward and one upward barycenter sweep to reduce
+   edge crossings.
+4. Coordinates: layers wider than the grid width wrap onto extra rows, so
+   many tools form a grid instead of one very wide row.
+
+Every step is linear except the per-layer sorts, so a layout costs
+O((V + E) log V). Long edges are not split with dummy nodes; renderers
+route them. Layouts are computed on the CSR adjacency of a WorkflowGraph
+and cached by a fingerprint of the graph structure.
+"""
+
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+import threading
+
+from src.workflow.graph import WorkflowGraph
+from src.workflow.schemas import NodeType, WorkflowData
+
+# Spacing between node centres, in diagram units
+X_SPACING = 200
+Y_SPACING = 100
+MARGIN = 100
+
+# Maximum nodes side by side before a layer wraps onto another row
+GRID_COLUMNS = 6
+
+LAYOUT_CACHE_SIZE = 256
+
+Position = Dict[str, int]
+
+
+def workflow_fingerprint(workflow: WorkflowData) -> str:
+    """Hash of the graph structure (node ids and types, edges) only"""
+    return graph_fingerprint(WorkflowGraph.from_workflow(workflow))
+
+
+def graph_fingerprint(graph: WorkflowGraph) -> str:
+    """Hash of the graph structure (node ids and types, edges) only"""
+    digest = hashlib.sha1()
+    digest.update(
+        json.dumps([[node.id, node.type.value] for node in graph.nodes]).encode()
+    )
+    digest.update(graph.edge_sources.tobytes())
+    digest.update(graph.edge_targets.tobytes())
+    return digest.hexdigest()
+
+
+def _remove_cycles(
+    offsets: array, targets: array, roots: List[int]
+) -> List[Tuple[int, int]]:
+    """
+    Edges of the graph with DFS back-edges reversed.
+
+    Args:
+        offsets: CSR offsets (successors of n: targets[offsets[n]:offsets[n+1]])
+        targets: CSR successor indices
+        roots: Nodes to start the DFS from (start node first)
+
+    Returns:
+        Edges of an acyclic graph as (source, target) index pairs
+    """
+    UNVISITED, ON_STACK, DONE = 0, 1, 2
+    node_count = len(offsets) - 1
+    state = [UNVISITED] * node_count
+    edges: List[Tuple[int, int]] = []
+
+    for root in roots + list(range(node_count)):
+        if state[root] != UNVISITED:
+            continue
+        state[root] = ON_STACK
+        stack = [(root, offsets[root])]
+        while stack:
+            node, position = stack[-1]
+            if position == offsets[node + 1]:
+                stack.pop()
+                state[node] = DONE
+                continue
+            stack[-1] = (node, position + 1)
+            target = targets[position]
+            if target == node:
+                continue  # Self-loops do not affect layering
+            if state[target] == ON_STACK:
+                edges.append((target, node))  # Back-edge: reverse it
+                continue
+            edges.append((node, target))
+            if state[target] == UNVISITED:
+                state[target] = ON_STACK
+                stack.append((target, offsets[target]))
+
+    return edges
+
+
+def _assign_layers(node_count: int, edges: List[Tuple[int, int]]) -> List[int]:
+    """Longest-path layering of a DAG in topological (Kahn) order"""
+    successors: List[List[int]] = [[] for _ in range(node_count)]
+    in_degree = [0] * node_count
+    for source, target in edges:
+        successors[source].append(target)
+        in_degree[target] += 1
+
+    layer = [0] * node_count
+    queue = [node for node in range(node_count) if in_degree[node] == 0]
+    head = 0
+    while head < len(queue):
+        node = queue[head]
+        head += 1
+        for target in successors[node]:
+            layer[target] = max(layer[target], layer[node] + 1)
+            in_degree[target] -= 1
+            if in_degree[target] == 0:
+                queue.append(target)
+
+    return layer
+
+
+def _order_layers(layer: List[int], edges: List[Tuple[int, int]]) -> List[List[int]]:
+    """Order nodes within layers by barycenter sweeps (down, then up)"""
+    layer_count = max(layer) + 1 if layer else 0
+    layers: List[List[int]] = [[] for _ in range(layer_count)]
+    for node, index in enumerate(layer):
+        layers[index].append(node)
+
+    predecessors: List[List[int]] = [[] for _ in layer]
+    successors: List[List[int]] = [[] for _ in layer]
+    for source, target in edges:
+        predecessors[target].append(source)
+        successors[source].append(target)
+
+    order = [0] * len(layer)
+    for nodes in layers:
+        for position, node in enumerate(nodes):
+            order[node] = position
+
+    def sweep(layer_indices, neighbours):
+        for index in layer_indices:
+            nodes = layers[index]
+
+            def barycenter(node):
+                linked = neighbours[node]
+                if not linked:
+                    return (order[node], order[node])
+                return (sum(order[n] for n in linked) / len(linked), order[node])
+
+            nodes.sort(key=barycenter)
+            for position, node in enumerate(nodes):
+                order[node] = position
+
+    sweep(range(1, layer_count), predecessors)
+    sweep(range(layer_count - 2, -1, -1), successors)
+    return layers
+
+
+class LayoutEngine:
+    """
+    Computes and caches layered layouts.
+    """
+
+    def __init__(self, cache_size: int = LAYOUT_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Dict[str, Position]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def layout(self, workflow: WorkflowData) -> Dict[str, Position]:
+        """
+        Positions for every node of a workflow.
+
+        Args:
+            workflow: Workflow graph
+
+        Returns:
+            Node ID -> {"x": ..., "y": ...}
+        """
+        return self.layout_graph(WorkflowGraph.from_workflow(workflow))
+
+    def layout_graph(self, graph: WorkflowGraph) -> Dict[str, Position]:
+        """Positions for every node of a compact graph (see layout)"""
+        fingerprint = graph_fingerprint(graph)
+        with self._lock:
+            cached = self._cache.get(fingerprint)
+            if cached is not None:
+                self._cache.move_to_end(fingerprint)
+                return cached
+
+        positions = self._compute(graph)
+
+        with self._lock:
+            self._cache[fingerprint] = positions
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return positions
+
+    def apply(self, workflow: WorkflowData) -> WorkflowData:
+        """Set node positions on a workflow in place (and return it)"""
+        positions = self.layout(workflow)
+        for node in workflow.nodes:
+            position = positions.get(node.id)
+            node.position = dict(position) if position else None
+        return workflow
+
+    def apply_graph(self, graph: WorkflowGraph) -> WorkflowGraph:
+        """Set node positions on a compact graph in place (and return it)"""
+        positions = self.layout_graph(graph)
+        for node in graph.nodes:
+            position = positions.get(node.id)
+            node.position = dict(position) if position else None
+        return graph
+
+    def _compute(self, graph: WorkflowGraph) -> Dict[str, Position]:
+        ids = [node.id for node in graph.nodes]
+        if not ids:
+            return {}
+
+        # Edges to unknown nodes are not in the CSR adjacency
+        offsets, targets = graph.out_edges
+        roots = graph.nodes_of_type(NodeType.START)
+        edges = _remove_cycles(offsets, targets, roots)
+        layers = _order_layers(_assign_layers(len(ids), edges), edges)
+
+        width = min(max(len(nodes) for nodes in layers), GRID_COLUMNS)
+        positions: Dict[str, Position] = {}
+        row = 0
+        for nodes in layers:
+            for start in range(0, len(nodes), GRID_COLUMNS):
+                chunk = nodes[start : start + GRID_COLUMNS]
+                # Centre each row under the widest one
+                offset = (width - len(chunk)) * X_SPACING // 2
+                for column, node in enumerate(chunk):
+                    positions[ids[node]] = {
+                        "x": MARGIN + offset + column * X_SPACING,
+                        "y": MARGIN // 2 + row * Y_SPACING,
+                    }
+                row += 1
+
+        return positions
+
+    def clear(self) -> None:
+        """Drop all cached layouts"""
+        with self._lock:
+            self._cache.clear()
+
+
+# Global layout engine instance
+_layout_engine: Optional[LayoutEngine] = None
+
+
+def get_layout_engine() -> LayoutEngine:
+    """Get or create the global layout engine instance"""
+    global _layout_engine
+    if _layout_engine is None:
+        _layout_engine = LayoutEngine()
+    return _layout_engine
@@ -2,9 +2,20 @@
 Database models for workflow storage.
 """
 
-from sqlalchemy import Column, String, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import (
+    Column,
+    String,
+    DateTime,
+    Text,
+    Boolean,
+    ForeignKey,
+    Index,
+    Integer,
+    UniqueConstraint,
+    text,
+)
 from sqlalchemy.sql import func
-from src.database import Base
+from src.database import Base, JSONType
 
 
 class Workflow(Base):
@@ -14,9 +25,20 @@ class Workflow(Base):
     """
 
     __tablename__ = "workflows"
+    __table_args__ = (
+        # One workflow per session; ON CONFLICT target for workflow upserts
+        UniqueConstraint("session_id", name="uq_workflows_session_id"),
+        # "Workflows that call tool X": jsonb containment on the node array
+        Index(
+            "ix_workflows_nodes",
+            text("(workflow_json -> 'nodes') jsonb_path_ops"),
+            postgresql_using="gin",
+            postgresql_where=text("use_tools"),
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(String, primary_key=True, index=True)
-    session_id = Column(String, ForeignKey("sessions.id"), unique=True, nullable=False)
+    session_id = Column(String, ForeignKey("sessions.id"), nullable=False)
 
     # Agent configuration
     agent_type = Column(String, nullable=False)
@@ -25,12 +47,13 @@ class Workflow(Base):
     use_tools = Column(Boolean, default=False, nullable=False)
 
     # Workflow data (JSON)
-    workflow_json = Column(Text, nullable=False)  # Full WorkflowData as JSON
+    workflow_json = Column(JSONType, nullable=False)  # Full WorkflowData
     mermaid_diagram = Column(Text, nullable=True)  # Mermaid visualization
 
     # Status
     is_approved = Column(Boolean, default=False, nullable=False)
     version = Column(String, default="1.0", nullable=False)
+    approved_version = Column(Integer, nullable=True)  # Version the approval is for
 
     # Timestamps
     created_at = Column(
@@ -46,3 +69,36 @@ class Workflow(Base):
 
     def __repr__(self):
         return f"<Workflow(id={self.id}, session_id={self.session_id}, agent_type={self.agent_type})>"
+
+
+class WorkflowVersion(Base):
+    """
+    Append-only history of a workflow.
+    Each row stores the structural delta (WorkflowDiff) from the previous version;
+    periodic rows also store a full snapshot to replay deltas from.
+    """
+
+    __tablename__ = "workflow_versions"
+    __table_args__ = (
+        UniqueConstraint(
+            "workflow_id", "version", name="uq_workflow_versions_workflow_version"
+        ),
+    )
+
+    id = Column(String, primary_key=True)
+    workflow_id = Column(String, ForeignKey("workflows.id"), nullable=False)
+    version = Column(Integer, nullable=False)
+
+    # Changes from version - 1
+    delta = Column(JSONType, nullable=True)
+    # Full WorkflowData at this version (periodic; NULL otherwise)
+    snapshot = Column(JSONType, nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self):
+        return (
+            f"<WorkflowVersion(workflow_id={self.workflow_id}, version={self.version})>"
+        )
@@ -0,0 +1,180 @@
+"""
+Query and write helpers for stored workflows.
+"""
+
+from datetime import datetime
+from typing import List, Optional, Tuple
+import json
+import uuid
+
+from sqlalchemy import and_, func, literal, select, text
+from sqlalchemy.orm import Session as DBSession
+
+from src.database import upsert
+from src.session.schemas import SessionState
+from src.workflow.models import Workflow
+from src.workflow.schemas import WorkflowData, WorkflowDiff
+from src.workflow.synthesizer import get_synthesizer
+from src.workflow.versions import append_version
+from src.workflow.visualizer import generate_mermaid_diagram
+
+# Columns refreshed when a workflow is regenerated
+WORKFLOW_CONTENT_COLUMNS = [
+    "agent_type",
+    "goals",
+    "tone",
+    "use_tools",
+    "workflow_json",
+    "mermaid_diagram",
+    "is_approved",
+    "updated_at",
+]
+
+
+def workflow_values(
+    session_id: str, workflow_data: WorkflowData, mermaid_diagram: str
+) -> dict:
+    """
+    Column values for a new workflow row.
+
+    Args:
+        session_id: Session the workflow belongs to
+        workflow_data: Synthesized workflow
+        mermaid_diagram: Rendered Mermaid diagram
+
+    Returns:
+        Workflow column name -> value
+    """
+    return {
+        "id": str(uuid.uuid4()),
+        "session_id": session_id,
+        "agent_type": workflow_data.agent_type,
+        "goals": workflow_data.goals,
+        "tone": workflow_data.tone,
+        "use_tools": workflow_data.use_tools,
+        "workflow_json": workflow_data.model_dump(mode="json"),
+        "mermaid_diagram": mermaid_diagram,
+        "is_approved": False,
+        "updated_at": datetime.utcnow(),
+    }
+
+
+def save_workflow(
+    db: DBSession,
+    session_id: str,
+    workflow_data: WorkflowData,
+    mermaid_diagram: str,
+    replace: bool = False,
+) -> bool:
+    """
+    Store a session's workflow with a single upsert on session_id.
+
+    Args:
+        db: Database session (not committed)
+        session_id: Session the workflow belongs to
+        workflow_data: Synthesized workflow
+        mermaid_diagram: Rendered Mermaid diagram
+        replace: Overwrite (and unapprove) an existing workflow instead of keeping it
+
+    Returns:
+        True if the workflow was written
+    """
+    return upsert(
+        db,
+        Workflow,
+        workflow_values(session_id, workflow_data, mermaid_diagram),
+        conflict_columns=["session_id"],
+        update_columns=WORKFLOW_CONTENT_COLUMNS if replace else None,
+    )
+
+
+def resynthesize_workflow(
+    db: DBSession, session_id: str, session_state: SessionState
+) -> Tuple[Workflow, WorkflowData, Optional[WorkflowDiff]]:
+    """
+    Bring a session's stored workflow up to date with its state.
+
+    A missing workflow is synthesized and created. Otherwise only the
+    structural changes are applied as a new version (see
+    versions.append_version). An unchanged workflow is not written.
+
+    Args:
+        db: Database session (not committed)
+        session_id: Session the workflow belongs to
+        session_state: Current session state
+
+    Returns:
+        Tuple of (workflow row, workflow data, diff or None if just created)
+    """
+    synthesizer = get_synthesizer()
+    workflow = (
+        db.query(Workflow)
+        .filter(Workflow.session_id == session_id)
+        .with_for_update()
+        .first()
+    )
+
+    if workflow is None:
+        workflow_data = synthesizer.synthesize(session_state)
+        save_workflow(
+            db, session_id, workflow_data, generate_mermaid_diagram(workflow_data)
+        )
+        # A concurrent request may have created it first
+        workflow = db.query(Workflow).filter(Workflow.session_id == session_id).one()
+        return workflow, WorkflowData(**workflow.workflow_json), None
+
+    previous = WorkflowData(**workflow.workflow_json)
+    workflow_data, diff = synthesizer.resynthesize(session_state, previous)
+    if diff.is_empty():
+        return workflow, previous, diff
+
+    append_version(db, workflow, previous, workflow_data, diff)
+    return workflow, workflow_data, diff
+
+
+def calls_tool(tool_name: str, dialect: str):
+    """
+    Filter clause matching workflows with a tool-call node for the tool.
+
+    On PostgreSQL this is a jsonb containment test on the node array,
+    served by the partial GIN index ix_workflows_nodes; elsewhere it
+    scans json_each() over the nodes.
+
+    Args:
+        tool_name: Tool name to look for
+        dialect: Database dialect name (db.get_bind().dialect.name)
+    """
+    if dialect == "postgresql":
+        # Must match the indexed expression and partial index predicate
+        return and_(
+            Workflow.use_tools,
+            text(
+                "(workflows.workflow_json -> 'nodes') @> CAST(:tool_node AS JSONB)"
+            ).bindparams(tool_node=json.dumps([{"config": {"tool_name": tool_name}}])),
+        )
+
+    nodes = func.json_each(Workflow.workflow_json, "$.nodes").table_valued("value")
+    return (
+        select(literal(1))
+        .select_from(nodes)
+        .where(func.json_extract(nodes.c.value, "$.config.tool_name") == tool_name)
+        .exists()
+    )
+
+
+def workflows_using_tool(db: DBSession, tool_name: str) -> List[Workflow]:
+    """
+    All workflows that call the given tool, in a single query.
+
+    Args:
+        db: Database session
+        tool_name: Tool name to look for
+
+    Returns:
+        Matching workflows
+    """
+    return (
+        db.query(Workflow)
+        .filter(calls_tool(tool_name, db.get_bind().dialect.name))
+        .all()
+    )
@@ -0,0 +1,318 @@
+"""
+Workflow Renderer - Draws workflow diagrams server-side as SVG or PNG.
+
+Nodes are drawn at their layout positions (see layout.py) with the same
+shapes and colours as the Mermaid diagram. PNG output rasterizes the SVG
+with cairosvg, an optional dependency. Rendered files are cached in a
+blob store keyed by a hash of the workflow content, so a version is only
+ever rendered once per format.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+import hashlib
+import json
+
+from src.blob_store import BlobStore, LocalBlobStore
+from src.config import get_settings
+from src.workflow.layout import get_layout_engine
+from src.workflow.schemas import (
+    DiagramFormat,
+    NodeType,
+    WorkflowData,
+    WorkflowEdge,
+    WorkflowNode,
+)
+
+try:
+    import cairosvg
+except ImportError:  # Optional rasterizer for PNG diagrams
+    cairosvg = None
+
+settings = get_settings()
+
+# Bump when the drawing changes, so cached files are not reused
+RENDERER_VERSION = "2"
+
+NODE_WIDTH = 160
+NODE_HEIGHT = 56
+PADDING = 24
+FONT_SIZE = 13
+LABEL_FONT_SIZE = 11
+MAX_LINE_CHARS = 22
+
+# (fill, stroke) per node type, matching the Mermaid class styles
+NODE_COLOURS = {
+    NodeType.START: ("#90EE90", "#333333"),
+    NodeType.END: ("#90EE90", "#333333"),
+    NodeType.TOOL_CALL: ("#FFE4B5", "#333333"),
+    NodeType.CONDITION: ("#87CEEB", "#333333"),
+}
+DEFAULT_COLOURS = ("#ECECFF", "#9370DB")
+
+
+DIAGRAM_CONTENT_TYPES = {
+    DiagramFormat.SVG: "image/svg+xml",
+    DiagramFormat.PNG: "image/png",
+}
+
+Point = Tuple[float, float]
+
+
+def diagram_hash(workflow_json: dict) -> str:
+    """Hash of a stored workflow's content (and the renderer version)"""
+    canonical = json.dumps(workflow_json, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{RENDERER_VERSION}:{canonical}".encode("utf-8")).hexdigest()
+
+
+def _wrap(text: str) -> List[str]:
+    """Split a label into at most two lines"""
+    lines: List[str] = []
+    current = ""
+    for word in text.split():
+        if current and len(current) + 1 + len(word) > MAX_LINE_CHARS:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        lines.append(current)
+    if len(lines) > 2:
+        lines = [lines[0], lines[1][: MAX_LINE_CHARS - 1] + "…"]
+    return [
+        line if len(line) <= MAX_LINE_CHARS else line[: MAX_LINE_CHARS - 1] + "…"
+        for line in lines
+    ]
+
+
+def _border_point(centre: Point, towards: Point) -> Point:
+    """Where the line from a node's centre towards a point leaves its box"""
+    dx, dy = towards[0] - centre[0], towards[1] - centre[1]
+    if dx == 0 and dy == 0:
+        return centre
+    scales = []
+    if dx:
+        scales.append((NODE_WIDTH / 2) / abs(dx))
+    if dy:
+        scales.append((NODE_HEIGHT / 2) / abs(dy))
+    scale = min(scales)
+    return (centre[0] + dx * scale, centre[1] + dy * scale)
+
+
+def _node_svg(node: WorkflowNode, centre: Point) -> List[str]:
+    x, y = centre
+    fill, stroke = NODE_COLOURS.get(node.type, DEFAULT_COLOURS)
+    half_w, half_h = NODE_WIDTH / 2, NODE_HEIGHT / 2
+
+    if node.type == NodeType.CONDITION:
+        points = (
+            f"{x:.1f},{y - half_h:.1f} {x + half_w:.1f},{y:.1f} "
+            f"{x:.1f},{y + half_h:.1f} {x - half_w:.1f},{y:.1f}"
+        )
+        shape = f'<polygon points="{points}" fill="{fill}" stroke="{stroke}"/>'
+    else:
+        radius = half_h if node.type in (NodeType.START, NodeType.END) else 6
+        shape = (
+            f'<rect x="{x - half_w:.1f}" y="{y - half_h:.1f}" width="{NODE_WIDTH}"'
+            f' height="{NODE_HEIGHT}" rx="{radius}" fill="{fill}" stroke="{stroke}"/>'
+        )
+
+    lines = _wrap(node.label)
+    first = y - (len(lines) - 1) * (FONT_SIZE + 2) / 2
+    texts = [
+        f'<text x="{x:.1f}" y="{first + i * (FONT_SIZE + 2):.1f}">'
+        f"{escape(line)}</text>"
+        for i, line in enumerate(lines)
+    ]
+    # Node ids come from user input; quoteattr also escapes quotes
+    node_id = quoteattr(f"node-{node.id}")
+    return [f'<g class="node" id={node_id}>', shape, *texts, "</g>"]
+
+
+def _edge_svg(edge: WorkflowEdge, source: Point, target: Point) -> List[str]:
+    if source == target:
+        # Self-loop: a small arc on the right-hand side
+        x, y = source[0] + NODE_WIDTH / 2, source[1]
+        path = (
+            f"M{x:.1f},{y - 10:.1f} C{x + 40:.1f},{y - 30:.1f}"
+            f" {x + 40:.1f},{y + 30:.1f} {x:.1f},{y + 10:.1f}"
+        )
+        label_at = (x + 34, y)
+    elif target[1] < source[1] or (
+        target[1] == source[1] and abs(target[0] - source[0]) > NODE_WIDTH
+    ):
+        # Edge back up the diagram: curve around the right-hand side
+        start = (source[0] + NODE_WIDTH / 2, source[1])
+        end = (target[0] + NODE_WIDTH / 2, target[1])
+        bend = max(start[0], end[0]) + 60
+        path = (
+            f"M{start[0]:.1f},{start[1]:.1f} C{bend:.1f},{start[1]:.1f}"
+            f" {bend:.1f},{end[1]:.1f} {end[0]:.1f},{end[1]:.1f}"
+        )
+        label_at = (bend - 15, (start[1] + end[1]) / 2)
+    else:
+        start = _border_point(source, target)
+        end = _border_point(target, source)
+        path = f"M{start[0]:.1f},{start[1]:.1f} L{end[0]:.1f},{end[1]:.1f}"
+        label_at = ((start[0] + end[0]) / 2, (start[1] + end[1]) / 2)
+
+    parts = ['<g class="edge">', f'<path d="{path}" marker-end="url(#arrow)"/>']
+    if edge.label:
+        label = escape(edge.label)
+        width = len(edge.label) * LABEL_FONT_SIZE * 0.6 + 8
+        parts.append(
+            f'<rect class="label" x="{label_at[0] - width / 2:.1f}"'
+            f' y="{label_at[1] - LABEL_FONT_SIZE:.1f}" width="{width:.1f}"'
+            f' height="{LABEL_FONT_SIZE + 6}" rx="3"/>'
+        )
+        parts.append(
+            f'<text class="label" x="{label_at[0]:.1f}" y="{label_at[1]:.1f}">'
+            f"{label}</text>"
+        )
+    parts.append("</g>")
+    return parts
+
+
+def render_svg(workflow: WorkflowData) -> str:
+    """
+    Draw a workflow as a standalone SVG document.
+
+    Args:
+        workflow: Workflow to draw (nodes without positions are laid out)
+
+    Returns:
+        SVG markup
+    """
+    positions: Dict[str, Dict[str, int]] = {
+        node.id: node.position for node in workflow.nodes if node.position
+    }
+    if len(positions) < len(workflow.nodes):
+        positions = get_layout_engine().layout(workflow)
+
+    if positions:
+        xs = [position["x"] for position in positions.values()]
+        ys = [position["y"] for position in positions.values()]
+        min_x, min_y = min(xs), min(ys)
+        # Room on the right for back-edges and self-loops
+        width = max(xs) - min_x + NODE_WIDTH + 2 * PADDING + 80
+        height = max(ys) - min_y + NODE_HEIGHT + 2 * PADDING
+    else:
+        min_x = min_y = 0
+        width = height = 2 * PADDING
+
+    offset_x = PADDING + NODE_WIDTH / 2 - min_x
+    offset_y = PADDING + NODE_HEIGHT / 2 - min_y
+    centres: Dict[str, Point] = {
+        node_id: (position["x"] + offset_x, position["y"] + offset_y)
+        for node_id, position in positions.items()
+    }
+
+    body: List[str] = []
+    for edge in workflow.edges:
+        # Edges to unknown nodes are not drawn (the validator reports them)
+        if edge.source in centres and edge.target in centres:
+            body.extend(_edge_svg(edge, centres[edge.source], centres[edge.target]))
+    for node in workflow.nodes:
+        if node.id in centres:
+            body.extend(_node_svg(node, centres[node.id]))
+
+    title = escape(f"{workflow.agent_type} Agent Workflow")
+    return "\n".join(
+        [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}"'
+            f' height="{height:.0f}" viewBox="0 0 {width:.0f} {height:.0f}"'
+            f' font-family="Helvetica, Arial, sans-serif">',
+            f"<title>{title}</title>",
+            "<defs>",
+            '<marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5"'
+            ' markerWidth="8" markerHeight="8" orient="auto-start-reverse">',
+            '<path d="M0,0 L10,5 L0,10 z" fill="#333333"/>',
+            "</marker>",
+            "<style>",
+            ".edge path { fill: none; stroke: #333333; stroke-width: 1.5; }",
+            f".node text {{ font-size: {FONT_SIZE}px; text-anchor: middle;"
+            " dominant-baseline: middle; fill: #222222; }",
+            ".node rect, .node polygon { stroke-width: 2; }",
+            f"text.label {{ font-size: {LABEL_FONT_SIZE}px; text-anchor: middle;"
+            " fill: #333333; }",
+            "rect.label { fill: #FFFFFF; fill-opacity: 0.9; }",
+            "</style>",
+            "</defs>",
+            '<rect width="100%" height="100%" fill="#FFFFFF"/>',
+            *body,
+            "</svg>",
+        ]
+    )
+
+
+def render_png(svg: str, scale: float = 2.0) -> bytes:
+    """
+    Rasterize SVG markup to PNG.
+
+    Raises:
+        RuntimeError: If cairosvg is not installed
+    """
+    if cairosvg is None:
+        raise RuntimeError("PNG rendering is not available. Install 'cairosvg'.")
+    return cairosvg.svg2png(bytestring=svg.encode("utf-8"), scale=scale)
+
+
+class DiagramRenderer:
+    """
+    Renders workflow diagrams and caches the files by content hash.
+    """
+
+    def __init__(self, store: Optional[BlobStore] = None):
+        self.store = store or LocalBlobStore(settings.workflow_render_dir)
+
+    @staticmethod
+    def available(diagram_format: DiagramFormat) -> bool:
+        """Whether a format can be rendered on this server"""
+        return diagram_format == DiagramFormat.SVG or cairosvg is not None
+
+    def render(
+        self,
+        workflow_json: dict,
+        diagram_format: DiagramFormat,
+        content_hash: Optional[str] = None,
+    ) -> bytes:
+        """
+        Get a rendered diagram, from the cache if it was rendered before.
+
+        Args:
+            workflow_json: Stored workflow (WorkflowData as JSON)
+            diagram_format: Output format
+            content_hash: diagram_hash(workflow_json), if already computed
+
+        Returns:
+            File contents
+
+        Raises:
+            RuntimeError: If the format is not available
+        """
+        content_hash = content_hash or diagram_hash(workflow_json)
+        key = f"{content_hash[:2]}/{content_hash}.{diagram_format.value}"
+        if self.store.exists(key):
+            return b"".join(self.store.read(key))
+
+        svg = render_svg(WorkflowData(**workflow_json))
+        if diagram_format == DiagramFormat.PNG:
+            data = render_png(svg)
+        else:
+            data = svg.encode("utf-8")
+
+        self.store.write(key, [data])
+        return data
+
+
+# Global renderer instance
+_diagram_renderer: Optional[DiagramRenderer] = None
+
+
+def get_diagram_renderer() -> DiagramRenderer:
+    """Get or create the global diagram renderer instance"""
+    global _diagram_renderer
+    if _diagram_renderer is None:
+        _diagram_renderer = DiagramRenderer()
+    return _diagram_renderer
@@ -2,31 +2,71 @@
 Workflow API endpoints for viewing, reviewing, and modifying workflows.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session as DBSession
-import uuid
-import json
 from datetime import datetime
 
-from src.database import get_db
+from src.database import get_db, get_read_db
 from src.redis_client import redis_client
 from src.session.models import Session
 from src.session.schemas import SessionState, ConversationStage
 from src.workflow.models import Workflow
 from src.workflow.schemas import (
+    DiagramFormat,
     WorkflowReviewRequest,
     WorkflowReviewResponse,
     WorkflowVisualization,
     WorkflowData,
+    WorkflowDiff,
+    WorkflowRollbackRequest,
+    WorkflowVersionList,
+    ValidationReport,
+    WorkflowRunRequest,
+    WorkflowRunResult,
+)
+from src.workflow.queries import resynthesize_workflow, save_workflow
+from src.workflow.render import (
+    DIAGRAM_CONTENT_TYPES,
+    diagram_hash,
+    get_diagram_renderer,
 )
+from src.workflow.runtime import allowed_tool_hosts, compile_workflow
 from src.workflow.synthesizer import get_synthesizer
+from src.workflow.validator import validate_workflow
+from src.workflow.versions import (
+    list_versions,
+    reconstruct_version,
+    rollback_workflow,
+    version_diff,
+    version_number,
+)
 from src.workflow.visualizer import generate_mermaid_diagram, generate_text_summary
 
 router = APIRouter(prefix="/workflows", tags=["workflows"])
 
+# Diagrams of a given version never change
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match value covers the given ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
 
 @router.get("/{session_id}", response_model=WorkflowReviewResponse)
-async def get_workflow(session_id: str, db: DBSession = Depends(get_db)):
+async def get_workflow(
+    session_id: str,
+    db: DBSession = Depends(get_read_db),
+    primary_db: DBSession = Depends(get_db),
+):
     """
     Get the workflow for a session.
     If not yet generated, creates it from session state.
@@ -37,13 +77,14 @@ async def get_workflow(session_id: str, db: DBSession = Depends(get_db)):
 
     if workflow:
         # Return existing workflow
-        workflow_data = WorkflowData(**json.loads(workflow.workflow_json))
+        workflow_data = WorkflowData(**workflow.workflow_json)
 
         return WorkflowReviewResponse(
             session_id=session_id,
             workflow=workflow_data,
             mermaid_diagram=workflow.mermaid_diagram or "",
             is_final=workflow.is_approved,
+            validation=validate_workflow(workflow_data),
         )
 
     # Generate new workflow from session state
@@ -63,26 +104,16 @@ async def get_workflow(session_id: str, db: DBSession = Depends(get_db)):
     # Generate visualization
     mermaid = generate_mermaid_diagram(workflow_data)
 
-    # Save to database
-    db_workflow = Workflow(
-        id=str(uuid.uuid4()),
-        session_id=session_id,
-        agent_type=workflow_data.agent_type,
-        goals=workflow_data.goals,
-        tone=workflow_data.tone,
-        use_tools=workflow_data.use_tools,
-        workflow_json=workflow_data.model_dump_json(),
-        mermaid_diagram=mermaid,
-        is_approved=False,
-    )
-    db.add(db_workflow)
-    db.commit()
+    # Save to database (a concurrent request may have saved one first)
+    save_workflow(primary_db, session_id, workflow_data, mermaid)
+    primary_db.commit()
 
     return WorkflowReviewResponse(
         session_id=session_id,
         workflow=workflow_data,
         mermaid_diagram=mermaid,
         is_final=False,
+        validation=validate_workflow(workflow_data),
     )
 
 
@@ -105,34 +136,41 @@ async def review_workflow(
         )
 
     if review.approved:
-        # User approved the workflow
+        # User approved the workflow (pinned to the current version)
         workflow.is_approved = True
+        workflow.approved_version = version_number(workflow.version)
         workflow.approved_at = datetime.utcnow()
         db.commit()
 
-        workflow_data = WorkflowData(**json.loads(workflow.workflow_json))
+        workflow_data = WorkflowData(**workflow.workflow_json)
 
         return WorkflowReviewResponse(
             session_id=session_id,
             workflow=workflow_data,
             mermaid_diagram=workflow.mermaid_diagram or "",
             is_final=True,
+            validation=validate_workflow(workflow_data),
         )
     else:
         # User requested changes
         # Return current workflow with requested changes noted
-        workflow_data = WorkflowData(**json.loads(workflow.workflow_json))
+        workflow_data = WorkflowData(**workflow.workflow_json)
 
         return WorkflowReviewResponse(
             session_id=session_id,
             workflow=workflow_data,
             mermaid_diagram=workflow.mermaid_diagram or "",
             is_final=False,
+            validation=validate_workflow(workflow_data),
         )
 
 
 @router.get("/{session_id}/visualize", response_model=WorkflowVisualization)
-async def visualize_workflow(session_id: str, db: DBSession = Depends(get_db)):
+async def visualize_workflow(
+    session_id: str,
+    db: DBSession = Depends(get_read_db),
+    primary_db: DBSession = Depends(get_db),
+):
     """
     Get visual representations of the workflow.
     If workflow doesn't exist yet, creates it from session state.
@@ -167,21 +205,13 @@ async def visualize_workflow(session_id: str, db: DBSession = Depends(get_db)):
         workflow_data = synthesizer.synthesize(session_state)
         mermaid = generate_mermaid_diagram(workflow_data)
 
-        workflow = Workflow(
-            id=str(uuid.uuid4()),
-            session_id=session_id,
-            agent_type=workflow_data.agent_type,
-            goals=workflow_data.goals,
-            tone=workflow_data.tone,
-            use_tools=workflow_data.use_tools,
-            workflow_json=workflow_data.model_dump_json(),
-            mermaid_diagram=mermaid,
-            is_approved=False,
+        save_workflow(primary_db, session_id, workflow_data, mermaid)
+        primary_db.commit()
+        workflow = (
+            primary_db.query(Workflow).filter(Workflow.session_id == session_id).first()
         )
-        db.add(workflow)
-        db.commit()
 
-    workflow_data = WorkflowData(**json.loads(workflow.workflow_json))
+    workflow_data = WorkflowData(**workflow.workflow_json)
 
     # Generate visualizations
     mermaid = workflow.mermaid_diagram or generate_mermaid_diagram(workflow_data)
@@ -194,11 +224,65 @@ async def visualize_workflow(session_id: str, db: DBSession = Depends(get_db)):
     )
 
 
+@router.get("/{session_id}/diagram")
+async def render_workflow_diagram(
+    session_id: str,
+    format: DiagramFormat = DiagramFormat.SVG,
+    version: Optional[int] = Query(
+        default=None, ge=1, description="Version to draw (default: current)"
+    ),
+    if_none_match: Optional[str] = Header(default=None),
+    db: DBSession = Depends(get_read_db),
+):
+    """
+    Get the workflow diagram rendered server-side as SVG or PNG.
+
+    Rendered files are cached on disk by content hash. Sends an ETag; a
+    matching If-None-Match gets 304 Not Modified. Diagrams requested for
+    a specific version may be cached by clients indefinitely.
+    """
+
+    renderer = get_diagram_renderer()
+    if not renderer.available(format):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="PNG rendering is not available. Install 'cairosvg'.",
+        )
+
+    workflow = _get_workflow_or_404(db, session_id)
+    if version is None or version == version_number(workflow.version):
+        workflow_json = workflow.workflow_json
+    else:
+        try:
+            workflow_json = reconstruct_version(db, workflow, version).model_dump(
+                mode="json"
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    content_hash = diagram_hash(workflow_json)
+    headers = {
+        "ETag": f'"{format.value}-{content_hash[:32]}"',
+        # The current diagram changes on regenerate: revalidate every time
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if version else "no-cache",
+    }
+    if _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    content = await run_in_threadpool(
+        renderer.render, workflow_json, format, content_hash
+    )
+    return Response(
+        content=content, media_type=DIAGRAM_CONTENT_TYPES[format], headers=headers
+    )
+
+
 @router.post("/{session_id}/regenerate", response_model=WorkflowReviewResponse)
 async def regenerate_workflow(session_id: str, db: DBSession = Depends(get_db)):
     """
     Regenerate workflow from current session state.
     Useful after user makes changes to agent configuration.
+    Only structural changes are applied, as a new workflow version.
     """
 
     # Get session state
@@ -211,46 +295,156 @@ async def regenerate_workflow(session_id: str, db: DBSession = Depends(get_db)):
 
     session_state = SessionState(**session_data)
 
-    # Synthesize new workflow
-    synthesizer = get_synthesizer()
-    workflow_data = synthesizer.synthesize(session_state)
+    # Apply changes since the stored version (resets approval if any)
+    workflow, workflow_data, diff = resynthesize_workflow(db, session_id, session_state)
+    db.commit()
 
-    # Generate visualization
-    mermaid = generate_mermaid_diagram(workflow_data)
+    return WorkflowReviewResponse(
+        session_id=session_id,
+        workflow=workflow_data,
+        mermaid_diagram=workflow.mermaid_diagram or "",
+        is_final=workflow.is_approved,
+        validation=validate_workflow(workflow_data),
+    )
+
+
+@router.post("/{session_id}/run", response_model=WorkflowRunResult)
+async def run_workflow(
+    session_id: str,
+    run: WorkflowRunRequest,
+    db: DBSession = Depends(get_read_db),
+):
+    """
+    Run a simulated call through the saved workflow.
+    Tool results are stubbed unless simulate_tools is false, in which case
+    tool nodes call their configured endpoints on allow-listed hosts only.
+    """
+
+    if not run.simulate_tools and not allowed_tool_hosts():
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Real tool calls are disabled. Set WORKFLOW_TOOL_ALLOWED_HOSTS.",
+        )
 
-    # Update or create workflow in database
     workflow = db.query(Workflow).filter(Workflow.session_id == session_id).first()
+    if not workflow:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Workflow for session {session_id} not found",
+        )
 
-    if workflow:
-        # Update existing
-        workflow.agent_type = workflow_data.agent_type
-        workflow.goals = workflow_data.goals
-        workflow.tone = workflow_data.tone
-        workflow.use_tools = workflow_data.use_tools
-        workflow.workflow_json = workflow_data.model_dump_json()
-        workflow.mermaid_diagram = mermaid
-        workflow.is_approved = False  # Reset approval
-        workflow.updated_at = datetime.utcnow()
-    else:
-        # Create new
-        workflow = Workflow(
-            id=str(uuid.uuid4()),
-            session_id=session_id,
-            agent_type=workflow_data.agent_type,
-            goals=workflow_data.goals,
-            tone=workflow_data.tone,
-            use_tools=workflow_data.use_tools,
-            workflow_json=workflow_data.model_dump_json(),
-            mermaid_diagram=mermaid,
-            is_approved=False,
+    try:
+        compiled = compile_workflow(WorkflowData(**workflow.workflow_json))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Workflow cannot be executed: {e}",
         )
-        db.add(workflow)
 
+    return await compiled.run(
+        run.messages, variables=run.variables, simulate_tools=run.simulate_tools
+    )
+
+
+def _get_workflow_or_404(
+    db: DBSession, session_id: str, for_update: bool = False
+) -> Workflow:
+    query = db.query(Workflow).filter(Workflow.session_id == session_id)
+    if for_update:
+        query = query.with_for_update()
+    workflow = query.first()
+    if not workflow:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Workflow for session {session_id} not found",
+        )
+    return workflow
+
+
+@router.get("/{session_id}/validate", response_model=ValidationReport)
+async def validate_stored_workflow(
+    session_id: str, db: DBSession = Depends(get_read_db)
+):
+    """
+    Statically check the stored workflow graph: duplicate and dangling ids,
+    reachability from start, paths to an end node and cycles.
+    """
+
+    workflow = _get_workflow_or_404(db, session_id)
+    return validate_workflow(WorkflowData(**workflow.workflow_json))
+
+
+@router.get("/{session_id}/versions", response_model=WorkflowVersionList)
+async def get_workflow_versions(session_id: str, db: DBSession = Depends(get_read_db)):
+    """
+    List the versions of a workflow, oldest first, with change counts
+    and the version the approval is pinned to.
+    """
+
+    workflow = _get_workflow_or_404(db, session_id)
+    return list_versions(db, workflow)
+
+
+@router.get("/{session_id}/versions/{version}", response_model=WorkflowData)
+async def get_workflow_version(
+    session_id: str, version: int, db: DBSession = Depends(get_read_db)
+):
+    """
+    Get a workflow as it was at a given version.
+    """
+
+    workflow = _get_workflow_or_404(db, session_id)
+    try:
+        return reconstruct_version(db, workflow, version)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get("/{session_id}/diff", response_model=WorkflowDiff)
+async def diff_workflow_versions(
+    session_id: str,
+    from_version: int = Query(ge=1, description="Version to diff from"),
+    to_version: Optional[int] = Query(
+        default=None, ge=1, description="Version to diff to (default: current)"
+    ),
+    db: DBSession = Depends(get_read_db),
+):
+    """
+    Structural changes between two versions of a workflow.
+    """
+
+    workflow = _get_workflow_or_404(db, session_id)
+    if to_version is None:
+        to_version = version_number(workflow.version)
+
+    try:
+        return version_diff(db, workflow, from_version, to_version)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.post("/{session_id}/rollback", response_model=WorkflowReviewResponse)
+async def rollback_workflow_version(
+    session_id: str,
+    rollback: WorkflowRollbackRequest,
+    db: DBSession = Depends(get_db),
+):
+    """
+    Restore an earlier version of a workflow.
+    History is kept: the restored content becomes a new version.
+    """
+
+    workflow = _get_workflow_or_404(db, session_id, for_update=True)
+    try:
+        workflow_data, diff = rollback_workflow(db, workflow, rollback.version)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     db.commit()
 
     return WorkflowReviewResponse(
         session_id=session_id,
         workflow=workflow_data,
-        mermaid_diagram=mermaid,
-        is_final=False,
+        mermaid_diagram=workflow.mermaid_diagram or "",
+        is_final=workflow.is_approved,
+        validation=validate_workflow(workflow_data),
     )
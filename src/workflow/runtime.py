@@ -0,0 +1,488 @@
+"""
+Workflow Runtime - Executes a synthesized workflow as a state machine.
+
+compile_workflow() turns a WorkflowData graph into a CompiledWorkflow:
+nodes indexed by id, outgoing edges precomputed per node with their
+conditions compiled into predicates, and a handler bound to every node.
+A CompiledWorkflow holds no per-call state, so one instance can drive
+any number of concurrent runs; each run keeps its state in a RunContext.
+Tool nodes call their configured endpoint through one pooled httpx client.
+"""
+
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple
+from urllib.parse import urlsplit
+import re
+import time
+
+import httpx
+
+from src.config import get_settings
+from src.workflow.schemas import (
+    NodeType,
+    RunStatus,
+    ToolCallResult,
+    WorkflowData,
+    WorkflowEdge,
+    WorkflowNode,
+    WorkflowRunResult,
+    WorkflowTurn,
+)
+from src.workflow.intents import DEFAULT_INTENT, get_intent_taxonomy
+
+settings = get_settings()
+
+# Words that carry no signal when matching utterances to edge conditions
+_CONDITION_STOPWORDS = {
+    "the", "and", "for", "with", "when", "user", "users", "needs", "need",
+    "wants", "want", "use", "call", "tool", "tools", "asks", "about",
+}  # fmt: skip
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+_YES_LABELS = {"yes", "true", "continue"}
+_NO_LABELS = {"no", "false", "end"}
+
+
+def _keywords(text: Optional[str]) -> frozenset:
+    """Significant lowercase words, with a naive plural fold"""
+    words = set()
+    for word in _WORD_PATTERN.findall((text or "").lower()):
+        if len(word) < 3 or word in _CONDITION_STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.add(word)
+    return frozenset(words)
+
+
+def detect_intent(utterance: str, expected_intents: List[str]) -> str:
+    """
+    Pick the first expected intent whose synonyms appear in an utterance.
+
+    Args:
+        utterance: Caller's message
+        expected_intents: Intents configured on the intent_detection node
+
+    Returns:
+        Matching intent, else the default intent
+    """
+    taxonomy = get_intent_taxonomy()
+    found = taxonomy.find(utterance)
+    for intent in expected_intents:
+        if intent in found:
+            return intent
+    return taxonomy.default_intent
+
+
+class RunContext:
+    """
+    State of a single run. Never shared between runs.
+    """
+
+    def __init__(
+        self,
+        messages: List[str],
+        variables: Dict[str, Any],
+        simulate_tools: bool,
+        http_client: Optional[httpx.AsyncClient],
+    ):
+        self.pending = deque(messages)
+        self.variables = variables
+        self.simulate_tools = simulate_tools
+        self.http_client = http_client
+
+        self.utterance: Optional[str] = None
+        self.utterance_keywords: frozenset = frozenset()
+        self.intent: Optional[str] = None
+        self.decision = False
+        self.hung_up = False
+
+        self.path: List[str] = []
+        self.turns: List[WorkflowTurn] = []
+        self.turn: Optional[WorkflowTurn] = None
+
+
+NodeHandler = Callable[[WorkflowNode, RunContext], Awaitable[None]]
+EdgePredicate = Callable[[RunContext], bool]
+
+
+# ==================== Node handlers ====================
+
+
+async def _run_passthrough(node: WorkflowNode, ctx: RunContext) -> None:
+    """start / end nodes"""
+
+
+async def _run_greeting(node: WorkflowNode, ctx: RunContext) -> None:
+    greeting = node.config.get("greeting_template") or node.label
+    ctx.turns.append(WorkflowTurn(agent=greeting))
+
+
+async def _run_intent_detection(node: WorkflowNode, ctx: RunContext) -> None:
+    if not ctx.pending:
+        ctx.hung_up = True
+        return
+
+    ctx.utterance = ctx.pending.popleft()
+    ctx.utterance_keywords = _keywords(ctx.utterance)
+    ctx.intent = detect_intent(ctx.utterance, node.config.get("expected_intents") or [])
+    ctx.turn = WorkflowTurn(user=ctx.utterance, intent=ctx.intent)
+    ctx.turns.append(ctx.turn)
+
+
+async def _run_tool_call(node: WorkflowNode, ctx: RunContext) -> None:
+    result = await call_tool(node, ctx)
+    if ctx.turn is None:
+        ctx.turn = WorkflowTurn()
+        ctx.turns.append(ctx.turn)
+    ctx.turn.tool_calls.append(result)
+
+
+async def _run_response(node: WorkflowNode, ctx: RunContext) -> None:
+    if ctx.turn is None:
+        ctx.turn = WorkflowTurn()
+        ctx.turns.append(ctx.turn)
+
+    parts = [f"Responding to {ctx.intent or DEFAULT_INTENT}"]
+    if node.config.get("tone"):
+        parts[0] += f" in a {node.config['tone']} tone"
+    for result in ctx.turn.tool_calls:
+        outcome = "succeeded" if result.ok else f"failed ({result.error})"
+        parts.append(f"{result.tool_name} {outcome}")
+    ctx.turn.agent = "; ".join(parts)
+
+
+async def _run_condition(node: WorkflowNode, ctx: RunContext) -> None:
+    # The conversation continues while the caller has more to say
+    ctx.decision = bool(ctx.pending)
+    ctx.turn = None
+
+
+NODE_HANDLERS: Dict[NodeType, NodeHandler] = {
+    NodeType.START: _run_passthrough,
+    NodeType.GREETING: _run_greeting,
+    NodeType.INTENT_DETECTION: _run_intent_detection,
+    NodeType.TOOL_CALL: _run_tool_call,
+    NodeType.RESPONSE: _run_response,
+    NodeType.CONDITION: _run_condition,
+    NodeType.END: _run_passthrough,
+}
+
+
+# ==================== Tool dispatch ====================
+
+
+def allowed_tool_hosts() -> FrozenSet[str]:
+    """Hosts real tool calls may reach (WORKFLOW_TOOL_ALLOWED_HOSTS)"""
+    return frozenset(
+        host.strip().lower()
+        for host in settings.workflow_tool_allowed_hosts.split(",")
+        if host.strip()
+    )
+
+
+def _endpoint_error(endpoint: str) -> Optional[str]:
+    """Why a tool endpoint may not be called, or None if it may"""
+    try:
+        url = urlsplit(endpoint)
+        host = (url.hostname or "").lower()
+    except ValueError:
+        return "Invalid endpoint URL"
+    if url.scheme not in ("http", "https") or not host:
+        return "Endpoint must be an http(s) URL"
+    if host not in allowed_tool_hosts():
+        return f"Host {host} is not in WORKFLOW_TOOL_ALLOWED_HOSTS"
+    return None
+
+
+def _tool_payload(node: WorkflowNode, ctx: RunContext) -> Dict[str, Any]:
+    """Caller context plus any run variables named by the tool's input schema"""
+    schema = node.config.get("input_schema") or {}
+    fields = schema.get("properties", schema)
+
+    payload: Dict[str, Any] = {"utterance": ctx.utterance, "intent": ctx.intent}
+    for field in fields:
+        if field in ctx.variables:
+            payload[field] = ctx.variables[field]
+    return payload
+
+
+async def call_tool(node: WorkflowNode, ctx: RunContext) -> ToolCallResult:
+    """
+    Execute a tool_call node against its configured endpoint.
+    Failures are recorded on the result rather than raised.
+
+    Args:
+        node: tool_call node (config holds endpoint, method, input_schema)
+        ctx: Run context
+
+    Returns:
+        Tool call result
+    """
+    config = node.config
+    tool_name = config.get("tool_name") or node.id
+
+    if ctx.simulate_tools:
+        return ToolCallResult(
+            node_id=node.id,
+            tool_name=tool_name,
+            ok=True,
+            response={"simulated": True, "tool": tool_name},
+        )
+
+    endpoint = config.get("endpoint")
+    if not endpoint:
+        return ToolCallResult(
+            node_id=node.id,
+            tool_name=tool_name,
+            ok=False,
+            error="No endpoint configured",
+        )
+
+    # Only allow-listed hosts; the client does not follow redirects
+    endpoint_error = _endpoint_error(endpoint)
+    if endpoint_error:
+        return ToolCallResult(
+            node_id=node.id,
+            tool_name=tool_name,
+            ok=False,
+            error=endpoint_error,
+        )
+
+    method = (config.get("method") or "POST").upper()
+    payload = _tool_payload(node, ctx)
+    client = ctx.http_client or get_http_client()
+
+    started = time.perf_counter()
+    try:
+        if method in ("GET", "DELETE"):
+            response = await client.request(method, endpoint, params=payload)
+        else:
+            response = await client.request(method, endpoint, json=payload)
+    except httpx.HTTPError as e:
+        return ToolCallResult(
+            node_id=node.id,
+            tool_name=tool_name,
+            ok=False,
+            latency_ms=round((time.perf_counter() - started) * 1000, 2),
+            error=str(e) or type(e).__name__,
+        )
+
+    try:
+        body = response.json()
+    except ValueError:
+        body = response.text
+
+    return ToolCallResult(
+        node_id=node.id,
+        tool_name=tool_name,
+        ok=response.is_success,
+        status_code=response.status_code,
+        latency_ms=round((time.perf_counter() - started) * 1000, 2),
+        response=body,
+        error=None if response.is_success else f"HTTP {response.status_code}",
+    )
+
+
+# ==================== Compilation ====================
+
+
+def _always(ctx: RunContext) -> bool:
+    return True
+
+
+def _compile_condition(
+    edge: WorkflowEdge, source: WorkflowNode, target: WorkflowNode
+) -> Tuple[EdgePredicate, bool]:
+    """
+    Turn an edge condition into a predicate over the run context.
+
+    Returns:
+        (predicate, is_conditional); unconditional edges are fallbacks
+    """
+    if source.type == NodeType.CONDITION:
+        label = (edge.label or "").strip().lower()
+        if label in _YES_LABELS:
+            return (lambda ctx: ctx.decision), True
+        if label in _NO_LABELS:
+            return (lambda ctx: not ctx.decision), True
+
+    if not edge.condition:
+        return _always, False
+
+    keywords = _keywords(edge.condition)
+    if target.type == NodeType.TOOL_CALL:
+        # Tool names are snake_case or camelCase; match their words too
+        name = target.config.get("tool_name") or ""
+        name = re.sub(r"([a-z])([A-Z])", r"\1 \2", name).replace("_", " ")
+        keywords |= _keywords(name)
+
+    return (lambda ctx: not keywords.isdisjoint(ctx.utterance_keywords)), True
+
+
+class CompiledWorkflow:
+    """
+    Executable form of a WorkflowData graph.
+    """
+
+    def __init__(
+        self,
+        workflow: WorkflowData,
+        handlers: Optional[Dict[NodeType, NodeHandler]] = None,
+    ):
+        if not workflow.nodes:
+            raise ValueError("Workflow has no nodes")
+
+        handlers = {**NODE_HANDLERS, **(handlers or {})}
+
+        self.session_id = workflow.session_id
+        self.nodes: Dict[str, WorkflowNode] = {}
+        for node in workflow.nodes:
+            if node.id in self.nodes:
+                raise ValueError(f"Duplicate node id: {node.id}")
+            self.nodes[node.id] = node
+
+        self.handlers: Dict[str, NodeHandler] = {
+            node_id: handlers[node.type] for node_id, node in self.nodes.items()
+        }
+
+        # Adjacency index: conditional edges first (in declared order), then
+        # fallbacks, so each step is a single scan of a short tuple
+        conditional: Dict[str, List[Tuple[str, EdgePredicate]]] = {
+            node_id: [] for node_id in self.nodes
+        }
+        fallback: Dict[str, List[Tuple[str, EdgePredicate]]] = {
+            node_id: [] for node_id in self.nodes
+        }
+        for edge in workflow.edges:
+            for node_id in (edge.source, edge.target):
+                if node_id not in self.nodes:
+                    raise ValueError(
+                        f"Edge {edge.source} -> {edge.target} references"
+                        f" unknown node {node_id}"
+                    )
+            predicate, is_conditional = _compile_condition(
+                edge, self.nodes[edge.source], self.nodes[edge.target]
+            )
+            bucket = conditional if is_conditional else fallback
+            bucket[edge.source].append((edge.target, predicate))
+
+        self.adjacency: Dict[str, Tuple[Tuple[str, EdgePredicate], ...]] = {
+            node_id: tuple(conditional[node_id] + fallback[node_id])
+            for node_id in self.nodes
+        }
+
+        self.start_id = next(
+            (node.id for node in workflow.nodes if node.type == NodeType.START),
+            workflow.nodes[0].id,
+        )
+
+    def next_node(self, node_id: str, ctx: RunContext) -> Optional[str]:
+        """First outgoing edge whose condition holds, if any"""
+        for target, predicate in self.adjacency[node_id]:
+            if predicate(ctx):
+                return target
+        return None
+
+    async def run(
+        self,
+        messages: List[str],
+        variables: Optional[Dict[str, Any]] = None,
+        simulate_tools: bool = True,
+        http_client: Optional[httpx.AsyncClient] = None,
+        max_steps: Optional[int] = None,
+    ) -> WorkflowRunResult:
+        """
+        Run one simulated call through the workflow.
+
+        Args:
+            messages: Caller utterances, consumed one per intent detection
+            variables: Values for tool inputs named in their input schema
+            simulate_tools: Return stub tool results instead of calling HTTP
+                (real calls only reach WORKFLOW_TOOL_ALLOWED_HOSTS)
+            http_client: Client for tool calls (default: shared pooled client)
+            max_steps: Node visits before giving up (default: WORKFLOW_RUN_MAX_STEPS)
+
+        Returns:
+            Run trace with the visited path and per-turn transcript
+        """
+        started = time.perf_counter()
+        max_steps = max_steps or settings.workflow_run_max_steps
+        ctx = RunContext(messages, variables or {}, simulate_tools, http_client)
+
+        run_status = RunStatus.MAX_STEPS
+        node_id = self.start_id
+        for _ in range(max_steps):
+            node = self.nodes[node_id]
+            ctx.path.append(node_id)
+            await self.handlers[node_id](node, ctx)
+
+            if node.type == NodeType.END:
+                run_status = RunStatus.COMPLETED
+                break
+            if ctx.hung_up:
+                run_status = RunStatus.HUNG_UP
+                break
+
+            next_id = self.next_node(node_id, ctx)
+            if next_id is None:
+                run_status = RunStatus.STALLED
+                break
+            node_id = next_id
+
+        return WorkflowRunResult(
+            session_id=self.session_id,
+            status=run_status,
+            path=ctx.path,
+            turns=ctx.turns,
+            steps=len(ctx.path),
+            duration_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
+
+
+def compile_workflow(
+    workflow: WorkflowData, handlers: Optional[Dict[NodeType, NodeHandler]] = None
+) -> CompiledWorkflow:
+    """
+    Compile a workflow graph into an executable state machine.
+
+    Args:
+        workflow: Synthesized workflow
+        handlers: Overrides for the default node handlers, by node type
+
+    Returns:
+        CompiledWorkflow, safe to share between concurrent runs
+
+    Raises:
+        ValueError: If the graph is empty, has duplicate node ids or
+            edges to unknown nodes
+    """
+    return CompiledWorkflow(workflow, handlers)
+
+
+# Global pooled HTTP client for tool calls
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get or create the shared HTTP client used by tool_call nodes"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            # Waiting for a pooled connection is not a failure under load
+            timeout=httpx.Timeout(settings.workflow_tool_timeout_seconds, pool=None),
+            limits=httpx.Limits(
+                max_connections=settings.workflow_http_max_connections,
+                max_keepalive_connections=settings.workflow_http_max_keepalive,
+            ),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its pooled connections"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
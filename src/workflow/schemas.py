@@ -4,6 +4,7 @@ Workflow schemas for structured workflow representation.
 
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
+from datetime import datetime
 from enum import Enum
 
 
@@ -66,6 +67,116 @@ class WorkflowData(BaseModel):
     version: str = Field(default="1.0", description="Workflow version")
 
 
+class IndexedNode(BaseModel):
+    """A node and its index in the node list"""
+
+    index: int
+    node: WorkflowNode
+
+
+class IndexedEdge(BaseModel):
+    """An edge and its index in the edge list"""
+
+    index: int
+    edge: WorkflowEdge
+
+
+class WorkflowDiff(BaseModel):
+    """
+    Structural difference between two versions of a workflow.
+    Applying it to the older version yields the newer one.
+    """
+
+    fields: Dict[str, Any] = Field(
+        default_factory=dict, description="Changed top-level fields (new values)"
+    )
+    removed_nodes: List[str] = Field(default_factory=list)
+    added_nodes: List[IndexedNode] = Field(default_factory=list)
+    changed_nodes: List[WorkflowNode] = Field(
+        default_factory=list, description="Nodes whose content changed (new values)"
+    )
+    moved_nodes: Dict[str, Optional[Dict[str, int]]] = Field(
+        default_factory=dict, description="Node ID -> new position (layout only)"
+    )
+    node_order: Optional[List[str]] = Field(
+        default=None, description="Full node order, set only if kept nodes moved"
+    )
+    removed_edges: List[int] = Field(
+        default_factory=list, description="Indices in the older edge list"
+    )
+    added_edges: List[IndexedEdge] = Field(default_factory=list)
+    edges: Optional[List[WorkflowEdge]] = Field(
+        default=None, description="Full edge list, set only if kept edges moved"
+    )
+
+    def is_empty(self) -> bool:
+        return not (
+            self.fields
+            or self.removed_nodes
+            or self.added_nodes
+            or self.changed_nodes
+            or self.moved_nodes
+            or self.node_order
+            or self.removed_edges
+            or self.added_edges
+            or self.edges is not None
+        )
+
+    def affected_node_ids(self) -> set:
+        """Nodes whose rendered content changed (positions excluded)"""
+        return {item.node.id for item in self.added_nodes} | {
+            node.id for node in self.changed_nodes
+        }
+
+
+class IssueSeverity(str, Enum):
+    """How serious a validation issue is"""
+
+    ERROR = "error"  # The graph cannot be rendered or run correctly
+    WARNING = "warning"  # Suspicious, but the graph still works
+
+
+class ValidationIssue(BaseModel):
+    """One problem found in a workflow graph"""
+
+    code: str = Field(description="Machine-readable issue code")
+    severity: IssueSeverity
+    message: str
+    node_ids: List[str] = Field(default_factory=list)
+    edge_index: Optional[int] = Field(
+        default=None, description="Index in the edge list, for edge issues"
+    )
+
+
+class CycleKind(str, Enum):
+    """Classification of a cycle (strongly connected component)"""
+
+    SELF_LOOP = "self_loop"  # One node looping to itself, with a way out
+    LOOP = "loop"  # Several nodes, with a way out towards an end node
+    TRAP = "trap"  # No way out: a conversation entering it never ends
+
+
+class WorkflowCycle(BaseModel):
+    """A cycle in a workflow graph"""
+
+    kind: CycleKind
+    node_ids: List[str] = Field(description="Nodes of the cycle, in node order")
+    reachable: bool = Field(description="Whether the start node leads into it")
+
+
+class ValidationReport(BaseModel):
+    """Result of statically checking a workflow graph"""
+
+    valid: bool = Field(description="True if there are no errors")
+    node_count: int
+    edge_count: int
+    errors: int = 0
+    warnings: int = 0
+    issues: List[ValidationIssue] = Field(default_factory=list)
+    cycles: List[WorkflowCycle] = Field(default_factory=list)
+    unreachable_nodes: List[str] = Field(default_factory=list)
+
+
 class WorkflowReviewRequest(BaseModel):
     """Request to review and optionally modify workflow"""
 
@@ -83,6 +194,9 @@ class WorkflowReviewResponse(BaseModel):
     workflow: WorkflowData
     mermaid_diagram: str = Field(description="Mermaid.js diagram representation")
     is_final: bool = Field(description="Whether this is the final approved workflow")
+    validation: Optional[ValidationReport] = Field(
+        default=None, description="Static checks of the workflow graph"
+    )
 
 
 class WorkflowVisualization(BaseModel):
@@ -91,3 +205,101 @@ class WorkflowVisualization(BaseModel):
     mermaid_diagram: str = Field(description="Mermaid.js flowchart")
     json_structure: Dict[str, Any] = Field(description="JSON representation")
     summary: str = Field(description="Human-readable summary")
+
+
+class WorkflowVersionInfo(BaseModel):
+    """One entry of a workflow's version history"""
+
+    version: int
+    created_at: Optional[datetime] = None
+    is_snapshot: bool = Field(description="Whether the full workflow is stored")
+    nodes_added: int = 0
+    nodes_removed: int = 0
+    nodes_changed: int = 0
+    edges_changed: bool = Field(
+        default=False, description="Whether any edge was added or removed"
+    )
+    is_current: bool = False
+    is_approved: bool = False
+
+
+class WorkflowVersionList(BaseModel):
+    """Version history of a workflow, oldest first"""
+
+    session_id: str
+    current_version: int
+    approved_version: Optional[int] = Field(
+        default=None, description="Version the approval is pinned to"
+    )
+    versions: List[WorkflowVersionInfo]
+
+
+class WorkflowRollbackRequest(BaseModel):
+    """Restore an earlier version (as a new version)"""
+
+    version: int = Field(ge=1, description="Version to restore")
+
+
+class DiagramFormat(str, Enum):
+    """Server-side diagram formats"""
+
+    SVG = "svg"
+    PNG = "png"
+
+
+class RunStatus(str, Enum):
+    """How a workflow run finished"""
+
+    COMPLETED = "completed"  # Reached an end node
+    HUNG_UP = "hung_up"  # Caller had nothing left to say
+    STALLED = "stalled"  # No outgoing edge matched
+    MAX_STEPS = "max_steps"  # Step limit hit (likely a loop)
+
+
+class WorkflowRunRequest(BaseModel):
+    """Simulated call to run through a workflow"""
+
+    messages: List[str] = Field(
+        default_factory=list, description="Caller utterances, in order"
+    )
+    variables: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Values passed to tool calls whose input schema names them",
+    )
+    simulate_tools: bool = Field(
+        default=True,
+        description="Return stub tool results; set to false to call the configured"
+        " endpoints (only hosts in WORKFLOW_TOOL_ALLOWED_HOSTS are reached)",
+    )
+
+
+class ToolCallResult(BaseModel):
+    """Outcome of one tool_call node"""
+
+    node_id: str
+    tool_name: str
+    ok: bool
+    status_code: Optional[int] = None
+    latency_ms: float = 0.0
+    response: Any = None
+    error: Optional[str] = None
+
+
+class WorkflowTurn(BaseModel):
+    """One exchange of a run"""
+
+    user: Optional[str] = None
+    intent: Optional[str] = None
+    agent: Optional[str] = None
+    tool_calls: List[ToolCallResult] = Field(default_factory=list)
+
+
+class WorkflowRunResult(BaseModel):
+    """Trace of a workflow run"""
+
+    session_id: str
+    status: RunStatus
+    path: List[str] = Field(description="Node IDs in visiting order")
+    turns: List[WorkflowTurn]
+    steps: int
+    duration_ms: float
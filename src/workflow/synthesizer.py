@@ -2,18 +2,25 @@
 Workflow Synthesizer - Compiles session data into structured workflow.
 """
 
-from typing import Optional, List
+from typing import Optional, List, Tuple
+import re
 import uuid
 
 from src.session.schemas import SessionState, ToolConfigSchema
 from src.workflow.schemas import (
     WorkflowData,
-    WorkflowNode,
-    WorkflowEdge,
+    WorkflowDiff,
     NodeType,
 )
+from src.workflow.diff import apply_diff, diff_workflows
+from src.workflow.intents import get_intent_taxonomy
+from src.workflow.layout import get_layout_engine
+from src.workflow.graph import WorkflowGraph
 from src.workflow.visualizer import generate_mermaid_diagram
 
+# Characters not allowed in node ids (Mermaid cannot draw them)
+_NODE_ID_UNSAFE = re.compile(r"[^a-z0-9_]+")
+
 
 class WorkflowSynthesizer:
     """
@@ -42,19 +49,41 @@ class WorkflowSynthesizer:
             tools=[tool.model_dump() for tool in session_state.tools],
         )
 
-        # Build workflow nodes and edges
-        nodes, edges = self._build_workflow_graph(session_state)
-        workflow.nodes = nodes
-        workflow.edges = edges
+        # Build the workflow graph (compact form until it is returned)
+        graph = self._build_workflow_graph(session_state)
+
+        # Position nodes (layered layout, cached per graph structure)
+        get_layout_engine().apply_graph(graph)
+
+        workflow.nodes, workflow.edges = graph.to_models()
 
         # Generate description
         workflow.description = self._generate_workflow_description(session_state)
 
         return workflow
 
-    def _build_workflow_graph(
-        self, session_state: SessionState
-    ) -> tuple[List[WorkflowNode], List[WorkflowEdge]]:
+    def resynthesize(
+        self, session_state: SessionState, previous: WorkflowData
+    ) -> Tuple[WorkflowData, WorkflowDiff]:
+        """
+        Re-synthesize a stored workflow after the session state changed.
+
+        Only the nodes and edges that differ from the stored workflow are
+        applied to it; everything else is kept as stored.
+
+        Args:
+            session_state: Current session state
+            previous: Stored workflow
+
+        Returns:
+            Tuple of (updated workflow, diff from the stored one)
+        """
+        diff = diff_workflows(previous, self.synthesize(session_state))
+        if diff.is_empty():
+            return previous, diff
+        return apply_diff(previous, diff), diff
+
+    def _build_workflow_graph(self, session_state: SessionState) -> WorkflowGraph:
         """
         Build the workflow graph (nodes and edges).
 
@@ -62,84 +91,70 @@ class WorkflowSynthesizer:
             session_state: Session state
 
         Returns:
-            Tuple of (nodes, edges)
+            Compact workflow graph
         """
 
-        nodes: List[WorkflowNode] = []
-        edges: List[WorkflowEdge] = []
+        graph = WorkflowGraph()
 
         # 1. Start Node
-        start_node = WorkflowNode(
-            id="start",
-            type=NodeType.START,
-            label="Start",
+        graph.add_node(
+            "start",
+            NodeType.START,
+            "Start",
             description="Conversation begins",
-            position={"x": 100, "y": 50},
         )
-        nodes.append(start_node)
 
         # 2. Greeting Node
-        greeting_node = WorkflowNode(
-            id="greeting",
-            type=NodeType.GREETING,
-            label="Greet User",
+        graph.add_node(
+            "greeting",
+            NodeType.GREETING,
+            "Greet User",
             description=f"Greet user with {session_state.tone} tone",
             config={
                 "tone": session_state.tone,
                 "greeting_template": self._generate_greeting(session_state),
             },
-            position={"x": 100, "y": 150},
         )
-        nodes.append(greeting_node)
-        edges.append(WorkflowEdge(source="start", target="greeting"))
+        graph.add_edge("start", "greeting")
 
         # 3. Intent Detection Node
-        intent_node = WorkflowNode(
-            id="intent_detection",
-            type=NodeType.INTENT_DETECTION,
-            label="Detect User Intent",
+        graph.add_node(
+            "intent_detection",
+            NodeType.INTENT_DETECTION,
+            "Detect User Intent",
             description=f"Understand user needs related to: {session_state.goals}",
             config={"expected_intents": self._extract_intents(session_state)},
-            position={"x": 100, "y": 250},
         )
-        nodes.append(intent_node)
-        edges.append(WorkflowEdge(source="greeting", target="intent_detection"))
+        graph.add_edge("greeting", "intent_detection")
 
         # 4. Add tool nodes if tools are configured
         if session_state.use_tools and session_state.tools:
-            tool_nodes = self._build_tool_nodes(session_state.tools)
-            nodes.extend(tool_nodes)
+            tool_ids = self._build_tool_nodes(graph, session_state.tools)
 
             # Create conditional edges to tools
-            for i, tool_node in enumerate(tool_nodes):
-                tool_config = session_state.tools[i]
-                edges.append(
-                    WorkflowEdge(
-                        source="intent_detection",
-                        target=tool_node.id,
-                        label=f"Use {tool_config.name}",
-                        condition=tool_config.usage_context
-                        or f"When user needs {tool_config.name}",
-                    )
+            for tool_id, tool_config in zip(tool_ids, session_state.tools):
+                graph.add_edge(
+                    "intent_detection",
+                    tool_id,
+                    label=f"Use {tool_config.name}",
+                    condition=tool_config.usage_context
+                    or f"When user needs {tool_config.name}",
                 )
 
                 # Tool to response
-                edges.append(
-                    WorkflowEdge(
-                        source=tool_node.id,
-                        target="response",
-                        label="Process result",
-                    )
-                )
+                graph.add_edge(tool_id, "response", label="Process result")
+
+            # Requests no tool matches are answered directly
+            graph.add_edge("intent_detection", "response", label="Answer directly")
         else:
             # No tools - direct to response
-            edges.append(WorkflowEdge(source="intent_detection", target="response"))
+            graph.add_edge("intent_detection", "response")
 
         # 5. Response Node
-        response_node = WorkflowNode(
-            id="response",
-            type=NodeType.RESPONSE,
-            label="Generate Response",
+        graph.add_node(
+            "response",
+            NodeType.RESPONSE,
+            "Generate Response",
             description=f"Respond in {session_state.tone} tone addressing: {session_state.goals}",
             config={
                 "tone": session_state.tone,
@@ -148,63 +163,56 @@ class WorkflowSynthesizer:
                     session_state
                 ),
             },
-            position={"x": 100, "y": 450},
         )
-        nodes.append(response_node)
 
         # 6. Condition Node (Continue or End?)
-        condition_node = WorkflowNode(
-            id="continue_check",
-            type=NodeType.CONDITION,
-            label="More Questions?",
+        graph.add_node(
+            "continue_check",
+            NodeType.CONDITION,
+            "More Questions?",
             description="Check if user has more questions",
             config={"check": "User has more questions"},
-            position={"x": 100, "y": 550},
         )
-        nodes.append(condition_node)
-        edges.append(WorkflowEdge(source="response", target="continue_check"))
+        graph.add_edge("response", "continue_check")
 
         # Loop back to intent detection
-        edges.append(
-            WorkflowEdge(
-                source="continue_check",
-                target="intent_detection",
-                label="Yes",
-                condition="User continues conversation",
-            )
+        graph.add_edge(
+            "continue_check",
+            "intent_detection",
+            label="Yes",
+            condition="User continues conversation",
         )
 
         # 7. End Node
-        end_node = WorkflowNode(
-            id="end",
-            type=NodeType.END,
-            label="End",
+        graph.add_node(
+            "end",
+            NodeType.END,
+            "End",
             description="Conversation ends",
-            position={"x": 100, "y": 650},
         )
-        nodes.append(end_node)
-        edges.append(
-            WorkflowEdge(
-                source="continue_check",
-                target="end",
-                label="No",
-                condition="User ends conversation",
-            )
+        graph.add_edge(
+            "continue_check",
+            "end",
+            label="No",
+            condition="User ends conversation",
         )
 
-        return nodes, edges
+        return graph
 
-    def _build_tool_nodes(self, tools: List[ToolConfigSchema]) -> List[WorkflowNode]:
-        """Build nodes for each tool"""
+    def _build_tool_nodes(
+        self, graph: WorkflowGraph, tools: List[ToolConfigSchema]
+    ) -> List[str]:
+        """Add a node for each tool and return their ids"""
 
-        tool_nodes = []
-        y_position = 350
+        tool_ids = []
 
         for i, tool in enumerate(tools):
-            tool_node = WorkflowNode(
-                id=f"tool_{i}_{tool.name.lower().replace(' ', '_')}",
-                type=NodeType.TOOL_CALL,
-                label=f"Call {tool.name}",
+            name = _NODE_ID_UNSAFE.sub("_", tool.name.lower()).strip("_")
+            tool_id = f"tool_{i}_{name}"
+            graph.add_node(
+                tool_id,
+                NodeType.TOOL_CALL,
+                f"Call {tool.name}",
                 description=tool.description or f"Use {tool.name} tool",
                 config={
                     "tool_name": tool.name,
@@ -214,11 +222,10 @@ class WorkflowSynthesizer:
                     "output_schema": tool.output_schema,
                     "usage_context": tool.usage_context,
                 },
-                position={"x": 300 + (i * 200), "y": y_position},
             )
-            tool_nodes.append(tool_node)
+            tool_ids.append(tool_id)
 
-        return tool_nodes
+        return tool_ids
 
     def _generate_greeting(self, session_state: SessionState) -> str:
         """Generate greeting template"""
@@ -239,33 +246,15 @@ class WorkflowSynthesizer:
         return f"Hello! I'm your {session_state.agent_type} assistant. How can I help you today?"
 
     def _extract_intents(self, session_state: SessionState) -> List[str]:
-        """Extract expected intents from goals"""
-
-        goals = session_state.goals or ""
-
-        # Simple intent extraction based on keywords
-        intents = []
-
-        if "track" in goals.lower() or "status" in goals.lower():
-            intents.append("check_status")
+        """Extract expected intents from goals, flow, examples and tool usage"""
 
-        if "return" in goals.lower() or "refund" in goals.lower():
-            intents.append("process_return")
-
-        if "book" in goals.lower() or "schedule" in goals.lower():
-            intents.append("make_booking")
-
-        if "cancel" in goals.lower():
-            intents.append("cancel_request")
-
-        if "help" in goals.lower() or "question" in goals.lower():
-            intents.append("get_help")
-
-        # Default intent
-        if not intents:
-            intents.append("general_inquiry")
+        texts = [session_state.goals, session_state.conversation_flow]
+        texts.extend(session_state.example_interactions or [])
+        if session_state.use_tools:
+            texts.extend(tool.usage_context for tool in session_state.tools)
 
-        return intents
+        # One pass over all texts; the default intent if nothing matches
+        return get_intent_taxonomy().extract(texts)
 
     def _generate_response_guidelines(self, session_state: SessionState) -> str:
         """Generate response guidelines"""
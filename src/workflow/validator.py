@@ -0,0 +1,277 @@
+"""
+Workflow Validator - Static checks on a workflow graph.
+
+Checks node ids (duplicates, ids Mermaid cannot use or that collide once
+sanitized), edges to unknown nodes, reachability from the start node,
+whether every reachable node can still reach an end node, and classifies
+cycles (Tarjan's strongly connected components). Each check is a single
+pass over the nodes or the CSR adjacency of a WorkflowGraph, so
+validation is O(V + E).
+"""
+
+from array import array
+from typing import Dict, List, Sequence
+import re
+
+from src.workflow.graph import UNKNOWN_NODE, WorkflowGraph
+from src.workflow.schemas import (
+    CycleKind,
+    IssueSeverity,
+    NodeType,
+    ValidationIssue,
+    ValidationReport,
+    WorkflowCycle,
+    WorkflowData,
+)
+from src.workflow.visualizer import _sanitize_node_id
+
+# Node ids Mermaid accepts without quoting
+_MERMAID_ID = re.compile(r"^[A-Za-z0-9_]+$")
+
+
+def _strongly_connected(offsets: array, targets: array) -> List[List[int]]:
+    """Tarjan's SCC algorithm, iterative so deep graphs cannot overflow"""
+    count = len(offsets) - 1
+    index = [-1] * count
+    low = [0] * count
+    on_stack = [False] * count
+    stack: List[int] = []
+    components: List[List[int]] = []
+    counter = 0
+
+    for root in range(count):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, offsets[root])]
+
+        while work:
+            node, position = work[-1]
+            if position < offsets[node + 1]:
+                work[-1] = (node, position + 1)
+                target = targets[position]
+                if index[target] == -1:
+                    index[target] = low[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    on_stack[target] = True
+                    work.append((target, offsets[target]))
+                elif on_stack[target]:
+                    low[node] = min(low[node], index[target])
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
+
+def _visit(offsets: array, targets: array, sources: Sequence[int]) -> List[bool]:
+    """Nodes reachable from any of the sources"""
+    seen = [False] * (len(offsets) - 1)
+    queue = []
+    for source in sources:
+        if not seen[source]:
+            seen[source] = True
+            queue.append(source)
+    head = 0
+    while head < len(queue):
+        node = queue[head]
+        head += 1
+        for target in targets[offsets[node] : offsets[node + 1]]:
+            if not seen[target]:
+                seen[target] = True
+                queue.append(target)
+    return seen
+
+
+def validate_workflow(workflow: WorkflowData) -> ValidationReport:
+    """
+    Check a workflow graph for structural problems.
+
+    Args:
+        workflow: Workflow to check
+
+    Returns:
+        Report of issues, cycles and unreachable nodes
+    """
+    return validate_graph(WorkflowGraph.from_workflow(workflow))
+
+
+def validate_graph(graph: WorkflowGraph) -> ValidationReport:
+    """
+    Check a compact workflow graph for structural problems.
+
+    Args:
+        graph: Graph to check
+
+    Returns:
+        Report of issues, cycles and unreachable nodes
+    """
+    issues: List[ValidationIssue] = []
+
+    def issue(code, severity, message, node_ids=None, edge_index=None):
+        issues.append(
+            ValidationIssue(
+                code=code,
+                severity=severity,
+                message=message,
+                node_ids=node_ids or [],
+                edge_index=edge_index,
+            )
+        )
+
+    nodes = graph.nodes
+
+    # Node ids
+    for node_id in graph.duplicate_ids:
+        issue(
+            "duplicate_node_id",
+            IssueSeverity.ERROR,
+            f"Node id '{node_id}' is used more than once",
+            [node_id],
+        )
+
+    sanitized: Dict[str, str] = {}
+    for node in nodes:
+        if not _MERMAID_ID.match(node.id):
+            issue(
+                "invalid_node_id",
+                IssueSeverity.WARNING,
+                f"Node id '{node.id}' has characters Mermaid cannot render",
+                [node.id],
+            )
+        diagram_id = _sanitize_node_id(node.id)
+        if diagram_id in sanitized:
+            issue(
+                "diagram_id_collision",
+                IssueSeverity.ERROR,
+                f"Nodes '{sanitized[diagram_id]}' and '{node.id}' are both"
+                f" drawn as '{diagram_id}'",
+                [sanitized[diagram_id], node.id],
+            )
+        else:
+            sanitized[diagram_id] = node.id
+
+    # Edges
+    edge_sources, edge_targets = graph.edge_sources, graph.edge_targets
+    for edge_index, edge in enumerate(graph.edges):
+        missing = [
+            node_id
+            for node_id, resolved in (
+                (edge.source, edge_sources[edge_index]),
+                (edge.target, edge_targets[edge_index]),
+            )
+            if resolved == UNKNOWN_NODE
+        ]
+        if missing:
+            issue(
+                "dangling_edge",
+                IssueSeverity.ERROR,
+                f"Edge {edge.source} -> {edge.target} points at unknown"
+                f" node(s): {', '.join(missing)}",
+                missing,
+                edge_index,
+            )
+
+    # Start and end nodes
+    starts = graph.nodes_of_type(NodeType.START)
+    ends = graph.nodes_of_type(NodeType.END)
+    if not starts:
+        issue("missing_start", IssueSeverity.ERROR, "Workflow has no start node")
+    elif len(starts) > 1:
+        issue(
+            "multiple_starts",
+            IssueSeverity.WARNING,
+            "Workflow has more than one start node; the first one is used",
+            [nodes[i].id for i in starts],
+        )
+    if not ends:
+        issue("missing_end", IssueSeverity.ERROR, "Workflow has no end node")
+
+    # Reachability from start, and towards an end node
+    out_offsets, out_targets = graph.out_edges
+    reachable = _visit(out_offsets, out_targets, starts[:1])
+    terminates = _visit(*graph.in_edges, ends)
+
+    unreachable = [node.id for i, node in enumerate(nodes) if not reachable[i]]
+    if unreachable and starts:
+        issue(
+            "unreachable_nodes",
+            IssueSeverity.WARNING,
+            f"{len(unreachable)} node(s) cannot be reached from the start node",
+            unreachable,
+        )
+
+    # Cycles
+    cycles: List[WorkflowCycle] = []
+    trapped = [False] * len(nodes)
+    for component in _strongly_connected(out_offsets, out_targets):
+        if len(component) == 1:
+            node = component[0]
+            if node not in out_targets[out_offsets[node] : out_offsets[node + 1]]:
+                continue
+        component.sort()
+        escapes = any(terminates[i] for i in component)
+        if not escapes:
+            kind = CycleKind.TRAP
+        elif len(component) == 1:
+            kind = CycleKind.SELF_LOOP
+        else:
+            kind = CycleKind.LOOP
+        cycle = WorkflowCycle(
+            kind=kind,
+            node_ids=[nodes[i].id for i in component],
+            reachable=any(reachable[i] for i in component),
+        )
+        cycles.append(cycle)
+
+        if kind == CycleKind.TRAP and cycle.reachable and ends:
+            for i in component:
+                trapped[i] = True
+            issue(
+                "trap_cycle",
+                IssueSeverity.ERROR,
+                "Cycle has no path to an end node: " + " -> ".join(cycle.node_ids),
+                cycle.node_ids,
+            )
+
+    # Reachable nodes that can never get to an end node (cycles reported above)
+    stuck = [
+        node.id
+        for i, node in enumerate(nodes)
+        if reachable[i] and not terminates[i] and not trapped[i]
+    ]
+    if stuck and ends:
+        issue(
+            "no_path_to_end",
+            IssueSeverity.ERROR,
+            f"{len(stuck)} reachable node(s) have no path to an end node",
+            stuck,
+        )
+
+    errors = sum(1 for item in issues if item.severity == IssueSeverity.ERROR)
+    return ValidationReport(
+        valid=errors == 0,
+        node_count=graph.node_count + len(graph.duplicate_ids),
+        edge_count=graph.edge_count,
+        errors=errors,
+        warnings=len(issues) - errors,
+        issues=issues,
+        cycles=cycles,
+        unreachable_nodes=unreachable,
+    )
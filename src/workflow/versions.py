@@ -0,0 +1,327 @@
+"""
+Workflow Versions - Append-only history with cheap diffs and rollback.
+
+The workflows row always holds the current version in full. Every older
+version is a workflow_versions row holding the delta from the version
+before it, and every WORKFLOW_SNAPSHOT_INTERVAL-th version (1, 11, 21, ...)
+also keeps a full snapshot. Reconstructing a version loads the nearest
+snapshot at or below it and replays at most interval - 1 deltas.
+
+Histories that predate versioning get a snapshot of their current version
+the first time they change, so every later version is reconstructible.
+"""
+
+from datetime import datetime
+from typing import Optional, Tuple
+import uuid
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session as DBSession
+
+from src.config import get_settings
+from src.workflow.diff import apply_diff, diff_workflows
+from src.workflow.models import Workflow, WorkflowVersion
+from src.workflow.schemas import (
+    WorkflowData,
+    WorkflowDiff,
+    WorkflowVersionInfo,
+    WorkflowVersionList,
+)
+from src.workflow.visualizer import update_mermaid_diagram
+
+settings = get_settings()
+
+
+def version_number(version: Optional[str]) -> int:
+    """Integer version from the stored version string ("3.0" -> 3)"""
+    try:
+        return int(str(version).split(".")[0])
+    except (TypeError, ValueError):
+        return 1
+
+
+def format_version(number: int) -> str:
+    return f"{number}.0"
+
+
+def _is_snapshot_version(number: int) -> bool:
+    return (number - 1) % max(settings.workflow_snapshot_interval, 1) == 0
+
+
+def _has_version(db: DBSession, workflow_id: str, number: int) -> bool:
+    return (
+        db.query(WorkflowVersion.id)
+        .filter(
+            WorkflowVersion.workflow_id == workflow_id,
+            WorkflowVersion.version == number,
+        )
+        .first()
+        is not None
+    )
+
+
+def _has_snapshot(db: DBSession, workflow_id: str) -> bool:
+    return (
+        db.query(WorkflowVersion.id)
+        .filter(
+            WorkflowVersion.workflow_id == workflow_id,
+            WorkflowVersion.snapshot.is_not(None),
+        )
+        .first()
+        is not None
+    )
+
+
+def _version_row(
+    workflow_id: str,
+    number: int,
+    delta: Optional[WorkflowDiff],
+    snapshot: Optional[WorkflowData],
+) -> WorkflowVersion:
+    # Unset columns stay SQL NULL (an explicit None would be stored as JSON null)
+    values = {}
+    if delta is not None:
+        values["delta"] = delta.model_dump(mode="json", exclude_defaults=True)
+    if snapshot is not None:
+        values["snapshot"] = snapshot.model_dump(mode="json")
+    return WorkflowVersion(
+        id=str(uuid.uuid4()), workflow_id=workflow_id, version=number, **values
+    )
+
+
+def append_version(
+    db: DBSession,
+    workflow: Workflow,
+    previous: WorkflowData,
+    workflow_data: WorkflowData,
+    diff: WorkflowDiff,
+) -> int:
+    """
+    Make workflow_data the current version of a workflow.
+
+    The version is bumped, the delta is appended to the history, only the
+    affected diagram lines are re-rendered and approval is reset (the
+    approved version number is kept).
+
+    Args:
+        db: Database session (not committed; the workflow row should be locked)
+        workflow: Workflow row holding `previous`
+        previous: Current version
+        workflow_data: New version (its version field is set here)
+        diff: Changes from previous to workflow_data
+
+    Returns:
+        New version number
+    """
+    number = version_number(workflow.version) + 1
+    workflow_data.version = format_version(number)
+
+    snapshot = _is_snapshot_version(number)
+    if not _has_snapshot(db, workflow.id):
+        if _has_version(db, workflow.id, number - 1):
+            # Earlier deltas have no base; history becomes complete from here
+            snapshot = True
+        else:
+            db.add(_version_row(workflow.id, number - 1, None, previous))
+
+    db.add(_version_row(workflow.id, number, diff, workflow_data if snapshot else None))
+
+    workflow.agent_type = workflow_data.agent_type
+    workflow.goals = workflow_data.goals
+    workflow.tone = workflow_data.tone
+    workflow.use_tools = workflow_data.use_tools
+    workflow.workflow_json = workflow_data.model_dump(mode="json")
+    workflow.mermaid_diagram = update_mermaid_diagram(
+        workflow.mermaid_diagram, previous, workflow_data, diff
+    )
+    workflow.version = workflow_data.version
+    workflow.is_approved = False
+    workflow.updated_at = datetime.utcnow()
+    return number
+
+
+def reconstruct_version(db: DBSession, workflow: Workflow, number: int) -> WorkflowData:
+    """
+    Rebuild a version from the nearest snapshot and the deltas after it.
+
+    Args:
+        db: Database session
+        workflow: Workflow row
+        number: Version to rebuild
+
+    Returns:
+        Workflow as it was at that version
+
+    Raises:
+        ValueError: If the version does not exist or is not reconstructible
+    """
+    current = version_number(workflow.version)
+    if number == current:
+        return WorkflowData(**workflow.workflow_json)
+    if not 1 <= number < current:
+        raise ValueError(f"Version {number} not found")
+
+    base = (
+        db.query(func.max(WorkflowVersion.version))
+        .filter(
+            WorkflowVersion.workflow_id == workflow.id,
+            WorkflowVersion.version <= number,
+            WorkflowVersion.snapshot.is_not(None),
+        )
+        .scalar()
+    )
+    if base is None:
+        raise ValueError(f"Version {number} predates the stored history")
+
+    rows = (
+        db.query(
+            WorkflowVersion.version, WorkflowVersion.snapshot, WorkflowVersion.delta
+        )
+        .filter(
+            WorkflowVersion.workflow_id == workflow.id,
+            WorkflowVersion.version >= base,
+            WorkflowVersion.version <= number,
+        )
+        .order_by(WorkflowVersion.version)
+        .all()
+    )
+    if [row.version for row in rows] != list(range(base, number + 1)):
+        raise ValueError(f"History of version {number} is incomplete")
+
+    workflow_data = WorkflowData(**rows[0].snapshot)
+    for row in rows[1:]:
+        workflow_data = apply_diff(workflow_data, WorkflowDiff(**(row.delta or {})))
+    workflow_data.version = format_version(number)
+    return workflow_data
+
+
+def version_diff(
+    db: DBSession, workflow: Workflow, from_number: int, to_number: int
+) -> WorkflowDiff:
+    """
+    Changes between two versions. Consecutive versions use the stored delta.
+
+    Args:
+        db: Database session
+        workflow: Workflow row
+        from_number: Older (or any) version
+        to_number: Version the diff leads to
+
+    Returns:
+        Diff that turns from_number into to_number
+
+    Raises:
+        ValueError: If either version is not reconstructible
+    """
+    if to_number == from_number + 1:
+        row = (
+            db.query(WorkflowVersion.delta)
+            .filter(
+                WorkflowVersion.workflow_id == workflow.id,
+                WorkflowVersion.version == to_number,
+            )
+            .first()
+        )
+        if row is not None and row.delta is not None:
+            return WorkflowDiff(**row.delta)
+
+    return diff_workflows(
+        reconstruct_version(db, workflow, from_number),
+        reconstruct_version(db, workflow, to_number),
+    )
+
+
+def list_versions(db: DBSession, workflow: Workflow) -> WorkflowVersionList:
+    """
+    Version history of a workflow, without loading snapshots.
+
+    Args:
+        db: Database session
+        workflow: Workflow row
+
+    Returns:
+        Versions oldest first, including the current one
+    """
+    current = version_number(workflow.version)
+    rows = (
+        db.query(
+            WorkflowVersion.version,
+            WorkflowVersion.created_at,
+            WorkflowVersion.delta,
+            WorkflowVersion.snapshot.is_not(None).label("is_snapshot"),
+        )
+        .filter(WorkflowVersion.workflow_id == workflow.id)
+        .order_by(WorkflowVersion.version)
+        .all()
+    )
+
+    versions = []
+    for row in rows:
+        delta = row.delta or {}
+        versions.append(
+            WorkflowVersionInfo(
+                version=row.version,
+                created_at=row.created_at,
+                is_snapshot=bool(row.is_snapshot),
+                nodes_added=len(delta.get("added_nodes", [])),
+                nodes_removed=len(delta.get("removed_nodes", [])),
+                nodes_changed=len(delta.get("changed_nodes", [])),
+                edges_changed=bool(
+                    delta.get("added_edges")
+                    or delta.get("removed_edges")
+                    or delta.get("edges") is not None
+                ),
+            )
+        )
+    if not versions or versions[-1].version != current:
+        # Never changed since it was created
+        versions.append(
+            WorkflowVersionInfo(
+                version=current, created_at=workflow.created_at, is_snapshot=True
+            )
+        )
+
+    for info in versions:
+        info.is_current = info.version == current
+        info.is_approved = info.version == workflow.approved_version
+
+    return WorkflowVersionList(
+        session_id=workflow.session_id,
+        current_version=current,
+        approved_version=workflow.approved_version,
+        versions=versions,
+    )
+
+
+def rollback_workflow(
+    db: DBSession, workflow: Workflow, number: int
+) -> Tuple[WorkflowData, WorkflowDiff]:
+    """
+    Restore an earlier version by appending it as a new version.
+
+    Restoring the approved version carries the approval over to the new
+    version, since the content is identical.
+
+    Args:
+        db: Database session (not committed; the workflow row should be locked)
+        workflow: Workflow row
+        number: Version to restore
+
+    Returns:
+        Tuple of (restored workflow, diff from the previous current version)
+
+    Raises:
+        ValueError: If the version is not reconstructible
+    """
+    previous = WorkflowData(**workflow.workflow_json)
+    restored = reconstruct_version(db, workflow, number)
+    diff = diff_workflows(previous, restored)
+    if diff.is_empty():
+        return previous, diff
+
+    restores_approval = number == workflow.approved_version
+    new_number = append_version(db, workflow, previous, restored, diff)
+    if restores_approval:
+        workflow.approved_version = new_number
+        workflow.is_approved = True
+    return restored, diff
@@ -2,8 +2,15 @@
 Workflow Visualizer - Creates visual representations of workflows.
 """
 
-from src.workflow.schemas import WorkflowData, NodeType
+from typing import List
 
+from src.workflow.schemas import (
+    WorkflowData,
+    WorkflowDiff,
+    WorkflowEdge,
+    WorkflowNode,
+    NodeType,
+)
 
 # Mermaid reserved keywords that cannot be used as node IDs
 MERMAID_RESERVED_KEYWORDS = {
@@ -23,6 +30,14 @@ MERMAID_RESERVED_KEYWORDS = {
     "LR",
 }
 
+# Style class assigned to each node type (others are unstyled)
+NODE_TYPE_CLASSES = {
+    NodeType.START: "startEnd",
+    NodeType.END: "startEnd",
+    NodeType.TOOL_CALL: "tool",
+    NodeType.CONDITION: "condition",
+}
+
 
 def _sanitize_node_id(node_id: str) -> str:
     """Sanitize node ID to avoid Mermaid reserved keywords"""
@@ -42,29 +57,119 @@ def generate_mermaid_diagram(workflow: WorkflowData) -> str:
         Mermaid diagram string
     """
 
-    lines = ["flowchart TD"]
-    lines.append(f"    %% {workflow.agent_type} Agent Workflow")
-    lines.append("")
+    lines = _header_lines(workflow)
 
     # Add nodes
-    for node in workflow.nodes:
-        node_shape = _get_node_shape(node.type)
-        # Remove all quotes from label (not just replace with single quote)
-        label = node.label.replace('"', "").replace("'", "")
-        sanitized_id = _sanitize_node_id(node.id)
-        lines.append(f"    {sanitized_id}{node_shape[0]}{label}{node_shape[1]}")
+    lines.extend(_node_line(node) for node in workflow.nodes)
 
     lines.append("")
 
     # Add edges
-    for edge in workflow.edges:
-        source = _sanitize_node_id(edge.source)
-        target = _sanitize_node_id(edge.target)
-        if edge.label:
-            label = edge.label.replace('"', "'")
-            lines.append(f"    {source} -->|{label}| {target}")
+    lines.extend(_edge_line(edge) for edge in workflow.edges)
+
+    lines.extend(_style_lines(workflow))
+
+    return "\n".join(lines)
+
+
+def update_mermaid_diagram(
+    previous_diagram: str,
+    previous: WorkflowData,
+    workflow: WorkflowData,
+    diff: WorkflowDiff,
+) -> str:
+    """
+    Update a diagram rendered for a previous version of the workflow,
+    re-rendering only the lines of added or changed nodes and edges.
+
+    Falls back to a full render if the diagram does not have the layout
+    produced by generate_mermaid_diagram.
+
+    Args:
+        previous_diagram: Diagram rendered from the previous version
+        previous: Previous version of the workflow
+        workflow: New version (previous with diff applied)
+        diff: Changes between the two
+
+    Returns:
+        Mermaid diagram string for the new version
+    """
+
+    lines = (previous_diagram or "").split("\n")
+    header_size = len(_header_lines(previous))
+    node_end = header_size + len(previous.nodes)
+    edge_end = node_end + 1 + len(previous.edges)
+
+    old_node_lines = lines[header_size:node_end]
+    old_edge_lines = lines[node_end + 1 : edge_end]
+    well_formed = (
+        len(lines) > edge_end
+        and len(old_node_lines) == len(previous.nodes)
+        and len(old_edge_lines) == len(previous.edges)
+        and all(
+            line.startswith(f"    {_sanitize_node_id(node.id)}")
+            for line, node in zip(old_node_lines, previous.nodes)
+        )
+    )
+    if not well_formed:
+        return generate_mermaid_diagram(workflow)
+
+    # Nodes: keep the lines of untouched nodes
+    node_lines = dict(zip((node.id for node in previous.nodes), old_node_lines))
+    affected = diff.affected_node_ids()
+    result = _header_lines(workflow)
+    for node in workflow.nodes:
+        if node.id in affected or node.id not in node_lines:
+            result.append(_node_line(node))
         else:
-            lines.append(f"    {source} --> {target}")
+            result.append(node_lines[node.id])
+
+    result.append("")
+
+    # Edges: drop removed lines, render added ones in place
+    if diff.edges is not None:
+        result.extend(_edge_line(edge) for edge in workflow.edges)
+    else:
+        removed = set(diff.removed_edges)
+        edge_lines = [
+            line for index, line in enumerate(old_edge_lines) if index not in removed
+        ]
+        for item in sorted(diff.added_edges, key=lambda item: item.index):
+            edge_lines.insert(item.index, _edge_line(item.edge))
+        result.extend(edge_lines)
+
+    result.extend(_style_lines(workflow))
+
+    return "\n".join(result)
+
+
+def _header_lines(workflow: WorkflowData) -> List[str]:
+    """Flowchart declaration and title comment"""
+    return ["flowchart TD", f"    %% {workflow.agent_type} Agent Workflow", ""]
+
+
+def _node_line(node: WorkflowNode) -> str:
+    """Mermaid node declaration"""
+    node_shape = _get_node_shape(node.type)
+    # Remove all quotes from label (not just replace with single quote)
+    label = node.label.replace('"', "").replace("'", "")
+    sanitized_id = _sanitize_node_id(node.id)
+    return f"    {sanitized_id}{node_shape[0]}{label}{node_shape[1]}"
+
+
+def _edge_line(edge: WorkflowEdge) -> str:
+    """Mermaid edge declaration"""
+    source = _sanitize_node_id(edge.source)
+    target = _sanitize_node_id(edge.target)
+    if edge.label:
+        label = edge.label.replace('"', "'")
+        return f"    {source} -->|{label}| {target}"
+    return f"    {source} --> {target}"
+
+
+def _style_lines(workflow: WorkflowData) -> List[str]:
+    """Class definitions and class assignments by node type"""
+    lines = []
 
     # Add styling
     lines.append("")
@@ -74,30 +179,18 @@ def generate_mermaid_diagram(workflow: WorkflowData) -> str:
     lines.append("    classDef condition fill:#87CEEB,stroke:#333,stroke-width:2px")
     lines.append("")
 
-    # Sanitize node IDs in class assignments
-    start_end_nodes = [
-        _sanitize_node_id(n.id)
-        for n in workflow.nodes
-        if n.type in [NodeType.START, NodeType.END]
-    ]
-    if start_end_nodes:
-        lines.append(f"    class {','.join(start_end_nodes)} startEnd")
-
-    # Find tool nodes
-    tool_nodes = [
-        _sanitize_node_id(n.id) for n in workflow.nodes if n.type == NodeType.TOOL_CALL
-    ]
-    if tool_nodes:
-        lines.append(f"    class {','.join(tool_nodes)} tool")
-
-    # Find condition nodes
-    condition_nodes = [
-        _sanitize_node_id(n.id) for n in workflow.nodes if n.type == NodeType.CONDITION
-    ]
-    if condition_nodes:
-        lines.append(f"    class {','.join(condition_nodes)} condition")
+    # Bucket sanitized node IDs by class in a single pass over the nodes
+    classes = {"startEnd": [], "tool": [], "condition": []}
+    for n in workflow.nodes:
+        class_name = NODE_TYPE_CLASSES.get(n.type)
+        if class_name:
+            classes[class_name].append(_sanitize_node_id(n.id))
 
-    return "\n".join(lines)
+    for class_name, node_ids in classes.items():
+        if node_ids:
+            lines.append(f"    class {','.join(node_ids)} {class_name}")
+
+    return lines
 
 
 def _get_node_shape(node_type: NodeType) -> tuple[str, str]:
@@ -0,0 +1,91 @@
+"""
+Query plan checks for hot lookups.
+Asserts that export and workflow lookups are served by their indexes
+instead of scanning the table.
+
+Runs against a scratch SQLite database under pytest, or against the
+configured DATABASE_URL when run as a script.
+"""
+
+import sys
+
+from sqlalchemy import create_engine, text
+
+from src.config import get_settings
+from src.models import Base
+
+EXPORT_LOOKUP = """
+    SELECT id, blob_key FROM prompt_exports
+    WHERE session_id = :session_id
+      AND export_format = :export_format
+      AND content_hash = :content_hash
+"""
+
+WORKFLOW_LOOKUP = "SELECT id FROM workflows WHERE session_id = :session_id"
+
+PARAMS = {"session_id": "s-1", "export_format": "JSON", "content_hash": "abc"}
+
+
+def explain(engine, sql: str) -> str:
+    """Return the query plan for sql as text"""
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            # Tiny tables are cheaper to scan; force the planner to show index use
+            conn.execute(text("SET enable_seqscan = off"))
+            rows = conn.execute(text(f"EXPLAIN {sql}"), PARAMS).all()
+            return "\n".join(row[0] for row in rows)
+
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"), PARAMS).all()
+        return "\n".join(row[-1] for row in rows)
+
+
+def assert_uses_index(plan: str, index_name: str = None):
+    """Fail if the plan scans the table or misses the expected index"""
+    assert "Seq Scan" not in plan, plan
+    assert not any(line.startswith("SCAN") for line in plan.splitlines()), plan
+    if index_name:
+        assert index_name in plan, plan
+
+
+def scratch_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def test_export_lookup_uses_unique_index(tmp_path):
+    """Download lookup hits (session_id, export_format, content_hash)"""
+    plan = explain(scratch_engine(tmp_path), EXPORT_LOOKUP)
+    assert_uses_index(plan, "uq_prompt_exports_session_format_hash")
+
+
+def test_workflow_lookup_uses_index(tmp_path):
+    """Workflow lookup by session hits the session_id unique constraint"""
+    plan = explain(scratch_engine(tmp_path), WORKFLOW_LOOKUP)
+    assert_uses_index(plan)
+
+
+def main():
+    engine = create_engine(get_settings().database_url)
+
+    checks = [
+        ("Export lookup", EXPORT_LOOKUP, "uq_prompt_exports_session_format_hash"),
+        ("Workflow lookup", WORKFLOW_LOOKUP, None),
+    ]
+
+    failed = False
+    for name, sql, index_name in checks:
+        plan = explain(engine, sql)
+        try:
+            assert_uses_index(plan, index_name)
+            print(f"✅ {name} uses an index")
+        except AssertionError:
+            failed = True
+            print(f"❌ {name} does not use the expected index")
+        print(f"   {plan}\n")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
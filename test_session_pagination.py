@@ -0,0 +1,94 @@
+"""
+Keyset pagination checks for GET /api/v1/sessions.
+Walks every page of a scratch SQLite database and asserts each session
+appears exactly once, including sessions that share a timestamp.
+
+Run with pytest.
+"""
+
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.router import api_router
+from src.database import get_read_db
+from src.models import Base
+from src.session.models import Session, SessionStatus
+
+
+def scratch_client(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'sessions.db'}")
+    Base.metadata.create_all(bind=engine)
+    ScratchSession = sessionmaker(bind=engine)
+
+    db = ScratchSession()
+    # Server-default timestamps (whole seconds, all equal) ...
+    db.add_all(
+        Session(id=f"s{i}", status=SessionStatus.ACTIVE, stage="initial")
+        for i in range(5)
+    )
+    db.commit()
+    # ... and Python-side ones (with microseconds), some tied
+    now = datetime.utcnow()
+    for i in range(5, 12):
+        stamp = now + timedelta(microseconds=(i // 2) * 1500)
+        db.add(
+            Session(
+                id=f"s{i}",
+                status=SessionStatus.ACTIVE,
+                stage="initial",
+                created_at=stamp,
+                updated_at=stamp,
+            )
+        )
+    db.commit()
+    db.close()
+
+    def override_read_db():
+        session = ScratchSession()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = FastAPI()
+    app.include_router(api_router)
+    app.dependency_overrides[get_read_db] = override_read_db
+    return TestClient(app)
+
+
+def walk(client, **params):
+    """All session ids across every page, in page order"""
+    seen = []
+    cursor = None
+    for _ in range(100):
+        query = dict(params, limit=2)
+        if cursor:
+            query["cursor"] = cursor
+        response = client.get("/api/v1/sessions", params=query)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        seen.extend(item["session_id"] for item in body["sessions"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            return seen
+    raise AssertionError(f"Pagination did not finish: {seen[:20]}")
+
+
+def test_every_session_listed_once(tmp_path):
+    """Each page advances, for every sort field and order"""
+    client = scratch_client(tmp_path)
+    expected = sorted(f"s{i}" for i in range(12))
+    for sort_by in ("updated_at", "created_at"):
+        for order in ("desc", "asc"):
+            seen = walk(client, sort_by=sort_by, order=order)
+            assert sorted(seen) == expected, (sort_by, order, seen)
+
+
+def test_invalid_cursor_rejected(tmp_path):
+    client = scratch_client(tmp_path)
+    response = client.get("/api/v1/sessions", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400